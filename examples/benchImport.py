@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+#
+# LSST Data Management System
+#
+# This product includes software developed by the
+# LSST Project (http://www.lsst.org/).
+# See the COPYRIGHT file
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the LSST License Statement and
+# the GNU General Public License along with this program.  If not,
+# see <https://www.lsstcorp.org/LegalNotices/>.
+#
+"""Benchmark importing astshim, relative to importing numpy
+
+Each import is timed in a fresh Python process, so the times include starting
+the interpreter; importing numpy gives a baseline, since astshim imports it.
+Run from the package root directory:
+
+    python examples/benchImport.py
+"""
+from __future__ import absolute_import, division, print_function
+import subprocess
+import sys
+import timeit
+
+NUM_TRIALS = 5
+
+
+def timeImport(moduleName):
+    """Return the shortest time (sec) to import a module in a fresh Python process"""
+    command = [sys.executable, "-c", "import {}".format(moduleName)]
+    return min(timeit.repeat(lambda: subprocess.check_call(command), repeat=NUM_TRIALS, number=1))
+
+
+def main():
+    numpyTime = timeImport("numpy")
+    astshimTime = timeImport("astshim")
+    print("import numpy:   {:0.3f} sec".format(numpyTime))
+    print("import astshim: {:0.3f} sec".format(astshimTime))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+#
+# LSST Data Management System
+#
+# This product includes software developed by the
+# LSST Project (http://www.lsst.org/).
+# See the COPYRIGHT file
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the LSST License Statement and
+# the GNU General Public License along with this program.  If not,
+# see <https://www.lsstcorp.org/LegalNotices/>.
+#
+"""Benchmark pickling typical WCS FrameSets
+
+Compares the size and the per-object latency of pickle with a round trip
+through a Channel and StringStream. Run from the package root directory:
+
+    python examples/benchPickle.py
+"""
+from __future__ import absolute_import, division, print_function
+import os
+import pickle
+import timeit
+
+import numpy as np
+
+import astshim
+
+NUM_TRIALS = 5
+NUM_CALLS = 200
+
+
+def readWcs():
+    """Read the FITS WCS in examples/simple.fits as a FrameSet"""
+    path = os.path.join(os.path.dirname(__file__), "simple.fits")
+    return astshim.FitsChan(astshim.FileStream(path)).read()
+
+
+def addDistortion(wcs, order):
+    """Return a copy of a WCS with a polynomial pixel distortion of the given order"""
+    coeffs = []
+    for outAxis in (1, 2):
+        coeffs.append([1.0, outAxis, 1 if outAxis == 1 else 0, 1 if outAxis == 2 else 0])
+        for i in range(order + 1):
+            for j in range(order + 1 - i):
+                if i + j > 1:
+                    coeffs.append([1.0e-3 / 10**(i + j), outAxis, i, j])
+    polyMap = astshim.PolyMap(np.array(coeffs), 2, "IterInverse=1")
+    pixelFrame = astshim.Frame(2, "Domain=PIXELS")
+    return astshim.FrameSet(pixelFrame, polyMap.then(wcs.getMapping()),
+                            wcs.getFrame(astshim.FrameSet.CURRENT))
+
+
+def channelRoundTrip(obj):
+    stream = astshim.StringStream()
+    chan = astshim.Channel(stream)
+    chan.write(obj)
+    stream.sinkToSource()
+    return chan.read()
+
+
+def bestTime(func):
+    """Return the best time per call (sec) of func"""
+    return min(timeit.repeat(func, number=NUM_CALLS, repeat=NUM_TRIALS)) / NUM_CALLS
+
+
+def main():
+    wcs = readWcs()
+    for descr, frameSet in (
+        ("FITS WCS", wcs),
+        ("FITS WCS + 5th order distortion", addDistortion(wcs, 5)),
+        ("FITS WCS + 9th order distortion", addDistortion(wcs, 9)),
+    ):
+        pickled = pickle.dumps(frameSet, pickle.HIGHEST_PROTOCOL)
+        assert pickle.loads(pickled) == frameSet
+        print("{}: show() is {} bytes; pickle is {} bytes".format(
+            descr, len(frameSet.show()), len(pickled)))
+        print("    pickle.dumps: {:8.1f} usec".format(
+            1e6 * bestTime(lambda: pickle.dumps(frameSet, pickle.HIGHEST_PROTOCOL))))
+        print("    pickle.loads: {:8.1f} usec".format(1e6 * bestTime(lambda: pickle.loads(pickled))))
+        print("    Channel round trip: {:8.1f} usec".format(
+            1e6 * bestTime(lambda: channelRoundTrip(frameSet))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+#
+# LSST Data Management System
+#
+# This product includes software developed by the
+# LSST Project (http://www.lsst.org/).
+# See the COPYRIGHT file
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the LSST License Statement and
+# the GNU General Public License along with this program.  If not,
+# see <https://www.lsstcorp.org/LegalNotices/>.
+#
+"""Benchmark evaluating PolyMap distortion polynomials of orders 3 to 9
+
+Compares PolyMap.applyForward with the evaluation plan built by astshim
+(the default) and with AST's own evaluation (nativeEval = False),
+transforming a grid of points the size of a typical CCD.
+Run from the package root directory:
+
+    python examples/benchPolyMap.py
+"""
+from __future__ import absolute_import, division, print_function
+import timeit
+
+import numpy as np
+
+import astshim
+
+NUM_TRIALS = 3
+GRID_SHAPE = (2048, 1024)
+
+
+def makeDistortion(order):
+    """Make a 2-d PolyMap with a full polynomial of the given total order for each output"""
+    coeffs = []
+    for outAxis in (1, 2):
+        for i in range(order + 1):
+            for j in range(order + 1 - i):
+                coeff = 1.0 if i + j == 1 and (i == 1) == (outAxis == 1) else 1.0e-3 / 1000**(i + j)
+                coeffs.append([coeff, outAxis, i, j])
+    return astshim.PolyMap(np.array(coeffs), 2)
+
+
+def bestTime(func):
+    """Return the best time for one call (sec) of func"""
+    return min(timeit.repeat(func, number=1, repeat=NUM_TRIALS))
+
+
+def main():
+    ys, xs = np.mgrid[0:GRID_SHAPE[0], 0:GRID_SHAPE[1]]
+    points = np.array([xs.ravel(), ys.ravel()], dtype=float)
+    nPoints = points.shape[1]
+    print("Transforming {} points".format(nPoints))
+    print("order  nCoeff   AST (nsec/pt)  astshim (nsec/pt)  speedup  max |diff|")
+    for order in range(3, 10):
+        polyMap = makeDistortion(order)
+        nativeOut = polyMap.applyForward(points)
+        nativeTime = bestTime(lambda: polyMap.applyForward(points))
+        polyMap.nativeEval = False
+        astOut = polyMap.applyForward(points)
+        astTime = bestTime(lambda: polyMap.applyForward(points))
+        print("{:5d}  {:6d}  {:14.1f}  {:17.1f}  {:7.1f}  {:10.2g}".format(
+            order, (order + 1) * (order + 2), 1e9 * astTime / nPoints, 1e9 * nativeTime / nPoints,
+            astTime / nativeTime, np.abs(nativeOut - astOut).max()))
+
+
+if __name__ == "__main__":
+    main()
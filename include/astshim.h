@@ -7,7 +7,11 @@
 #include "astshim/Channel.h"
 #include "astshim/MapBox.h"
 #include "astshim/MapSplit.h"
+#include "astshim/MapSplitCache.h"
+#include "astshim/PiecewiseLinearApprox.h"
 #include "astshim/QuadApprox.h"
+#include "astshim/MappingPool.h"
+#include "astshim/SimplifyCache.h"
 #include "astshim/Mapping.h"
 #include "astshim/Frame.h"
 #include "astshim/FrameSet.h"
@@ -34,6 +38,8 @@
 #include "astshim/PcdMap.h"
 #include "astshim/PermMap.h"
 #include "astshim/PolyMap.h"
+#include "astshim/PolyMapNewtonInverse.h"
+#include "astshim/PolyTranCache.h"
 #include "astshim/RateMap.h"
 #include "astshim/SeriesMap.h"
 #include "astshim/ShiftMap.h"
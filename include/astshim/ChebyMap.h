@@ -216,6 +216,30 @@ public:
     */
     ChebyDomain getDomain(bool forward) const;
 
+    /**
+    Get the coefficients of the forward transformation
+
+    @return the coefficients, as a `ncoeff_f x (2 + nin)` array in the
+        @ref ChebyMap_CoefficientMatrices "format" accepted by the constructor;
+        this has no rows if the forward transformation is not defined by coefficients.
+        The order of the rows may differ from the order in which they were specified.
+        The Chebyshev polynomials are scaled to the domain given by `getDomain(true)`.
+        If this ChebyMap is inverted then these are the coefficients of the inverted ChebyMap's
+        forward transformation, which are the inverse coefficients it was constructed with.
+    */
+    Array2D getCoeffForward() const;
+
+    /**
+    Get the coefficients of the inverse transformation
+
+    @return the coefficients, as a `ncoeff_i x (2 + nout)` array in the
+        @ref ChebyMap_CoefficientMatrices "format" accepted by the constructor;
+        this has no rows if the inverse transformation is not defined by coefficients.
+        The Chebyshev polynomials are scaled to the domain given by `getDomain(false)`.
+        See getCoeffForward for more information.
+    */
+    Array2D getCoeffInverse() const;
+
     /**
     This function creates a new @ref ChebyMap which is a copy of this one,
     in which a specified transformation (forward or inverse)
@@ -314,6 +338,24 @@ protected:
     /// Construct a ChebyMap from an raw AST pointer
     ChebyMap(AstChebyMap *map);
 
+    /**
+    Compute the Jacobian of the forward transformation directly from the polynomial coefficients
+
+    Falls back to the default implementation if this ChebyMap is inverted
+    or its forward transformation is not defined by coefficients.
+    */
+    virtual void jacobianImpl(ConstArray2D const &at, Array3D const &jac) const override;
+
+    /**
+    Compute the forward transformation on a grid directly from the polynomial coefficients
+
+    The polynomials are evaluated exactly, one grid axis at a time, so `tol` and `maxpix` are ignored.
+    Falls back to the default implementation if this ChebyMap is inverted,
+    its forward transformation is not defined by coefficients, or Report is set.
+    */
+    virtual void tranGridImpl(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix,
+                              bool doForward, Array2D const &to) const override;
+
 private:
     /// Make a raw AstChebyMap with specified forward and inverse transforms.
     AstChebyMap *_makeRawChebyMap(ndarray::Array<double, 2, 2> const &coeff_f,
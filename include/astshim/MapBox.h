@@ -60,11 +60,22 @@ public:
         an output bounding box, starting from 1,
         or 0 for all remaining output coordinate axes (in which case
         the field of the same name will be set to the number of outputs)
+    @param[in] nSamples  If 0 (the default) then compute the bounding box accurately using astMapBox.
+        Otherwise compute a fast approximation by transforming a grid of `nSamples` points
+        along each input axis (including the edges of the box) in a single call to
+        @ref Mapping.applyForward "applyForward", then refining around each extreme point found;
+        see the notes below. Must be 0, or at least 3 if `nRefine` is 0 and at least 4 otherwise.
+    @param[in] nRefine  Number of refinement passes in approximate mode (ignored if `nSamples` is 0).
+        Each pass samples a grid of `nSamples` points along each axis that spans one grid spacing
+        of the previous pass on either side of each extreme point, and so shrinks the spacing
+        by a factor of (nSamples - 1) / 2; hence refinement requires `nSamples` of at least 4.
 
     @return A @ref MapBox containing the computed outputs and a copy of the inputs.
 
     @throws std::invalid_argument if minOutCoord is not in the range [1, getNOut()]
-        or maxOutCoord is neither 0 nor in the range [minOutCoord, getNOut()].
+        or maxOutCoord is neither 0 nor in the range [minOutCoord, getNOut()],
+        or if nSamples is 1, 2 or negative, or nSamples is 3 and nRefine is positive,
+        or nRefine is negative, or `nSamples^nIn` exceeds 1,000,000.
     @throws std::runtime_error if the required output bounds cannot be
         found. Typically, this might occur if all the input points which
         the function considers turn out to be invalid (see above). The
@@ -80,9 +91,17 @@ public:
     invalid and are ignored, They will make no contribution to
     determining the output bounds, even although the nominated
     output coordinate might still have a valid value at such points.
+    - The approximate mode (`nSamples` > 0) costs `nSamples^nIn * (1 + 2 * nRefine * nOutCoords)`
+    transformed points, which is typically much faster than astMapBox. Its bounds are the
+    extremes of the points actually transformed, so the box it finds is never larger than the true
+    box, but may be smaller, e.g. if the mapping has a narrow extremum inside the box that
+    the sample grid misses. Pad the bounds by a suitable guard margin if that matters.
+    - The sample grid fills the whole box, so its size grows exponentially with the number of inputs;
+    the approximate mode is intended for mappings with few inputs (typically 2), and `nSamples^nIn`
+    is limited to 1,000,000 points. For more than about 3 inputs astMapBox may well be faster.
     */
     explicit MapBox(Mapping const &map, std::vector<double> const &lbnd, std::vector<double> const &ubnd,
-                    int minOutCoord = 1, int maxOutCoord = 0);
+                    int minOutCoord = 1, int maxOutCoord = 0, int nSamples = 0, int nRefine = 1);
 
     MapBox(MapBox const &) = default;
     MapBox(MapBox &&) = default;
@@ -104,6 +123,58 @@ private:
     /// Compute the outputs
     void _compute(Mapping const &map, std::vector<double> const &lbnd, std::vector<double> const &ubnd,
                   int minOutCoord = 1, int maxOutCoord = 0);
+
+    /// Compute the outputs approximately, by sampling
+    void _computeSampled(Mapping const &map, std::vector<double> const &lbnd, std::vector<double> const &ubnd,
+                         int minOutCoord, int maxOutCoord, int nSamples, int nRefine);
+};
+
+/**
+Object to compute the bounding boxes which just enclose many boxes
+after they have been transformed by a mapping.
+
+This is equivalent to constructing a @ref MapBox for each input box, but can use several threads,
+each with its own copy of the mapping. The input points at which the bounds occur are not returned.
+*/
+class MapBoxBatch {
+public:
+    /**
+    Find bounding boxes for many input boxes
+
+    @param[in] map  Mapping for which to find the output bounding boxes.
+    @param[in] lbnd  Lower bounds of the input boxes, with dimensions (nBoxes, nIn).
+    @param[in] ubnd  Upper bounds of the input boxes, with dimensions (nBoxes, nIn).
+       As for @ref MapBox, a lower bound may exceed the corresponding upper bound.
+    @param[in] minOutCoord  Minimum output coordinate axis for which to compute
+        output bounding boxes, starting from 1
+    @param[in] maxOutCoord  Maximum output coordinate axis for which to compute
+        output bounding boxes, starting from 1,
+        or 0 for all remaining output coordinate axes (in which case
+        the field of the same name will be set to the number of outputs)
+    @param[in] nThreads  Number of threads to use, or 0 for the number of hardware threads.
+        If greater than 1 then each thread uses its own copy of `map`.
+
+    @throws std::invalid_argument if lbnd and ubnd do not both have dimensions (nBoxes, map.getNIn()),
+        if minOutCoord or maxOutCoord is invalid (see @ref MapBox), or if nThreads < 0.
+    @throws std::runtime_error if the output bounds of any box cannot be found;
+        if more than one fails, the error for the first of those boxes is reported.
+    */
+    explicit MapBoxBatch(Mapping const &map, ConstArray2D const &lbnd, ConstArray2D const &ubnd,
+                         int minOutCoord = 1, int maxOutCoord = 0, int nThreads = 1);
+
+    MapBoxBatch(MapBoxBatch const &) = default;
+    MapBoxBatch(MapBoxBatch &&) = default;
+    MapBoxBatch &operator=(MapBoxBatch const &) = default;
+    MapBoxBatch &operator=(MapBoxBatch &&) = default;
+
+    /// Minimum output coordinate axis for which output bounding boxes were computed, starting from 1
+    int minOutCoord;
+    /// Maximum output coordinate axis for which output bounding boxes were computed, starting from 1
+    int maxOutCoord;
+    /// Lower bounds of the output boxes, with dimensions (nBoxes, 1 + maxOutCoord - minOutCoord)
+    Array2D lbndOut;
+    /// Upper bounds of the output boxes, with dimensions (nBoxes, 1 + maxOutCoord - minOutCoord)
+    Array2D ubndOut;
 };
 
 }  // namespace ast
@@ -0,0 +1,123 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_MAPSPLITCACHE_H
+#define ASTSHIM_MAPSPLITCACHE_H
+
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+#include "astshim/detail/objectCache.h"
+#include "astshim/MapSplit.h"
+
+namespace ast {
+class Mapping;
+
+/**
+A cache of @ref MapSplit "split mappings"
+
+Constructing a @ref MapSplit runs astMapSplit, which walks and copies the whole mapping,
+which is wasteful when the same mapping is repeatedly split by the same inputs
+(e.g. to separate the spectral axis of a FrameSet from its spatial axes).
+A MapSplitCache remembers each split it computes, keyed by the contents of the mapping and the list
+of picked inputs, so it returns the previous split for any mapping equal to one it has split before.
+Thus the copies returned by each call to @ref FrameSet.getMapping share one entry, and changes
+to a component shared with a compound mapping are noticed. Lookups work as for @ref SimplifyCache.
+
+Least recently used entries are discarded to keep the total size of the cache within a specified limit.
+The size of an entry is the size of the split mapping (as reported by @ref Object.getObjSize "getObjSize")
+plus the length of the serialized original mapping, which is kept to verify matches.
+
+Split mappings are shared between the cache and its callers; modifying one is harmless
+(the cache will notice and split again the next time it is needed), but wasteful.
+Failed splits are not cached.
+
+@warning Like AST objects, a MapSplitCache may only be used by one thread at a time.
+*/
+class MapSplitCache {
+public:
+    /**
+    Construct a MapSplitCache
+
+    @param[in] maxSize  Maximum total size of the cache (bytes).
+                An entry larger than this is not cached.
+    */
+    explicit MapSplitCache(std::size_t maxSize = 10000000);
+
+    MapSplitCache(MapSplitCache const &) = delete;
+    MapSplitCache(MapSplitCache &&) = default;
+    MapSplitCache &operator=(MapSplitCache const &) = delete;
+    MapSplitCache &operator=(MapSplitCache &&) = default;
+
+    /**
+    Split a mapping, using the cache if possible
+
+    This is equivalent to `MapSplit(map, in)`, except that the split mapping may be shared
+    with the cache and with earlier callers.
+
+    @param[in] map  Mapping to split.
+    @param[in] in  Indices of inputs of `map` to pick.
+        Each element should have a value in the range [1, map.getNIn()].
+
+    @throws std::runtime_error if `map` cannot be split as specified.
+    */
+    MapSplit split(Mapping const &map, std::vector<int> const &in);
+
+    /// Discard all cached splits; the hit and miss counts are not reset.
+    void clear();
+
+    /// Get the maximum total size of the cache (bytes)
+    std::size_t getMaxSize() const { return _cache.getMaxSize(); }
+
+    /// Get the number of cached splits
+    std::size_t getNEntries() const { return _cache.getNEntries(); }
+
+    /// Get the number of calls to @ref split that returned a cached split
+    std::size_t getNHits() const { return _nHits; }
+
+    /// Get the number of calls to @ref split that had to split the mapping
+    std::size_t getNMisses() const { return _nMisses; }
+
+    /// Get the total size of the cache (bytes)
+    std::size_t getSize() const { return _cache.getSize(); }
+
+    /// Reset the hit and miss counts to zero
+    void resetStats() {
+        _nHits = 0;
+        _nMisses = 0;
+    }
+
+private:
+    /// A cached split
+    struct Entry {
+        MapSplit mapSplit;           ///< the split
+        std::uint64_t splitStateId;  ///< state ID of `mapSplit.splitMap` when it was cached
+    };
+
+    detail::ObjectCache<Entry> _cache;  ///< cached splits, keyed by the mapping and picked inputs
+    std::size_t _nHits;
+    std::size_t _nMisses;
+};
+
+}  // namespace ast
+
+#endif
@@ -22,6 +22,8 @@
 #ifndef ASTSHIM_MAPPING_H
 #define ASTSHIM_MAPPING_H
 
+#include <algorithm>
+#include <cstdint>
 #include <memory>
 #include <vector>
 
@@ -103,6 +105,12 @@ public:
     */
     bool getReport() const { return getB("Report"); }
 
+    /**
+    Get the minimum number of points for which to transform using a simplified copy of this mapping;
+    see @ref setSimplifyThreshold
+    */
+    int getSimplifyThreshold() const { return _simplifyThreshold; }
+
     /**
     Is the forward transform available?
 
@@ -212,11 +220,51 @@ public:
         return result;
     }
 
+    /**
+    Compute the Jacobian matrix of the forward transformation at many points
+
+    By default the derivatives are estimated using central differences, transforming all points
+    once for each offset of the stencil (two offsets per input axis). The step for each point
+    and input axis is `cbrt(epsilon) * max(|x|, 1)`, which balances truncation and rounding error.
+    This is much faster than calling @ref rate for each derivative, but less robust,
+    e.g. near a discontinuity. The Jacobian of a linear mapping (one whose @ref Mapping_IsLinear "IsLinear"
+    is true, such as @ref MatrixMap, @ref ShiftMap and @ref ZoomMap) is computed exactly
+    by transforming the origin and a unit vector along each input axis.
+
+    @param[in] at  Positions at which to evaluate the Jacobian, with dimensions (nIn, nPts).
+    @return the Jacobian, with dimensions (nPts, nOut, nIn): element [i, j, k] is
+                the derivative of output axis j with respect to input axis k at point i.
+                Derivatives that cannot be computed are `nan`.
+
+    @throws std::invalid_argument if `at` does not have getNIn() axes.
+    */
+    Array3D jacobian(ConstArray2D const &at) const;
+
     /**
     Set @ref Mapping_Report "Report": report transformed coordinates to stdout?
     */
     void setReport(bool report) { setB("Report", report); }
 
+    /**
+    Set the minimum number of points for which to transform using a simplified copy of this mapping
+
+    If enabled, @ref applyForward, @ref applyInverse, @ref tranGridForward and @ref tranGridInverse
+    transform at least `nPts` points using a simplified copy of this mapping
+    (see @ref simplify) instead of this mapping. This can save a lot of time for long
+    compound mappings, such as those assembled by @ref then. The simplified copy is made
+    when first needed and kept until this mapping is modified. Modifications are detected using
+    @ref Object.isUnchangedSince "isUnchangedSince", which is cheap. If that cannot rule out
+    a modification (e.g. because some object has been modified since the last call and this is
+    a compound mapping, whose components may be shared) then the serialized mapping
+    (see @ref Object.toString "toString") is compared to the one that was simplified,
+    so that changes to a shared component are noticed.
+
+    This setting is not an AST attribute, so it is not copied by @ref copy or @ref then.
+
+    @param[in] nPts  Minimum number of points, or 0 to disable the feature (the default).
+    */
+    void setSimplifyThreshold(int nPts) { _simplifyThreshold = std::max(nPts, 0); }
+
     /**
     Return a simplied version of the mapping (which may be a compound Mapping such as a CmpMap).
 
@@ -249,8 +297,12 @@ public:
 
     @param[in] from  input coordinates, with dimensions (nPts, nIn)
     @param[out] to  transformed coordinates, with dimensions (nPts, nOut)
+    @param[in] badToNan  if true then replace `AST__BAD` with `nan` in `to`;
+                if false then leave `AST__BAD` unchanged, saving a little time.
     */
-    void applyForward(ConstArray2D const &from, Array2D const &to) const { _tran(from, true, to); }
+    void applyForward(ConstArray2D const &from, Array2D const &to, bool badToNan = true) const {
+        _tran(from, true, to, 1, 0, badToNan);
+    }
 
     /**
     Perform a forward transformation on a 2-D array, returning the results as a new array
@@ -278,13 +330,89 @@ public:
         return to;
     }
 
+    /**
+    Perform a forward transformation on a 2-D array with any strides, putting the results
+    into a pre-allocated 2-D array
+
+    Unlike the other overloads, `from` need not be contiguous and may contain float or double values.
+    For example it may be a transposed view of a table of points, or a column of a structured array.
+    If the points along each axis are contiguous doubles then AST reads them in place;
+    otherwise they are gathered (and converted to double) in blocks of a few thousand points,
+    so `from` is never copied in full.
+
+    @tparam T  element type of `from`: `float` or `double`
+    @param[in] from  input coordinates, with dimensions (nPts, nIn)
+    @param[out] to  transformed coordinates, with dimensions (nPts, nOut)
+    @param[in] badToNan  if true then replace `AST__BAD` with `nan` in `to`, else leave it unchanged
+    */
+    template <typename T>
+    void applyForward(ndarray::Array<T const, 2, 0> const &from, Array2D const &to,
+                      bool badToNan = true) const {
+        _tranStrided(from, true, to, badToNan);
+    }
+
+    /**
+    Perform a forward transformation on a 2-D array using several threads,
+    putting the results into a pre-allocated 2-D array
+
+    The points are split into chunks, which are transformed by a pool of worker threads.
+    Each worker uses its own deep copy of this mapping (AST objects cannot be shared between threads)
+    and writes its results directly into its chunks of `to`.
+
+    @param[in] from  input coordinates, with dimensions (nPts, nIn)
+    @param[out] to  transformed coordinates, with dimensions (nPts, nOut)
+    @param[in] nThreads  Number of worker threads, or 0 to use the number of concurrent threads
+                the hardware supports. If 1, or if there is only one chunk of points,
+                the points are transformed by the calling thread.
+    @param[in] chunkSize  Number of points per chunk, or 0 to split the points evenly between the threads.
+    @param[in] badToNan  If true then replace `AST__BAD` with `nan` in `to`, else leave it unchanged.
+
+    This has its own name, rather than overloading applyForward, so that `nThreads`
+    cannot be confused with the `badToNan` argument of applyForward.
+
+    @warning This is only safe if the AST library was built with POSIX thread support.
+    */
+    void applyForwardThreaded(ConstArray2D const &from, Array2D const &to, int nThreads, int chunkSize = 0,
+                              bool badToNan = true) const {
+        _tran(from, true, to, nThreads, chunkSize, badToNan);
+    }
+
+    /**
+    Perform a forward transformation on a 2-D array using several threads,
+    returning the results as a new array
+
+    See the overload of applyForwardThreaded that outputs the data as the second argument
+    for more information.
+    */
+    Array2D applyForwardThreaded(ConstArray2D const &from, int nThreads, int chunkSize = 0) const {
+        Array2D to = ndarray::allocate(getNOut(), from.getSize<1>());
+        _tran(from, true, to, nThreads, chunkSize);
+        return to;
+    }
+
     /**
     Perform an inverse transformation on a 2-D array, putting the results into a pre-allocated 2-D array
 
     @param[in] from  input coordinates, with dimensions (nPts, nOut)
     @param[out] to  transformed coordinates, with dimensions (nPts, nIn)
+    @param[in] badToNan  if true then replace `AST__BAD` with `nan` in `to`;
+                if false then leave `AST__BAD` unchanged, saving a little time.
     */
-    void applyInverse(ConstArray2D const &from, Array2D const &to) const { _tran(from, false, to); }
+    void applyInverse(ConstArray2D const &from, Array2D const &to, bool badToNan = true) const {
+        _tran(from, false, to, 1, 0, badToNan);
+    }
+
+    /**
+    Perform an inverse transformation on a 2-D array with any strides, putting the results
+    into a pre-allocated 2-D array
+
+    See the overload of applyForward that accepts an array with any strides for more information.
+    */
+    template <typename T>
+    void applyInverse(ndarray::Array<T const, 2, 0> const &from, Array2D const &to,
+                      bool badToNan = true) const {
+        _tranStrided(from, false, to, badToNan);
+    }
 
     /**
     Perform an inverse transformation on a 2-D array, returning the results as a new 2-D array
@@ -312,6 +440,29 @@ public:
         return to;
     }
 
+    /**
+    Perform an inverse transformation on a 2-D array using several threads,
+    putting the results into a pre-allocated 2-D array
+
+    See @ref applyForwardThreaded for more information.
+    */
+    void applyInverseThreaded(ConstArray2D const &from, Array2D const &to, int nThreads, int chunkSize = 0,
+                              bool badToNan = true) const {
+        _tran(from, false, to, nThreads, chunkSize, badToNan);
+    }
+
+    /**
+    Perform an inverse transformation on a 2-D array using several threads,
+    returning the results as a new array
+
+    See @ref applyForwardThreaded for more information.
+    */
+    Array2D applyInverseThreaded(ConstArray2D const &from, int nThreads, int chunkSize = 0) const {
+        Array2D to = ndarray::allocate(getNIn(), from.getSize<1>());
+        _tran(from, false, to, nThreads, chunkSize);
+        return to;
+    }
+
     /**
     Transform a grid of points in the forward direction
 
@@ -346,7 +497,13 @@ public:
                 If too small a value is given, it will have the effect of inhibiting linear approximation
                 altogether (equivalent to setting " tol" to zero).  Although this may degrade
                 performance, accurate results will still be obtained.
-    @param[in] to  Computed points, with dimensions (nPts, nOut), where nPts the desired number of points
+    @param[in] to  Computed points, with dimensions (nOut, nPts), where nPts is at least the number
+                of points in the grid (see getGridSize). The points are in the order of a C array
+                of shape (ubnd[nIn-1] - lbnd[nIn-1] + 1, ..., ubnd[0] - lbnd[0] + 1),
+                i.e. the first input axis varies fastest; any extra points are left unchanged.
+
+    @throws std::invalid_argument if lbnd or ubnd do not have nIn elements, if `to` does not have
+                nOut axes, or if `to` has too few points.
     */
     void tranGridForward(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix,
                          Array2D const &to) const {
@@ -354,13 +511,22 @@ public:
     }
 
     /**
-    Transform a grid of points in the inverse direction, returning the results as a new Array2D
+    Transform a grid of points in the forward direction, returning the results as a new Array2D
 
     See the overload of tranGridForward that outputs the data as the last argument
     for more information
+
+    @param[in] lbnd  The coordinates of the centre of the first pixel in the input grid along each dimension
+    @param[in] ubnd  The coordinates of the centre of the last pixel in the input grid along each dimension
+    @param[in] tol  The maximum tolerable geometrical distortion
+    @param[in] maxpix  The initial scale size (in input grid points) of the adaptive algorithm
+    @param[in] nPts  Number of points to allocate, which must be at least the number of points in the grid,
+                or 0 to use exactly the number of points in the grid.
+    @return the computed points, with dimensions (nOut, nPts)
     */
-    Array2D tranGridForward(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix, int nPts) const {
-        Array2D to = ndarray::allocate(nPts, getNOut());
+    Array2D tranGridForward(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix,
+                            int nPts = 0) const {
+        Array2D to = ndarray::allocate(getNOut(), nPts > 0 ? nPts : getGridSize(lbnd, ubnd));
         _tranGrid(lbnd, ubnd, tol, maxpix, true, to);
         return to;
     }
@@ -376,16 +542,28 @@ public:
     }
 
     /**
-    Transform a grid of points in the inverse direction
+    Transform a grid of points in the inverse direction, returning the results as a new Array2D
 
     See tranGridForward for the arguments, swapping nIn and nOut
     */
-    Array2D tranGridInverse(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix, int nPts) const {
-        Array2D to = ndarray::allocate(nPts, getNIn());
+    Array2D tranGridInverse(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix,
+                            int nPts = 0) const {
+        Array2D to = ndarray::allocate(getNIn(), nPts > 0 ? nPts : getGridSize(lbnd, ubnd));
         _tranGrid(lbnd, ubnd, tol, maxpix, false, to);
         return to;
     }
 
+    /**
+    Return the number of points in a grid, as used by tranGridForward and tranGridInverse
+
+    @param[in] lbnd  The coordinates of the first pixel in the grid along each dimension
+    @param[in] ubnd  The coordinates of the last pixel in the grid along each dimension
+
+    @throws std::invalid_argument if lbnd and ubnd have different lengths, or if any element
+                of ubnd is less than the corresponding element of lbnd.
+    */
+    static int getGridSize(PointI const &lbnd, PointI const &ubnd);
+
 protected:
     /**
     Construct a mapping from a pointer to a raw AST subclass of AstMapping
@@ -420,21 +598,123 @@ protected:
     template <typename Class>
     std::shared_ptr<Class> decompose(int i, bool copy) const;
 
+    /**
+    Compute the Jacobian of the forward transformation; the implementation of @ref jacobian.
+
+    Override this in subclasses that can compute the Jacobian more accurately or faster than
+    the default, which is exact for linear mappings and otherwise uses central differences.
+
+    @param[in] at  Positions at which to evaluate the Jacobian, with dimensions (nIn, nPts).
+                The caller checks the dimensions.
+    @param[out] jac  The Jacobian, with dimensions (nPts, nOut, nIn).
+    */
+    virtual void jacobianImpl(ConstArray2D const &at, Array3D const &jac) const;
+
+    /**
+    Transform a block of points; the implementation of @ref applyForward and @ref applyInverse.
+
+    Override this in subclasses that can transform points faster than AST; the default calls astTranN.
+    The arguments are those of astTranN: coordinate `k` of point `i` is `from[k * fromDim + i]`
+    and likewise for `to`. Coordinates that cannot be computed must be set to `AST__BAD`.
+
+    @param[in] nPts  Number of points to transform.
+    @param[in] nFromAxes  Number of input coordinates per point.
+    @param[in] fromDim  Stride between input coordinates (at least `nPts`).
+    @param[in] from  Input coordinates.
+    @param[in] doForward  If true then perform a forward transform, else inverse.
+    @param[in] nToAxes  Number of output coordinates per point.
+    @param[in] toDim  Stride between output coordinates (at least `nPts`).
+    @param[out] to  Output coordinates.
+    */
+    virtual void tranImpl(int nPts, int nFromAxes, int fromDim, double const *from, bool doForward,
+                          int nToAxes, int toDim, double *to) const;
+
+    /**
+    Transform a grid of points; the implementation of @ref tranGridForward and @ref tranGridInverse.
+
+    Override this in subclasses that can transform a grid faster than AST; the default calls astTranGrid.
+    The caller checks the arguments and replaces `AST__BAD` with `nan` in the results.
+
+    @param[in] lbnd  The coordinates of the first pixel in the grid along each dimension.
+    @param[in] ubnd  The coordinates of the last pixel in the grid along each dimension.
+    @param[in] tol  The maximum tolerable geometrical distortion which may be introduced
+                    as a result of approximating non-linear Mappings by a set of piece-wise linear
+                    transformations; see @ref tranGridForward.
+    @param[in] maxpix  A value which specifies an initial scale size in pixels for the adaptive
+                    algorithm which approximates non-linear Mappings; see @ref tranGridForward.
+    @param[in] doForward  If true then perform a forward transform, else inverse.
+    @param[out] to  Transformed grid points, with dimensions (nToAxes, nPts), where nPts is at least
+                    the number of grid points; the first grid axis varies fastest.
+                    Points that cannot be computed must be set to `AST__BAD` or `nan`.
+    */
+    virtual void tranGridImpl(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix,
+                              bool doForward, Array2D const &to) const;
+
 private:
+    /**
+    Return the simplified copy of this mapping to use for transforming `nPts` points, or nullptr
+    if this mapping should be used; see setSimplifyThreshold.
+
+    The copy is left unlocked between uses, so the caller must lock it for the calling thread.
+    */
+    std::shared_ptr<Mapping const> _getSimplified(int nPts) const;
+
     /**
     Implement applyForward and applyInverse, putting the results into a pre-allocated 2-D array.
 
     @param[in] from  input coordinates, with dimensions (nPts, nIn)
     @param[in] doForward  if true then perform a forward transform, else inverse
     @param[out] to  transformed coordinates, with dimensions (nPts, nOut)
+    @param[in] nThreads  number of threads to use, or 0 for the number of hardware threads
+    @param[in] chunkSize  number of points transformed at a time by each thread,
+                    or 0 to split the points evenly between the threads
+    @param[in] badToNan  if true then replace `AST__BAD` with `nan` in `to`
+    */
+    void _tran(ConstArray2D const &from, bool doForward, Array2D const &to, int nThreads = 1,
+               int chunkSize = 0, bool badToNan = true) const;
+
+    /**
+    Transform the `nPts` points starting at index `start` of `from`, putting the results into
+    the same points of `to` and optionally replacing `AST__BAD` with `nan`.
+
+    The arrays are not copied: the points are read and written in place, using the stride
+    of the first axis to find each coordinate. The caller must check the array sizes.
     */
-    void _tran(ConstArray2D const &from, bool doForward, Array2D const &to) const;
+    void _tranRange(ConstArray2D const &from, bool doForward, Array2D const &to, int start, int nPts,
+                    bool badToNan) const;
+
+    /**
+    Transform `nPts` points starting at index `start` of `from` as _tranRange, in blocks of points
+    small enough that the conversion of `AST__BAD` to `nan` is done while the results are in cache
+    */
+    void _tranRangeBlocked(ConstArray2D const &from, bool doForward, Array2D const &to, int start,
+                           int nPts, bool badToNan) const;
+
+    /**
+    Implement the overloads of applyForward and applyInverse that accept an array with any strides.
+
+    @tparam T  element type of `from`: `float` or `double`
+    @param[in] from  input coordinates, with dimensions (nPts, nIn)
+    @param[in] doForward  if true then perform a forward transform, else inverse
+    @param[out] to  transformed coordinates, with dimensions (nPts, nOut)
+    @param[in] badToNan  if true then replace `AST__BAD` with `nan` in `to`
+    */
+    template <typename T>
+    void _tranStrided(ndarray::Array<T const, 2, 0> const &from, bool doForward, Array2D const &to,
+                      bool badToNan) const;
 
     /**
     Implementat tranGridForward and tranGridInverse, which see.
     */
     void _tranGrid(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix, bool doForward,
                    Array2D const &to) const;
+
+    int _simplifyThreshold = 0;  ///< see setSimplifyThreshold
+    mutable std::shared_ptr<Mapping const> _simplified;  ///< cached simplified copy; see _getSimplified
+    mutable std::string _simplifiedText;  ///< serialized form of this mapping when _simplified was made
+    mutable std::uint64_t _simplifiedStateId = 0;  ///< state ID when _simplified was last found valid
+    /// modification count when _simplified was last found valid; see Object::isUnchangedSince
+    mutable std::uint64_t _simplifiedModificationCount = 0;
 };
 
 }  // namespace ast
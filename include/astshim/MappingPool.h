@@ -0,0 +1,144 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_MAPPINGPOOL_H
+#define ASTSHIM_MAPPINGPOOL_H
+
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <exception>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+#include "astshim/base.h"
+
+namespace ast {
+class Mapping;
+
+/**
+A pool of worker threads for transforming batches of points with a mapping
+
+An AST object may only be used by the thread that has it locked (see @ref Object.lock "lock").
+A MappingPool takes care of this: it gives each of its worker threads its own copy of the mapping,
+which the worker keeps locked for the lifetime of the pool. Each call to @ref applyForward or
+@ref applyInverse distributes a list of batches of points among the workers
+and returns the transformed batches in the same order.
+
+The pool's copies are made when the pool is constructed; later changes to the original
+mapping do not affect the pool.
+
+Unlike AST objects, a MappingPool may be used by any thread and by several threads at once;
+calls are run one at a time.
+*/
+class MappingPool {
+public:
+    /**
+    Construct a MappingPool
+
+    @param[in] mapping  Mapping to copy; it must be locked by the calling thread
+                (which is always the case unless you have explicitly unlocked it).
+    @param[in] nThreads  Number of worker threads; 0 for one per hardware thread.
+
+    @throws std::invalid_argument if `nThreads < 0`
+    */
+    explicit MappingPool(Mapping const &mapping, int nThreads = 0);
+
+    MappingPool(MappingPool const &) = delete;
+    MappingPool(MappingPool &&) = delete;
+    MappingPool &operator=(MappingPool const &) = delete;
+    MappingPool &operator=(MappingPool &&) = delete;
+
+    /// Stop and join the worker threads
+    ~MappingPool();
+
+    /// Get the number of input axes of the mapping
+    int getNIn() const { return _nIn; }
+
+    /// Get the number of output axes of the mapping
+    int getNOut() const { return _nOut; }
+
+    /// Get the number of worker threads
+    int getNThreads() const { return static_cast<int>(_threads.size()); }
+
+    /**
+    Transform a list of batches of points in the forward direction, using all worker threads
+
+    @param[in] batches  Batches of points to transform; each has dimensions (getNIn(), nPoints),
+                where nPoints may differ between batches.
+    @return the transformed batches, in the same order; each has dimensions (getNOut(), nPoints).
+
+    @throws std::invalid_argument if any batch has the wrong number of axes
+    @throws std::runtime_error if a transform fails; if more than one fails, the error
+                from the earliest batch is reported.
+    */
+    std::vector<Array2D> applyForward(std::vector<ConstArray2D> const &batches) {
+        return _tran(batches, true);
+    }
+
+    /**
+    Transform a list of batches of points in the inverse direction, using all worker threads
+
+    @param[in] batches  Batches of points to transform; each has dimensions (getNOut(), nPoints),
+                where nPoints may differ between batches.
+    @return the transformed batches, in the same order; each has dimensions (getNIn(), nPoints).
+
+    @throws std::invalid_argument if any batch has the wrong number of axes
+    @throws std::runtime_error if a transform fails; if more than one fails, the error
+                from the earliest batch is reported.
+    */
+    std::vector<Array2D> applyInverse(std::vector<ConstArray2D> const &batches) {
+        return _tran(batches, false);
+    }
+
+private:
+    /// Implement applyForward and applyInverse
+    std::vector<Array2D> _tran(std::vector<ConstArray2D> const &batches, bool doForward);
+
+    /// Body of each worker thread
+    void _work(std::shared_ptr<Mapping> mapping);
+
+    /// Stop and join the worker threads
+    void _stopWorkers();
+
+    int const _nIn;
+    int const _nOut;
+    std::vector<std::thread> _threads;
+
+    std::mutex _callMutex;                  ///< serializes calls to _tran
+    std::mutex _mutex;                      ///< protects the job state below
+    std::condition_variable _jobReady;      ///< signalled when a job starts or the pool stops
+    std::condition_variable _jobDone;       ///< signalled when the last worker finishes a job
+    std::uint64_t _jobId = 0;               ///< incremented for each job
+    bool _stop = false;                     ///< true if the workers should exit
+    bool _doForward = true;                 ///< direction of the current job
+    std::vector<ConstArray2D> const *_batches = nullptr;  ///< batches of the current job
+    std::vector<Array2D> *_results = nullptr;              ///< results of the current job
+    std::size_t _nextBatch = 0;             ///< index of the next batch to transform
+    int _nActive = 0;                       ///< number of workers still working on the current job
+    std::vector<std::exception_ptr> _errors;  ///< error for each batch of the current job
+};
+
+}  // namespace ast
+
+#endif
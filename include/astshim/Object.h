@@ -22,6 +22,7 @@
 #ifndef ASTSHIM_OBJECT_H
 #define ASTSHIM_OBJECT_H
 
+#include <cstdint>
 #include <ostream>
 #include <memory>
 
@@ -67,6 +68,10 @@ public:
 
     For two objects be equal, they both must have the same attributes and all contained objects
     must be equal.
+
+    Objects of different classes, mappings with different numbers of axes, and objects whose
+    @ref hash "hashes" are both cached and differ are quickly found to be unequal; otherwise
+    each object is serialized once and the text compared, which takes time proportional to their size.
     */
     bool operator==(Object const &rhs) const;
 
@@ -85,6 +90,20 @@ public:
         return Object::_basicFromAstObject(rawPtr);
     }
 
+    /**
+    Return a compact string representation of this object, using astToString
+
+    The string is much shorter than the output of @ref show, and can be converted back
+    to an equal object using @ref fromString. It is used to pickle objects in Python.
+    */
+    std::string toString() const {
+        char *rawStr = astToString(getRawPtr());
+        assertOK();
+        std::string str(rawStr);
+        astFree(rawStr);
+        return str;
+    }
+
     /**
     Given a bare AST object pointer return a shared pointer to an ast::Object of the correct type
 
@@ -156,9 +175,53 @@ public:
     */
     int getRefCount() const { return getI("RefCount"); }
 
+    /**
+    Get an identifier for this object in its current state
+
+    The value is unique to this object and changes whenever the object may have been modified,
+    so it can be used to tell that an object has not changed since it was last seen
+    (e.g. by @ref SimplifyCache). Any use of the non-const @ref getRawPtr counts as a modification.
+
+    @warning Changes made through another object that shares the same underlying AST object
+    (e.g. a @ref Frame obtained from @ref FrameSet.getFrame with `copy=false`, or a component
+    of a mapping made by @ref Mapping.then "then") are not detected; see @ref isUnchangedSince.
+    */
+    std::uint64_t getStateId() const { return _stateId; }
+
+    /**
+    Get the number of times that any object may have been modified
+
+    This increases whenever the state ID of any object changes because it may have been modified
+    (see @ref getStateId), so if it has not changed then no object has been modified.
+    */
+    static std::uint64_t getModificationCount();
+
     /// Get @ref Object_UseDefs "UseDefs": allow use of default values for Object attributes?
     bool getUseDefs() const { return getB("UseDefs"); }
 
+    /**
+    Return a hash of the structure of this object
+
+    Objects that are equal (see @ref operator==) have the same hash.
+    The hash is computed from the serialized object, which takes time proportional to its size,
+    and is cached for as long as the object is known to be unchanged (see @ref isUnchangedSince).
+
+    @warning Do not modify an object while it is in use as a key of a hashed container.
+    */
+    std::size_t hash() const;
+
+    /**
+    Is this object known to be unchanged since @ref getStateId returned `stateId`
+    and @ref getModificationCount returned `modificationCount`?
+
+    An object that contains other objects (e.g. a SeriesMap made by @ref Mapping.then "then",
+    but also a Frame, which contains its axes) may share them with other objects, and so be modified
+    through those objects without its state ID changing. Such an object is only known to be unchanged
+    if no object has been modified since. Thus a false result does not mean that the object has changed;
+    compare the contents (e.g. using @ref operator==) to find out.
+    */
+    bool isUnchangedSince(std::uint64_t stateId, std::uint64_t modificationCount) const;
+
     /**
     Lock this object for exclusive use by the calling thread.
 
@@ -194,7 +257,8 @@ public:
     option was not specified when running the "configure" script).
     */
     void lock(bool wait) {
-        astLock(getRawPtr(), static_cast<int>(wait));
+        // locking does not modify the object, so do not use the non-const getRawPtr
+        astLock(&*_objPtr, static_cast<int>(wait));
         assertOK();
     }
 
@@ -272,7 +336,8 @@ public:
     option was not specified when running the "configure" script).
     */
     void unlock(bool report = false) {
-        astUnlock(getRawPtr(), static_cast<int>(report));
+        // unlocking does not modify the object, so do not use the non-const getRawPtr
+        astUnlock(&*_objPtr, static_cast<int>(report));
         assertOK();
     }
 
@@ -285,14 +350,18 @@ public:
     */
     AstObject const *getRawPtr() const { return &*_objPtr; };
 
-    AstObject *getRawPtr() { return &*_objPtr; };
+    AstObject *getRawPtr() {
+        // the caller may modify the object, so assume it has changed
+        _stateId = _makeModifiedStateId();
+        return &*_objPtr;
+    };
     ///@}
 
 protected:
     /**
     Construct an @ref Object from a pointer to a raw AstObject
     */
-    explicit Object(AstObject *object) : _objPtr(object, &detail::annulAstObject) {
+    explicit Object(AstObject *object) : _objPtr(object, &detail::annulAstObject), _stateId(_makeStateId()) {
         assertOK();
         if (!object) {
             throw std::runtime_error("Null pointer");
@@ -521,7 +590,21 @@ private:
     */
     static std::shared_ptr<Object> _basicFromAstObject(AstObject *rawObj);
 
+    /// Return a new state ID, different from all others; see getStateId
+    static std::uint64_t _makeStateId();
+
+    /// Return a new state ID for an object that may have been modified, and count the modification
+    static std::uint64_t _makeModifiedStateId();
+
+    /// Is the cached value of hash() known to be up to date?
+    bool _isHashCached() const { return isUnchangedSince(_hashStateId, _hashModificationCount); }
+
     ObjectPtr _objPtr;
+    std::uint64_t _stateId;
+    mutable std::size_t _hash = 0;  ///< cached value of hash()
+    mutable std::uint64_t _hashStateId = 0;  ///< state ID when _hash was computed; 0 if never
+    mutable std::uint64_t _hashModificationCount = 0;  ///< modification count when _hash was computed
+    mutable bool _containsObjects = false;  ///< does the object contain other objects? set by hash()
 };
 
 }  // namespace ast
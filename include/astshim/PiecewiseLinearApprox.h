@@ -0,0 +1,133 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_PIECEWISELINEARAPPROX_H
+#define ASTSHIM_PIECEWISELINEARAPPROX_H
+
+#include <vector>
+
+#include "astshim/base.h"
+
+namespace ast {
+class Mapping;
+
+/**
+A piecewise linear approximation to the forward transformation of a Mapping over a box.
+
+The box is adaptively subdivided into tiles, much as astTranGrid does internally: if the mapping
+cannot be fit by a linear function (as computed by @ref Mapping.linearApprox "linearApprox")
+to within a specified tolerance over a tile, the tile is split in half along its longest axis,
+and so on until either the fit succeeds or the tile is no longer than a specified minimum size.
+
+The result is a binary tree of tiles, stored in @ref tiles with the root (the whole box) first.
+Each leaf tile either has a linear fit or is marked as not linear, in which case the mapping itself
+should be used for points in that tile. @ref applyForward evaluates the fits.
+
+Construct the class to compute the contained fields.
+*/
+class PiecewiseLinearApprox {
+public:
+    /**
+    A tile of a piecewise linear approximation
+    */
+    struct Tile {
+        /// Lower bound of the tile along each input axis
+        PointD lbnd;
+        /// Upper bound of the tile along each input axis
+        PointD ubnd;
+        /// Indices in @ref tiles of the two halves of this tile, or empty if this is a leaf
+        std::vector<int> children;
+        /// Can the mapping be fit to within the tolerance over this tile? Only set for leaves.
+        bool isLinear;
+        /**
+        Coefficients of the linear fit, if isLinear, else empty.
+
+        This contains `(1 + nIn) * nOut` elements, in the order used by astLinearApprox:
+        the first `nOut` elements are the constant terms, followed by the gradients of output 1
+        with respect to each input, then those of output 2, and so on:
+
+            out_j = fit[j] + sum over k of fit[nOut + j * nIn + k] * in_k
+        */
+        std::vector<double> fit;
+    };
+
+    /**
+    Compute a piecewise linear approximation to the forward transformation of a Mapping.
+
+    @param[in] map  Mapping to approximate.
+    @param[in] lbnd  The lower bounds of the box over which to approximate the mapping;
+                one element per input axis.
+    @param[in] ubnd  The upper bounds of the box over which to approximate the mapping.
+    @param[in] tol  The maximum permitted deviation from linearity within a tile, expressed as
+                a positive Cartesian displacement in the output coordinate space.
+    @param[in] minSize  Tiles whose longest side is no longer than this are not subdivided.
+                For images use 1, so that tiles are not subdivided below the size of a pixel.
+
+    @throws std::invalid_argument if lbnd or ubnd does not have map.getNIn() elements,
+        if any element of ubnd is less than the corresponding element of lbnd,
+        or if minSize is not positive.
+    @throws std::runtime_error if the mapping has no forward transformation.
+    */
+    explicit PiecewiseLinearApprox(Mapping const &map, PointD const &lbnd, PointD const &ubnd, double tol,
+                                   double minSize = 1.0);
+
+    PiecewiseLinearApprox(PiecewiseLinearApprox const &) = default;
+    PiecewiseLinearApprox(PiecewiseLinearApprox &&) = default;
+    PiecewiseLinearApprox &operator=(PiecewiseLinearApprox const &) = default;
+    PiecewiseLinearApprox &operator=(PiecewiseLinearApprox &&) = default;
+
+    /**
+    Transform points using the linear fit of the leaf tile containing each point
+
+    @param[in] from  Points to transform, with dimensions (nIn, nPts).
+    @return the transformed points, with dimensions (nOut, nPts). Points that are outside the box
+        or in a tile that is not linear are set to `nan`.
+
+    @throws std::invalid_argument if `from` does not have nIn axes.
+    */
+    Array2D applyForward(ConstArray2D const &from) const;
+
+    /**
+    Return the index in @ref tiles of the leaf tile containing a point, or -1 if it is outside the box
+
+    A point on the boundary between two tiles is assigned to the upper one.
+
+    @throws std::invalid_argument if `point` does not have nIn elements.
+    */
+    int findTile(PointD const &point) const;
+
+    /// Number of input axes of the mapping
+    int nIn;
+    /// Number of output axes of the mapping
+    int nOut;
+    /// The tolerance used to compute the fits
+    double tol;
+    /// All tiles, the root (the whole box) first; see Tile
+    std::vector<Tile> tiles;
+
+private:
+    /// Return the index of the leaf tile containing the specified input point, or -1 if outside the box
+    int _findTile(double const *point, int stride) const;
+};
+
+}  // namespace ast
+
+#endif
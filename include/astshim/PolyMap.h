@@ -23,6 +23,7 @@
 #define ASTSHIM_POLYMAP_H
 
 #include <algorithm>
+#include <cstdint>
 #include <memory>
 #include <vector>
 
@@ -30,6 +31,9 @@
 #include "astshim/Mapping.h"
 
 namespace ast {
+namespace detail {
+class PolyEvalPlan;
+}
 
 /**
 PolyMap is a @ref Mapping which performs a general polynomial transformation.
@@ -137,6 +141,60 @@ public:
     /// Return a deep copy of this object.
     std::shared_ptr<PolyMap> copy() const { return std::static_pointer_cast<PolyMap>(copyPolymorphic()); }
 
+    /**
+    Does @ref applyForward evaluate the forward polynomial in astshim instead of calling AST?
+
+    See @ref setNativeEval for details.
+    */
+    bool getNativeEval() const { return _nativeEval; }
+
+    /**
+    Set whether @ref applyForward evaluates the forward polynomial in astshim instead of calling AST
+
+    If enabled (the default), the first time this PolyMap transforms points in the forward direction
+    it builds an evaluation plan from the forward coefficients, which evaluates the polynomials
+    by nested Horner's rule in loops over blocks of points. This is typically several times faster
+    than AST for high-order polynomials, and agrees with AST to within rounding error; as for AST,
+    an output is only bad where one of its terms uses a bad (or `nan`) input with a power > 0.
+    The plan is kept until this PolyMap is modified (see @ref Object.getStateId).
+
+    AST is used regardless if the PolyMap is inverted, if @ref Mapping_Report "Report" is set,
+    if the polynomials have many fewer terms than their orders allow (e.g. a few very high
+    powers), or if any coefficient is bad. Only this PolyMap's own @ref applyForward is affected;
+    a compound mapping containing it, and @ref tranGridForward, are always evaluated by AST.
+
+    This setting is not an AST attribute, but it is copied by @ref copy, so it also applies when
+    transforming with several threads (which transform using copies). It is not copied by @ref then,
+    nor to the simplified copy used by @ref setSimplifyThreshold "large transforms"
+    (which is a new mapping, so it uses the default).
+
+    @param[in] nativeEval  Evaluate the forward polynomial in astshim?
+    */
+    void setNativeEval(bool nativeEval) { _nativeEval = nativeEval; }
+
+    /**
+    Get the coefficients of the forward transformation
+
+    @return the coefficients, as a `ncoeff_f x (2 + nin)` array in the
+        @ref PolyMap_CoefficientMatrices "format" accepted by the constructor;
+        this has no rows if the forward transformation is not defined by coefficients.
+        The order of the rows may differ from the order in which they were specified.
+        If this PolyMap is inverted then these are the coefficients of the inverted PolyMap's
+        forward transformation, which are the inverse coefficients it was constructed with.
+    */
+    Array2D getCoeffForward() const;
+
+    /**
+    Get the coefficients of the inverse transformation
+
+    @return the coefficients, as a `ncoeff_i x (2 + nout)` array in the
+        @ref PolyMap_CoefficientMatrices "format" accepted by the constructor;
+        this has no rows if the inverse transformation is not defined by coefficients,
+        e.g. if it is not defined or is iterative (see @ref PolyMap_IterInverse "IterInverse").
+        See getCoeffForward for more information.
+    */
+    Array2D getCoeffInverse() const;
+
     /// Get @ref PolyMap_IterInverse "IterInverse": does this provide an iterative inverse transformation?
     bool getIterInverse() const { return getB("IterInverse"); }
 
@@ -225,13 +283,35 @@ public:
 
 protected:
     virtual std::shared_ptr<Object> copyPolymorphic() const override {
-        return copyImpl<PolyMap, AstPolyMap>();
+        auto retptr = copyImpl<PolyMap, AstPolyMap>();
+        retptr->_nativeEval = _nativeEval;
+        return retptr;
     }
 
     /// Construct a PolyMap from an raw AST pointer
     PolyMap(AstPolyMap *map);
 
+    /**
+    Compute the Jacobian of the forward transformation directly from the polynomial coefficients
+
+    Falls back to the default implementation if this PolyMap is inverted
+    or its forward transformation is not defined by coefficients.
+    */
+    virtual void jacobianImpl(ConstArray2D const &at, Array3D const &jac) const override;
+
+    /**
+    Transform a block of points, evaluating the forward polynomial in astshim if possible;
+    see @ref setNativeEval
+    */
+    virtual void tranImpl(int nPts, int nFromAxes, int fromDim, double const *from, bool doForward,
+                          int nToAxes, int toDim, double *to) const override;
+
 private:
+    /**
+    Return the evaluation plan for the forward transformation, or nullptr if AST must be used
+    */
+    std::shared_ptr<detail::PolyEvalPlan const> _getForwardPlan() const;
+
     /// Make a raw AstPolyMap with specified forward and inverse transforms.
     AstPolyMap *_makeRawPolyMap(ndarray::Array<double, 2, 2> const &coeff_f,
                                 ndarray::Array<double, 2, 2> const &coeff_i,
@@ -240,6 +320,10 @@ private:
     /// Make a raw AstPolyMap with a specified forward transform and an optional iterative inverse.
     AstPolyMap *_makeRawPolyMap(ndarray::Array<double, 2, 2> const &coeff_f, int nout,
                                 std::string const &options = "") const;
+
+    bool _nativeEval = true;  ///< see setNativeEval
+    mutable std::shared_ptr<detail::PolyEvalPlan const> _forwardPlan;  ///< see _getForwardPlan
+    mutable std::uint64_t _forwardPlanStateId = 0;  ///< state ID of this PolyMap when _forwardPlan was made
 };
 
 }  // namespace ast
@@ -0,0 +1,144 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_POLYMAPNEWTONINVERSE_H
+#define ASTSHIM_POLYMAPNEWTONINVERSE_H
+
+#include <cstddef>
+#include <memory>
+#include <vector>
+
+#include "astshim/base.h"
+
+namespace ast {
+class PolyMap;
+
+/**
+The inverse of the forward transformation of a PolyMap, computed by Newton's method
+
+This is an alternative to a PolyMap's own iterative inverse (see @ref PolyMap_IterInverse "IterInverse")
+for transforming many points. Each Newton step is taken for a batch of points at once, using the
+forward polynomial to compute the residuals and its coefficients to compute the Jacobian analytically
+(see @ref Mapping.jacobian "jacobian"). Each point is started from a good initial guess:
+
+- If a box in input space is specified then a coarse inverse polynomial is fit over that box,
+    as by @ref PolyMap.polyTran "polyTran", and evaluated at each point.
+- Otherwise each point is started from the last converged point before it, plus the linear correction
+    given by the Jacobian there, so points that are close together (such as successive pixels of a row
+    of an image) take few steps. Points with no earlier converged point start from the inverse
+    of the linear terms of the polynomial.
+
+Counts of points and Newton steps are accumulated over calls to @ref applyInverse.
+
+@warning Like AST objects, a PolyMapNewtonInverse may only be used by one thread at a time.
+*/
+class PolyMapNewtonInverse {
+public:
+    /**
+    Construct a PolyMapNewtonInverse
+
+    @param[in] polyMap  PolyMap whose forward transformation is to be inverted; it is copied.
+    @param[in] lbnd  Lower bounds of a box in input space over which to fit a coarse inverse polynomial
+                for initial guesses, or empty to start from neighbouring points instead.
+    @param[in] ubnd  Upper bounds of the box, or empty.
+    @param[in] maxOrder  Maximum order of the coarse inverse polynomial; see @ref PolyMap.polyTran.
+    @param[in] tol  Relative tolerance: a point has converged when the last Newton step changed
+                each coordinate by no more than `tol` times the larger of 1 and the magnitude
+                of the largest coordinate. If 0 then use the PolyMap's
+                @ref PolyMap_TolInverse "TolInverse".
+    @param[in] maxIter  Maximum number of Newton steps for each point.
+
+    @throws std::invalid_argument if the PolyMap is inverted, does not have the same number of inputs
+        as outputs or does not have a forward transformation defined by coefficients,
+        if `lbnd` and `ubnd` do not both have polyMap.getNIn() elements (or are both empty),
+        or if `maxIter` is not positive.
+    @throws std::runtime_error if the coarse inverse polynomial cannot be fit.
+    */
+    explicit PolyMapNewtonInverse(PolyMap const &polyMap, std::vector<double> const &lbnd = {},
+                                  std::vector<double> const &ubnd = {}, int maxOrder = 5, double tol = 0,
+                                  int maxIter = 20);
+
+    PolyMapNewtonInverse(PolyMapNewtonInverse const &) = delete;
+    PolyMapNewtonInverse(PolyMapNewtonInverse &&) = default;
+    PolyMapNewtonInverse &operator=(PolyMapNewtonInverse const &) = delete;
+    PolyMapNewtonInverse &operator=(PolyMapNewtonInverse &&) = default;
+
+    /**
+    Compute the inverse of the forward transformation of the PolyMap
+
+    @param[in] to  Points in the output space of the PolyMap, with dimensions (nAxes, nPts).
+    @return the corresponding points in the input space of the PolyMap, with dimensions (nAxes, nPts).
+        Points that do not converge within the maximum number of steps are set to `nan`.
+
+    @throws std::invalid_argument if `to` does not have nAxes axes.
+    */
+    Array2D applyInverse(ConstArray2D const &to);
+
+    /// Get the number of axes: the number of inputs (and outputs) of the PolyMap
+    int getNAxes() const { return _nAxes; }
+
+    /// Get the relative tolerance
+    double getTol() const { return _tol; }
+
+    /// Get the maximum number of Newton steps for each point
+    int getMaxIter() const { return _maxIter; }
+
+    /// Is a coarse inverse polynomial used for initial guesses?
+    bool hasCoarseInverse() const { return static_cast<bool>(_coarseMap); }
+
+    /// Get the number of points transformed by @ref applyInverse
+    std::size_t getNPoints() const { return _nPoints; }
+
+    /// Get the number of points that converged
+    std::size_t getNConverged() const { return _nConverged; }
+
+    /// Get the total number of Newton steps taken
+    std::size_t getNIterations() const { return _nIterations; }
+
+    /// Get the largest number of Newton steps taken for one point
+    int getMaxIterationsUsed() const { return _maxIterationsUsed; }
+
+    /// Reset the counts of points and Newton steps to zero
+    void resetStats() {
+        _nPoints = 0;
+        _nConverged = 0;
+        _nIterations = 0;
+        _maxIterationsUsed = 0;
+    }
+
+private:
+    int _nAxes;
+    double _tol;
+    int _maxIter;
+    std::shared_ptr<PolyMap> _polyMap;    ///< copy of the PolyMap, for evaluating the forward transform
+    Array2D _coeffs;                      ///< forward coefficients, for computing the Jacobian
+    std::shared_ptr<PolyMap> _coarseMap;  ///< PolyMap with the coarse inverse, or null
+    std::vector<double> _linearOffset;    ///< constant terms of the forward polynomial
+    std::vector<double> _linearMatrix;    ///< linear terms of the forward polynomial, row major
+    std::size_t _nPoints;
+    std::size_t _nConverged;
+    std::size_t _nIterations;
+    int _maxIterationsUsed;
+};
+
+}  // namespace ast
+
+#endif
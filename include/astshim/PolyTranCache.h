@@ -0,0 +1,172 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_POLYTRANCACHE_H
+#define ASTSHIM_POLYTRANCACHE_H
+
+#include <cstddef>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "astshim/detail/objectCache.h"
+
+namespace ast {
+class ChebyMap;
+class Mapping;
+class PolyMap;
+
+/**
+A cache of polynomial fits made by @ref PolyMap.polyTran "PolyMap.polyTran"
+and @ref ChebyMap.polyTran "ChebyMap.polyTran"
+
+Fitting a polynomial transform with polyTran can take seconds for high orders, which is wasteful
+when the same fit is made repeatedly (e.g. for the same per-detector distortion model
+at the start of every job). A PolyTranCache remembers each fit, keyed by the contents of the mapping
+and all the arguments of polyTran, so it returns a copy of the previous fit if asked to make
+the same fit again. Lookups work as for @ref SimplifyCache.
+
+Least recently used entries are discarded to keep the number of cached fits and the total size
+of the cache within specified limits. The size of an entry is the size of the fit
+(as reported by @ref Object.getObjSize "getObjSize") plus the length of the serialized mapping
+and arguments, which are kept to verify matches.
+
+If a directory is specified then each new fit is also saved to a file in that directory, and fits
+that are not in memory are looked for there before fitting, so that fits persist between processes.
+Each file records its full key, so a file is only used for exactly the same mapping and arguments.
+Files are written to a temporary name and then renamed, so several processes may safely share
+a directory. Files that cannot be read or written are ignored.
+
+@warning Like AST objects, a PolyTranCache may only be used by one thread at a time.
+*/
+class PolyTranCache {
+public:
+    /**
+    Construct a PolyTranCache
+
+    @param[in] maxEntries  Maximum number of fits to keep in memory.
+    @param[in] directory  Directory in which to save fits, or "" to only cache them in memory.
+                The directory must exist.
+    @param[in] maxSize  Maximum total size of the cache in memory (bytes).
+                An entry larger than this is not kept in memory.
+    */
+    explicit PolyTranCache(std::size_t maxEntries = 100, std::string const &directory = "",
+                           std::size_t maxSize = 10000000);
+
+    PolyTranCache(PolyTranCache const &) = delete;
+    PolyTranCache(PolyTranCache &&) = default;
+    PolyTranCache &operator=(PolyTranCache const &) = delete;
+    PolyTranCache &operator=(PolyTranCache &&) = default;
+
+    /**
+    Return the result of `mapping.polyTran(forward, acc, maxacc, maxorder, lbnd, ubnd)`,
+    from the cache if possible
+
+    The result is always a new copy, which the caller may modify freely.
+    See @ref PolyMap.polyTran for details of the arguments.
+    */
+    std::shared_ptr<PolyMap> polyTran(PolyMap const &mapping, bool forward, double acc, double maxacc,
+                                      int maxorder, std::vector<double> const &lbnd,
+                                      std::vector<double> const &ubnd);
+
+    /**
+    Return the result of `mapping.polyTran(forward, acc, maxacc, maxorder, lbnd, ubnd)`,
+    from the cache if possible
+
+    The result is always a new copy, which the caller may modify freely.
+    See @ref ChebyMap.polyTran for details of the arguments.
+    */
+    std::shared_ptr<ChebyMap> polyTran(ChebyMap const &mapping, bool forward, double acc, double maxacc,
+                                       int maxorder, std::vector<double> const &lbnd,
+                                       std::vector<double> const &ubnd);
+
+    /**
+    Return the result of `mapping.polyTran(forward, acc, maxacc, maxorder)`, from the cache if possible
+
+    The fit is made over the domain of the ChebyMap, as for the corresponding overload
+    of @ref ChebyMap.polyTran.
+    */
+    std::shared_ptr<ChebyMap> polyTran(ChebyMap const &mapping, bool forward, double acc, double maxacc,
+                                       int maxorder);
+
+    /// Discard all fits cached in memory; files are not deleted and the counts are not reset.
+    void clear();
+
+    /// Get the directory in which fits are saved, or "" if none
+    std::string getDirectory() const { return _directory; }
+
+    /// Get the maximum number of fits kept in memory
+    std::size_t getMaxEntries() const { return _cache.getMaxEntries(); }
+
+    /// Get the maximum total size of the cache in memory (bytes)
+    std::size_t getMaxSize() const { return _cache.getMaxSize(); }
+
+    /// Get the number of fits in memory
+    std::size_t getNEntries() const { return _cache.getNEntries(); }
+
+    /// Get the total size of the cache in memory (bytes)
+    std::size_t getSize() const { return _cache.getSize(); }
+
+    /// Get the number of calls to @ref polyTran that returned a fit from memory
+    std::size_t getNHits() const { return _nHits; }
+
+    /// Get the number of calls to @ref polyTran that returned a fit read from a file
+    std::size_t getNFileHits() const { return _nFileHits; }
+
+    /// Get the number of calls to @ref polyTran that had to fit the polynomial
+    std::size_t getNMisses() const { return _nMisses; }
+
+    /// Reset the counts of hits and misses to zero
+    void resetStats() {
+        _nHits = 0;
+        _nFileHits = 0;
+        _nMisses = 0;
+    }
+
+private:
+    /**
+    Return a copy of the fit made by calling `mapping.polyTran(forward, acc, maxacc, maxorder, lbnd, ubnd)`,
+    using the cache if possible.
+    */
+    template <typename MapT>
+    std::shared_ptr<MapT> _polyTran(MapT const &mapping, bool forward, double acc, double maxacc,
+                                    int maxorder, std::vector<double> const &lbnd,
+                                    std::vector<double> const &ubnd);
+
+    /// Return the fit for a key saved in the directory, or nullptr if none
+    std::shared_ptr<Mapping> _readFile(std::string const &key) const;
+
+    /// Save a fit to the directory, ignoring errors
+    void _writeFile(std::string const &key, Mapping const &fitMap) const;
+
+    /// Return the path of the file in which the fit for a key is saved
+    std::string _getPath(std::string const &key) const;
+
+    std::string _directory;
+    detail::ObjectCache<std::shared_ptr<Mapping>> _cache;  ///< fits in memory, keyed by mapping and arguments
+    std::size_t _nHits;
+    std::size_t _nFileHits;
+    std::size_t _nMisses;
+};
+
+}  // namespace ast
+
+#endif
@@ -24,6 +24,8 @@
 
 #include <vector>
 
+#include "astshim/base.h"
+
 namespace ast {
 class Mapping;
 
@@ -100,6 +102,87 @@ public:
     The RMS residual between the fit and the Mapping, summed over all Mapping outputs.
     */
     double rms;
+
+    /// Get the number of outputs of the fit
+    int getNOut() const { return static_cast<int>(fit.size()) / 6; }
+
+    /**
+    Evaluate the quadratic approximation at many points
+
+    @param[in] from  Input points, with dimensions (2, nPts)
+    @return the outputs, with dimensions (nOut, nPts)
+
+    @throws std::invalid_argument if `from` does not have 2 axes.
+    */
+    Array2D applyForward(ConstArray2D const &from) const;
+};
+
+/**
+Quadratic approximations to a 2D Mapping on a regular grid of tiles.
+
+The box is divided into `nxTiles` by `nyTiles` tiles of equal size and a @ref QuadApprox is fit to each.
+This can model a mapping much more accurately than a single QuadApprox, and is cheap to evaluate,
+so it can be used in place of the mapping where the residuals are small enough.
+
+Construct the class to compute the contained fields.
+*/
+class TiledQuadApprox {
+public:
+    /**
+    Obtain quadratic approximations to a 2D Mapping on a grid of tiles.
+
+    @param[in] map  Mapping to fit.
+    @param[in] lbnd  The lower bounds of the box over which to fit the mapping; 2 elements.
+    @param[in] ubnd  The upper bounds of the box over which to fit the mapping; 2 elements.
+    @param[in] nxTiles  The number of tiles along the first input axis.
+    @param[in] nyTiles  The number of tiles along the second input axis.
+    @param[in] nx  The number of points to fit along the first input axis of each tile;
+       see @ref QuadApprox.
+    @param[in] ny  The number of points to fit along the second input axis of each tile;
+       see @ref QuadApprox.
+
+    @throws std::invalid_argument if the mapping does not have 2 inputs,
+        if lbnd or ubnd do not each contain 2 elements, if any element of ubnd is not greater than
+        the corresponding element of lbnd, or if nxTiles or nyTiles is not positive.
+    @throws std::runtime_error if the fit for any tile cannot be computed.
+    */
+    explicit TiledQuadApprox(Mapping const &map, std::vector<double> const &lbnd,
+                             std::vector<double> const &ubnd, int nxTiles, int nyTiles, int nx = 3,
+                             int ny = 3);
+
+    TiledQuadApprox(TiledQuadApprox const &) = default;
+    TiledQuadApprox(TiledQuadApprox &&) = default;
+    TiledQuadApprox &operator=(TiledQuadApprox const &) = default;
+    TiledQuadApprox &operator=(TiledQuadApprox &&) = default;
+
+    /**
+    Evaluate the quadratic approximation of the tile containing each point
+
+    @param[in] from  Input points, with dimensions (2, nPts)
+    @return the outputs, with dimensions (nOut, nPts); points outside the box are set to `nan`.
+
+    @throws std::invalid_argument if `from` does not have 2 axes.
+    */
+    Array2D applyForward(ConstArray2D const &from) const;
+
+    /**
+    Get the fit for one tile
+
+    @param[in] ix  Index of the tile along the first input axis, in the range [0, nxTiles)
+    @param[in] iy  Index of the tile along the second input axis, in the range [0, nyTiles)
+
+    @throws std::out_of_range if ix or iy is out of range.
+    */
+    QuadApprox const &getTile(int ix, int iy) const;
+
+    std::vector<double> lbnd;  ///< Lower bounds of the box
+    std::vector<double> ubnd;  ///< Upper bounds of the box
+    int nxTiles;               ///< Number of tiles along the first input axis
+    int nyTiles;               ///< Number of tiles along the second input axis
+    /// The fit for each tile, the first input axis varying fastest; see also getTile
+    std::vector<QuadApprox> tiles;
+    /// The largest RMS residual of any tile
+    double maxRms;
 };
 
 }  // namespace ast
@@ -0,0 +1,119 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_SIMPLIFYCACHE_H
+#define ASTSHIM_SIMPLIFYCACHE_H
+
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+
+#include "astshim/detail/objectCache.h"
+
+namespace ast {
+class Mapping;
+
+/**
+A cache of simplified mappings
+
+@ref Mapping.simplify "Simplifying" a mapping runs astSimplify and makes a deep copy of the result,
+which is wasteful when the same mapping is simplified repeatedly.
+A SimplifyCache remembers the simplified version of each mapping it is given, keyed by the contents
+of the mapping, so it returns the previously simplified mapping for any mapping equal to one it has seen.
+Thus copies of a mapping share one entry, and changes to a component of a compound mapping
+(e.g. one made by @ref Mapping.then "then", which shares its components) are noticed.
+Looking up the same unmodified mapping again is cheap; looking up an equal copy costs one serialization
+of the mapping (see @ref Object.toString "toString") to verify the match.
+
+Least recently used entries are discarded to keep the total size of the cache within a specified limit.
+The size of an entry is the size of the simplified mapping (as reported by
+@ref Object.getObjSize "getObjSize") plus the length of the serialized original mapping,
+which is kept to verify matches.
+
+Simplified mappings are shared between the cache and its callers; modifying one is harmless
+(the cache will notice and simplify again the next time it is needed), but wasteful.
+
+@warning Like AST objects, a SimplifyCache may only be used by one thread at a time.
+*/
+class SimplifyCache {
+public:
+    /**
+    Construct a SimplifyCache
+
+    @param[in] maxSize  Maximum total size of the cache (bytes).
+                An entry larger than this is not cached.
+    */
+    explicit SimplifyCache(std::size_t maxSize = 10000000);
+
+    SimplifyCache(SimplifyCache const &) = delete;
+    SimplifyCache(SimplifyCache &&) = default;
+    SimplifyCache &operator=(SimplifyCache const &) = delete;
+    SimplifyCache &operator=(SimplifyCache &&) = default;
+
+    /**
+    Return a simplified version of a mapping, from the cache if possible
+
+    This is equivalent to `mapping.simplify()`, except that the result may be shared
+    with the cache and with earlier callers.
+
+    @param[in] mapping  Mapping to simplify.
+    */
+    std::shared_ptr<Mapping> simplify(Mapping const &mapping);
+
+    /// Discard all cached mappings; the hit and miss counts are not reset.
+    void clear();
+
+    /// Get the maximum total size of the cache (bytes)
+    std::size_t getMaxSize() const { return _cache.getMaxSize(); }
+
+    /// Get the number of cached mappings
+    std::size_t getNEntries() const { return _cache.getNEntries(); }
+
+    /// Get the number of calls to @ref simplify that returned a cached mapping
+    std::size_t getNHits() const { return _nHits; }
+
+    /// Get the number of calls to @ref simplify that had to simplify the mapping
+    std::size_t getNMisses() const { return _nMisses; }
+
+    /// Get the total size of the cache (bytes)
+    std::size_t getSize() const { return _cache.getSize(); }
+
+    /// Reset the hit and miss counts to zero
+    void resetStats() {
+        _nHits = 0;
+        _nMisses = 0;
+    }
+
+private:
+    /// A cached simplified mapping
+    struct Entry {
+        std::shared_ptr<Mapping> simpMap;  ///< simplified mapping
+        std::uint64_t simpStateId;         ///< state ID of `simpMap` when it was cached
+    };
+
+    detail::ObjectCache<Entry> _cache;  ///< cached mappings, keyed by the original mapping
+    std::size_t _nHits;
+    std::size_t _nMisses;
+};
+
+}  // namespace ast
+
+#endif
@@ -45,6 +45,10 @@ using Array2D = ndarray::Array<double, 2, 2>;
 */
 using ConstArray2D = ndarray::Array<double const, 2, 2>;
 /**
+3D array of double; used for a list of matrices, such as the Jacobian of a Mapping at many points
+*/
+using Array3D = ndarray::Array<double, 3, 3>;
+/**
 Vector of ints; typically used for the bounds of Mapping.tranGridForward and inverse
 */
 using PointI = std::vector<int>;
@@ -97,7 +101,8 @@ Throw std::runtime_error if AST's state is bad
 @param  rawPtr2  An AST object to free if status is bad
 
 @note on the first call an error handler is registered
-that saves error messages to a buffer.
+that saves error messages to a buffer. Each thread has its own buffer and AST status,
+so this may safely be called from several threads at once.
 */
 void assertOK(AstObject *rawPtr1 = nullptr, AstObject *rawPtr2 = nullptr);
 
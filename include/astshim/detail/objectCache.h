@@ -0,0 +1,186 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsstcorp.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_DETAIL_OBJECTCACHE_H
+#define ASTSHIM_DETAIL_OBJECTCACHE_H
+
+#include <cstddef>
+#include <cstdint>
+#include <iterator>
+#include <limits>
+#include <list>
+#include <string>
+#include <unordered_map>
+#include <utility>
+
+#include "astshim/detail/utils.h"
+#include "astshim/Object.h"
+
+namespace ast {
+namespace detail {
+
+/**
+A least recently used cache of values computed from AST objects, keyed by the contents of the object
+and a string of extra information (e.g. the other arguments of the computation)
+
+Entries are looked up by the @ref Object.hash "hash" of the object and the extra key. A match is verified
+by comparing the serialized object with the one saved in the entry, unless the object is known to be
+unchanged since it last matched the entry (see @ref Object.isUnchangedSince). Thus looking up the same
+unmodified object again is cheap, while looking up a different object costs one serialization
+if the entry is found, and none if it is not.
+
+The size of an entry is the size of its value, as given by the caller, plus the lengths of the saved
+serialized object and extra key. Least recently used entries are discarded to keep the total size
+and the number of entries within the specified limits.
+
+@warning Like AST objects, an ObjectCache may only be used by one thread at a time.
+*/
+template <typename Value>
+class ObjectCache {
+public:
+    /**
+    Construct an ObjectCache
+
+    @param[in] maxSize  Maximum total size of the entries (bytes).
+    @param[in] maxEntries  Maximum number of entries.
+    */
+    explicit ObjectCache(std::size_t maxSize,
+                         std::size_t maxEntries = std::numeric_limits<std::size_t>::max())
+            : _maxSize(maxSize), _maxEntries(maxEntries), _size(0), _entries(), _entryMap() {}
+
+    ObjectCache(ObjectCache const &) = delete;
+    ObjectCache(ObjectCache &&) = default;
+    ObjectCache &operator=(ObjectCache const &) = delete;
+    ObjectCache &operator=(ObjectCache &&) = default;
+
+    /**
+    Return the value cached for an object and extra key, or nullptr if none
+
+    A value that is found becomes the most recently used. The caller may modify it.
+    */
+    Value *find(Object const &obj, std::string const &extra) {
+        auto mapIter = _entryMap.find(_hash(obj, extra));
+        if (mapIter == _entryMap.end()) {
+            return nullptr;
+        }
+        auto entryIter = mapIter->second;
+        if (entryIter->extra != extra) {
+            return nullptr;
+        }
+        if (!obj.isUnchangedSince(entryIter->stateId, entryIter->modificationCount)) {
+            std::uint64_t const modificationCount = Object::getModificationCount();
+            if (obj.toString() != entryIter->text) {
+                return nullptr;
+            }
+            entryIter->stateId = obj.getStateId();
+            entryIter->modificationCount = modificationCount;
+        }
+        // move the entry to the front of the list, as the most recently used
+        _entries.splice(_entries.begin(), _entries, entryIter);
+        return &entryIter->value;
+    }
+
+    /**
+    Cache a value for an object and extra key, replacing any value already cached for them
+
+    Least recently used entries are discarded to make room for the new entry.
+    If the new entry is too large to fit in an empty cache then it is not cached.
+
+    @param[in] obj  Object from which the value was computed.
+    @param[in] extra  Extra key.
+    @param[in] value  Value to cache.
+    @param[in] valueSize  Size of the value (bytes).
+    */
+    void insert(Object const &obj, std::string const &extra, Value value, std::size_t valueSize) {
+        std::uint64_t const modificationCount = Object::getModificationCount();
+        std::uint64_t const hash = _hash(obj, extra);
+        auto mapIter = _entryMap.find(hash);
+        if (mapIter != _entryMap.end()) {
+            _erase(mapIter->second);
+        }
+        std::string text = obj.toString();
+        std::size_t const size = valueSize + text.size() + extra.size();
+        if ((size > _maxSize) || (_maxEntries == 0)) {
+            return;
+        }
+        while ((_size + size > _maxSize) || (_entries.size() >= _maxEntries)) {
+            _erase(std::prev(_entries.end()));
+        }
+        _entries.push_front(Entry{hash, std::move(text), extra, obj.getStateId(), modificationCount,
+                                  std::move(value), size});
+        _entryMap[hash] = _entries.begin();
+        _size += size;
+    }
+
+    /// Discard all entries
+    void clear() {
+        _entries.clear();
+        _entryMap.clear();
+        _size = 0;
+    }
+
+    /// Get the maximum total size of the entries (bytes)
+    std::size_t getMaxSize() const { return _maxSize; }
+
+    /// Get the maximum number of entries
+    std::size_t getMaxEntries() const { return _maxEntries; }
+
+    /// Get the number of entries
+    std::size_t getNEntries() const { return _entries.size(); }
+
+    /// Get the total size of the entries (bytes)
+    std::size_t getSize() const { return _size; }
+
+private:
+    /// A cached value
+    struct Entry {
+        std::uint64_t hash;               ///< hash of the object and extra key
+        std::string text;                 ///< serialized object
+        std::string extra;                ///< extra key
+        std::uint64_t stateId;            ///< state ID of the object that last matched this entry
+        std::uint64_t modificationCount;  ///< Object::getModificationCount() when it last matched
+        Value value;                      ///< cached value
+        std::size_t size;                 ///< size of this entry (bytes)
+    };
+
+    /// Return the hash of an object and extra key
+    static std::uint64_t _hash(Object const &obj, std::string const &extra) {
+        return fnv1aHash(extra.data(), extra.size(), static_cast<std::uint64_t>(obj.hash()));
+    }
+
+    /// Remove an entry
+    void _erase(typename std::list<Entry>::iterator entryIter) {
+        _size -= entryIter->size;
+        _entryMap.erase(entryIter->hash);
+        _entries.erase(entryIter);
+    }
+
+    std::size_t _maxSize;
+    std::size_t _maxEntries;
+    std::size_t _size;
+    std::list<Entry> _entries;  ///< entries, most recently used first
+    std::unordered_map<std::uint64_t, typename std::list<Entry>::iterator> _entryMap;  ///< entries by hash
+};
+
+}  // namespace detail
+}  // namespace ast
+
+#endif
@@ -22,7 +22,9 @@
 #ifndef ASTSHIM_DETAIL_POLYMAPUTILS_H
 #define ASTSHIM_DETAIL_POLYMAPUTILS_H
 
+#include <memory>
 #include <stdexcept>
+#include <vector>
 
 #include "astshim/base.h"
 
@@ -70,6 +72,135 @@ template <class AstMapT, class MapT>
 AstMapT *polyTranImpl(MapT const &mapping, bool forward, double acc, double maxacc, int maxorder,
                       std::vector<double> const &lbnd, std::vector<double> const &ubnd);
 
+/**
+Get the coefficients of one direction of a polynomial transform by calling astPolyCoeffs
+
+@tparam MapT  astshim class: one of ast::ChebyMap or ast::PolyMap
+
+@param[in] mapping  The mapping.
+@param[in] forward  If true get the coefficients of the forward transformation, else the inverse.
+                If the mapping is inverted then these are the directions of the inverted mapping,
+                e.g. the forward coefficients of an inverted mapping are the inverse coefficients
+                it was constructed with.
+@return the coefficients, as a `ncoeff x (2 + nin)` array in the format accepted by the constructor
+                (where `nin` is the number of inputs of the requested transformation);
+                empty if that transformation is not defined by coefficients.
+*/
+template <class MapT>
+Array2D polyCoeffsImpl(MapT const &mapping, bool forward);
+
+/**
+Compute the Jacobian of a polynomial transform defined by PolyMap coefficients
+
+@param[in] coeffs  Coefficients, as a `ncoeff x (2 + nin)` array; see polyCoeffsImpl.
+@param[in] at  Positions at which to evaluate the Jacobian, with dimensions (nin, nPts).
+@param[out] jac  The Jacobian, with dimensions (nPts, nout, nin).
+*/
+void polyJacobian(ConstArray2D const &coeffs, ConstArray2D const &at, Array3D const &jac);
+
+/**
+Compute the Jacobian of a Chebyshev polynomial transform defined by ChebyMap coefficients
+
+@param[in] coeffs  Coefficients, as a `ncoeff x (2 + nin)` array; see polyCoeffsImpl.
+@param[in] lbnd  Lower bounds of the domain of the transform; length nin.
+@param[in] ubnd  Upper bounds of the domain of the transform; length nin.
+@param[in] at  Positions at which to evaluate the Jacobian, with dimensions (nin, nPts).
+@param[out] jac  The Jacobian, with dimensions (nPts, nout, nin).
+                Points outside the domain are set to `nan`, like the results of the transform.
+*/
+void chebyJacobian(ConstArray2D const &coeffs, std::vector<double> const &lbnd,
+                   std::vector<double> const &ubnd, ConstArray2D const &at, Array3D const &jac);
+
+/**
+Evaluate a Chebyshev polynomial transform defined by ChebyMap coefficients on a regular grid of points
+
+The transform is evaluated as a separable tensor product: the Chebyshev polynomials of each grid
+axis but the first are tabulated once per grid line and contracted with the coefficients, one axis
+at a time, leaving a 1-d polynomial in the first axis, which is evaluated at each point of the line
+by Clenshaw's recurrence. Thus the cost is about (number of points) * (order) instead of
+(number of points) * (number of coefficients).
+
+@param[in] coeffs  Coefficients, as a `ncoeff x (2 + nin)` array; see polyCoeffsImpl.
+@param[in] lbnd  Lower bounds of the domain of the transform; length nin.
+@param[in] ubnd  Upper bounds of the domain of the transform; length nin.
+@param[in] inDomain  For each axis, whether each grid coordinate along that axis is within the domain;
+                `inDomain[k][i]` is for coordinate `gridLbnd[k] + i` of axis k.
+@param[in] gridLbnd  The coordinates of the first point of the grid along each axis; length nin.
+@param[in] gridUbnd  The coordinates of the last point of the grid along each axis; length nin.
+@param[out] to  Transformed points, with dimensions (nout, nPts), where nPts is at least the number
+                of grid points; the first grid axis varies fastest, as for astTranGrid.
+                As for the transform, an output is set to `AST__BAD` at points where an axis
+                on which it depends is outside the domain.
+*/
+void chebyGrid(ConstArray2D const &coeffs, std::vector<double> const &lbnd, std::vector<double> const &ubnd,
+               std::vector<std::vector<bool>> const &inDomain, PointI const &gridLbnd,
+               PointI const &gridUbnd, Array2D const &to);
+
+/**
+A plan for evaluating a polynomial transform defined by PolyMap coefficients, built once and used
+to transform many points
+
+The coefficients for each output are stored as a dense array indexed by the power of each input,
+which is evaluated by nested Horner's rule: as a polynomial in the last input whose coefficients
+are polynomials in the remaining inputs. Each step is a simple loop over a block of points,
+which the compiler can vectorize, and slices of the array that are all zero are skipped.
+*/
+class PolyEvalPlan {
+public:
+    /**
+    Make a plan, if evaluating the dense coefficient arrays is not much more work than evaluating
+    the terms one at a time
+
+    @param[in] coeffs  Coefficients, as a `ncoeff x (2 + nIn)` array; see polyCoeffsImpl.
+    @param[in] nOut  Number of outputs.
+    @return the plan, or nullptr if the coefficients are too sparse or any of them is `AST__BAD`
+    */
+    static std::shared_ptr<PolyEvalPlan const> make(ConstArray2D const &coeffs, int nOut);
+
+    /**
+    Transform points
+
+    The arguments are those of astTranN: coordinate `k` of point `i` is `from[k * fromDim + i]`
+    and likewise for `to`. As for AST, an output is set to `AST__BAD` at points where an input
+    that one of its terms uses with a power > 0 is `AST__BAD` or `nan`.
+
+    @param[in] nPts  Number of points to transform.
+    @param[in] fromDim  Stride between input coordinates (at least `nPts`).
+    @param[in] from  Input coordinates; there must be getNIn() of them.
+    @param[in] toDim  Stride between output coordinates (at least `nPts`).
+    @param[out] to  Output coordinates; there must be getNOut() of them.
+    */
+    void apply(int nPts, int fromDim, double const *from, int toDim, double *to) const;
+
+    /// Get the number of inputs
+    int getNIn() const { return _nIn; }
+
+    /// Get the number of outputs
+    int getNOut() const { return static_cast<int>(_outputs.size()); }
+
+private:
+    /// The dense coefficient array for one output
+    struct Output {
+        std::vector<int> dims;       ///< number of powers of each input: max power + 1
+        std::vector<int> strides;    ///< stride of each input in `coeffs`; input 0 is contiguous
+        std::vector<double> coeffs;  ///< coefficients, indexed by the power of each input
+        /// nonZero[k][n]: is slice `n` of `coeffs` for inputs [0, k] (of length strides[k + 1]) not all zero?
+        std::vector<std::vector<bool>> nonZero;
+    };
+
+    PolyEvalPlan(int nIn, std::vector<Output> outputs) : _nIn(nIn), _outputs(std::move(outputs)) {}
+
+    /**
+    Evaluate the polynomial in inputs [0, axis] given by the slice of `output.coeffs`
+    starting at `offset`, for the `nPts` points of `x`, putting the result into `acc[axis]`
+    */
+    void _evalSlice(Output const &output, int axis, int offset, int nPts, double const *const *x,
+                    std::vector<std::vector<double>> &acc) const;
+
+    int _nIn;
+    std::vector<Output> _outputs;
+};
+
 }  // namespace detail
 }  // namespace ast
 
@@ -22,6 +22,8 @@
 #ifndef ASTSHIM_DETAIL_UTILS_H
 #define ASTSHIM_DETAIL_UTILS_H
 
+#include <cstddef>
+#include <cstdint>
 #include <stdexcept>
 
 #include "astshim/base.h"
@@ -38,6 +40,50 @@ inline void annulAstObject(AstObject *object) {
     }
 }
 
+/**
+Lock an AST object for exclusive use by the calling thread for the lifetime of this guard
+
+The object is locked when the guard is constructed, waiting if another thread has it locked.
+When the guard is destroyed the object is returned to its original state: it is left locked
+if the calling thread already had it locked, and is otherwise unlocked, so that other threads
+may lock it in turn.
+This has no effect if the AST library was built without POSIX thread support.
+*/
+class ThreadLockGuard {
+public:
+    /**
+    Lock an AST object, waiting until it is available
+
+    Locking does not modify the object, so this accepts a const pointer
+    (which, unlike the non-const Object::getRawPtr, does not change the object's state ID).
+
+    @param[in] rawObj  The object to lock; it must outlive the guard.
+    */
+    explicit ThreadLockGuard(AstObject const *rawObj)
+            : _rawObj(const_cast<AstObject *>(rawObj)), _wasLocked(astThread(_rawObj, 0) == AST__RUNNING) {
+        assertOK();
+        if (!_wasLocked) {
+            astLock(_rawObj, 1);
+            assertOK();
+        }
+    }
+
+    ~ThreadLockGuard() {
+        if (!_wasLocked) {
+            astUnlock(_rawObj, 0);
+        }
+    }
+
+    ThreadLockGuard(ThreadLockGuard const &) = delete;
+    ThreadLockGuard(ThreadLockGuard &&) = delete;
+    ThreadLockGuard &operator=(ThreadLockGuard const &) = delete;
+    ThreadLockGuard &operator=(ThreadLockGuard &&) = delete;
+
+private:
+    AstObject *_rawObj;
+    bool _wasLocked;  ///< was the object locked by the calling thread when the guard was constructed?
+};
+
 template <typename T1, typename T2>
 inline void assertEqual(T1 val1, std::string const &descr1, T2 val2, std::string const &descr2) {
     if (val1 != val2) {
@@ -48,21 +94,52 @@ inline void assertEqual(T1 val1, std::string const &descr1, T2 val2, std::string
 }
 
 /**
-Replace `AST__BAD` with a quiet NaN in a vector
+Replace `AST__BAD` with a quiet NaN in a contiguous block of memory
+
+The loop has no branches, so that the compiler can vectorize it.
+It is fastest when the data is already in cache, e.g. just after AST has computed it.
+
+@param[in,out] data  Pointer to the first value
+@param[in] n  Number of values
 */
-inline void astBadToNan(std::vector<double> &p) {
-    for (auto &val : p) {
-        if (val == AST__BAD) {
-            val = std::numeric_limits<double>::quiet_NaN();
-        }
+inline void astBadToNan(double *data, std::size_t n) {
+    double const nan = std::numeric_limits<double>::quiet_NaN();
+    for (std::size_t i = 0; i < n; ++i) {
+        data[i] = data[i] == AST__BAD ? nan : data[i];
     }
 }
 
+/**
+Replace `AST__BAD` with a quiet NaN in a vector
+*/
+inline void astBadToNan(std::vector<double> &p) { astBadToNan(p.data(), p.size()); }
+
 /**
 Replace `AST__BAD` with a quiet NaN in a 2-D array
 */
 void astBadToNan(ast::Array2D const &arr);
 
+/// Initial value of a 64-bit FNV-1a hash; see fnv1aHash
+static const std::uint64_t FNV_OFFSET_BASIS = 14695981039346656037ULL;
+
+/**
+Add data to a 64-bit FNV-1a hash
+
+Unlike std::hash, the result is the same for all compilers and platforms.
+
+@param[in] data  Pointer to the first byte of data
+@param[in] n  Number of bytes
+@param[in] hash  Hash of the preceding data, or FNV_OFFSET_BASIS to start a new hash
+@return the hash of the preceding data followed by `data`
+*/
+inline std::uint64_t fnv1aHash(char const *data, std::size_t n, std::uint64_t hash = FNV_OFFSET_BASIS) {
+    std::uint64_t const prime = 1099511628211ULL;
+    for (std::size_t i = 0; i < n; ++i) {
+        hash = (hash ^ static_cast<unsigned char>(data[i])) * prime;
+    }
+    return hash;
+}
+
 /**
 Format an axis-specific attribute by appending the axis index
 
@@ -0,0 +1,88 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_DETAIL_WORKERTHREADS_H
+#define ASTSHIM_DETAIL_WORKERTHREADS_H
+
+#include <memory>
+#include <thread>
+#include <utility>
+#include <vector>
+
+namespace ast {
+class Mapping;
+
+namespace detail {
+
+/**
+Return deep copies of a mapping for use by worker threads, one per worker
+
+An AST object can only be used by the thread that has it locked, so each copy is returned unlocked,
+ready for its worker to lock (e.g. with a ThreadLockGuard). Each copy is locked again by the thread
+that frees it, waiting if necessary, so the copies may be freed by any thread that is not
+still using them, including while unwinding from an exception.
+
+@param[in] mapping  Mapping to copy; it must be locked by the calling thread.
+@param[in] nCopies  Number of copies.
+*/
+std::vector<std::shared_ptr<Mapping>> makeWorkerMappings(Mapping const &mapping, int nCopies);
+
+/**
+A group of threads that are joined when the group is destroyed
+
+Destroying a std::thread that has not been joined calls std::terminate, so this makes it safe
+to throw an exception after some threads have been started. Construct the group after the data
+its threads use, so that the threads are joined before that data is destroyed.
+*/
+class ThreadGroup {
+public:
+    ThreadGroup() = default;
+
+    ThreadGroup(ThreadGroup const &) = delete;
+    ThreadGroup(ThreadGroup &&) = delete;
+    ThreadGroup &operator=(ThreadGroup const &) = delete;
+    ThreadGroup &operator=(ThreadGroup &&) = delete;
+
+    ~ThreadGroup() { join(); }
+
+    /// Start a thread running `func`
+    template <typename Func>
+    void start(Func &&func) {
+        _threads.emplace_back(std::forward<Func>(func));
+    }
+
+    /// Wait for all threads to finish
+    void join() {
+        for (auto &thread : _threads) {
+            if (thread.joinable()) {
+                thread.join();
+            }
+        }
+    }
+
+private:
+    std::vector<std::thread> _threads;
+};
+
+}  // namespace detail
+}  // namespace ast
+
+#endif
@@ -0,0 +1,145 @@
+/*
+ * LSST Data Management System
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ * See the COPYRIGHT file
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <pybind11/pybind11.h>
+
+#define ASTSHIM_IMPORT_NUMPY
+#include "numpyImport.h"
+
+namespace py = pybind11;
+
+namespace ast {
+
+void wrapBase(py::module &mod);
+void wrapObject(py::module &mod);
+void wrapStream(py::module &mod);
+void wrapChannel(py::module &mod);
+void wrapMapBox(py::module &mod);
+void wrapMapSplit(py::module &mod);
+void wrapMapSplitCache(py::module &mod);
+void wrapMapping(py::module &mod);
+void wrapFrame(py::module &mod);
+void wrapFrameSet(py::module &mod);
+void wrapKeyMap(py::module &mod);
+void wrapPiecewiseLinearApprox(py::module &mod);
+void wrapQuadApprox(py::module &mod);
+void wrapMappingPool(py::module &mod);
+void wrapSimplifyCache(py::module &mod);
+void wrapFunctional(py::module &mod);
+void wrapFitsChan(py::module &mod);
+void wrapXmlChan(py::module &mod);
+void wrapChebyMap(py::module &mod);
+void wrapCmpMap(py::module &mod);
+void wrapLutMap(py::module &mod);
+void wrapMathMap(py::module &mod);
+void wrapMatrixMap(py::module &mod);
+void wrapNormMap(py::module &mod);
+void wrapParallelMap(py::module &mod);
+void wrapSeriesMap(py::module &mod);
+void wrapPcdMap(py::module &mod);
+void wrapPermMap(py::module &mod);
+void wrapPolyMap(py::module &mod);
+void wrapPolyMapNewtonInverse(py::module &mod);
+void wrapPolyTranCache(py::module &mod);
+void wrapRateMap(py::module &mod);
+void wrapShiftMap(py::module &mod);
+void wrapSlaMap(py::module &mod);
+void wrapSphMap(py::module &mod);
+void wrapTimeMap(py::module &mod);
+void wrapTranMap(py::module &mod);
+void wrapUnitMap(py::module &mod);
+void wrapUnitNormMap(py::module &mod);
+void wrapWcsMap(py::module &mod);
+void wrapWinMap(py::module &mod);
+void wrapZoomMap(py::module &mod);
+void wrapCmpFrame(py::module &mod);
+void wrapSkyFrame(py::module &mod);
+void wrapSpecFrame(py::module &mod);
+void wrapTimeFrame(py::module &mod);
+
+namespace {
+
+/*
+All of astshim is wrapped in this one Python module, which is much faster to import
+than a separate module for each class.
+*/
+PYBIND11_PLUGIN(_astshimLib) {
+    py::module mod("_astshimLib", "Python wrapper for astshim");
+
+    // Need to import numpy for ndarray and eigen conversions
+    if (_import_array() < 0) {
+        PyErr_SetString(PyExc_ImportError, "numpy.core.multiarray failed to import");
+        return nullptr;
+    }
+
+    // Wrap base classes before the classes that derive from them
+    wrapBase(mod);
+    wrapObject(mod);
+    wrapStream(mod);
+    wrapChannel(mod);
+    wrapMapBox(mod);
+    wrapMapSplit(mod);
+    wrapMapSplitCache(mod);
+    wrapMapping(mod);
+    wrapFrame(mod);
+    wrapFrameSet(mod);
+    wrapKeyMap(mod);
+    wrapPiecewiseLinearApprox(mod);
+    wrapQuadApprox(mod);
+    wrapMappingPool(mod);
+    wrapSimplifyCache(mod);
+    wrapFunctional(mod);
+    wrapFitsChan(mod);
+    wrapXmlChan(mod);
+    wrapChebyMap(mod);
+    wrapCmpMap(mod);
+    wrapLutMap(mod);
+    wrapMathMap(mod);
+    wrapMatrixMap(mod);
+    wrapNormMap(mod);
+    wrapParallelMap(mod);
+    wrapSeriesMap(mod);
+    wrapPcdMap(mod);
+    wrapPermMap(mod);
+    wrapPolyMap(mod);
+    wrapPolyMapNewtonInverse(mod);
+    wrapPolyTranCache(mod);
+    wrapRateMap(mod);
+    wrapShiftMap(mod);
+    wrapSlaMap(mod);
+    wrapSphMap(mod);
+    wrapTimeMap(mod);
+    wrapTranMap(mod);
+    wrapUnitMap(mod);
+    wrapUnitNormMap(mod);
+    wrapWcsMap(mod);
+    wrapWinMap(mod);
+    wrapZoomMap(mod);
+    wrapCmpFrame(mod);
+    wrapSkyFrame(mod);
+    wrapSpecFrame(mod);
+    wrapTimeFrame(mod);
+
+    return mod.ptr();
+}
+
+}  // namespace
+}  // namespace ast
@@ -27,11 +27,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(base) {
-    py::module mod("base", "Python wrapper for base.h");
 
+void wrapBase(py::module &mod) {
     // Note: do not wrap arrayFromVector because it is unsafe (the array
     // will be corrupted if the vector is deleted) and unnecessary (use numpy)
     mod.def("assertOK", &assertOK, "rawObj1"_a = nullptr, "rawObj2"_a = nullptr);
@@ -49,9 +46,6 @@ PYBIND11_PLUGIN(base) {
             .value("UndefinedType", DataType::UndefinedType)
             .value("BadType", DataType::BadType)
             .export_values();
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -32,13 +32,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(channel) {
-    py::module mod("channel", "Python wrapper for Channel");
-
-    py::module::import("astshim.object");
 
+void wrapChannel(py::module &mod) {
     py::class_<Channel, std::shared_ptr<Channel>, Object> cls(mod, "Channel");
 
     cls.def(py::init<Stream &, std::string const &>(), "stream"_a, "options"_a = "");
@@ -54,9 +49,6 @@ PYBIND11_PLUGIN(channel) {
     cls.def("read", &Channel::read);
     cls.def("write", &Channel::write, "object"_a);
     cls.def("warnings", &Channel::warnings);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -24,7 +24,7 @@
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
-#include "numpy/arrayobject.h"
+#include "numpyImport.h"
 #include "ndarray/pybind11.h"
 
 #include "astshim/Mapping.h"
@@ -44,17 +44,9 @@ void declareChebyDomain(py::module const &mod) {
     cls.def_readonly("ubnd", &ChebyDomain::ubnd);
 }
 
-PYBIND11_PLUGIN(chebyMap) {
-    py::module mod("chebyMap", "Python wrapper for ChebyMap");
-
-    py::module::import("astshim.mapping");
-
-    // Need to import numpy for ndarray and eigen conversions
-    if (_import_array() < 0) {
-        PyErr_SetString(PyExc_ImportError, "numpy.core.multiarray failed to import");
-        return nullptr;
-    }
+}  // namespace
 
+void wrapChebyMap(py::module &mod) {
     declareChebyDomain(mod);
 
     py::class_<ChebyMap, std::shared_ptr<ChebyMap>, Mapping> cls(mod, "ChebyMap");
@@ -69,6 +61,8 @@ PYBIND11_PLUGIN(chebyMap) {
 
     cls.def("copy", &ChebyMap::copy);
     cls.def("getDomain", &ChebyMap::getDomain, "forward"_a);
+    cls.def("getCoeffForward", &ChebyMap::getCoeffForward);
+    cls.def("getCoeffInverse", &ChebyMap::getCoeffInverse);
     cls.def("polyTran",
             (ChebyMap(ChebyMap::*)(bool, double, double, int, std::vector<double> const &,
                                    std::vector<double> const &) const) &
@@ -76,9 +70,6 @@ PYBIND11_PLUGIN(chebyMap) {
             "forward"_a, "acc"_a, "maxacc"_a, "maxorder"_a, "lbnd"_a, "ubnd"_a);
     cls.def("polyTran", (ChebyMap(ChebyMap::*)(bool, double, double, int) const) & ChebyMap::polyTran,
             "forward"_a, "acc"_a, "maxacc"_a, "maxorder"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -31,13 +31,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(cmpFrame) {
-    py::module mod("cmpFrame", "Python wrapper for CmpFrame");
-
-    py::module::import("astshim.frame");
 
+void wrapCmpFrame(py::module &mod) {
     py::class_<CmpFrame, std::shared_ptr<CmpFrame>, Frame> cls(mod, "CmpFrame");
 
     cls.def(py::init<Frame const &, Frame const &, std::string const &>(), "frame1"_a, "frame2"_a,
@@ -47,9 +42,6 @@ PYBIND11_PLUGIN(cmpFrame) {
     cls.def("__len__", [](CmpFrame const &) { return 2; });
 
     cls.def("copy", &CmpFrame::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
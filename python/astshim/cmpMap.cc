@@ -29,13 +29,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(cmpMap) {
-    py::module mod("cmpMap", "Python wrapper for CmpMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapCmpMap(py::module &mod) {
     py::class_<CmpMap, std::shared_ptr<CmpMap>, Mapping> cls(mod, "CmpMap");
 
     cls.def(py::init<Mapping const &, Mapping const &, bool, std::string const &>(), "map1"_a, "map2"_a,
@@ -46,9 +41,6 @@ PYBIND11_PLUGIN(cmpMap) {
 
     cls.def("copy", &CmpMap::copy);
     cls.def_property_readonly("series", &CmpMap::getSeries);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
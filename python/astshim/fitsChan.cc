@@ -45,11 +45,9 @@ void wrapFoundValue(py::module &mod, std::string const &suffix) {
     cls.def_readwrite("value", &FoundValue<T>::value);
 }
 
-PYBIND11_PLUGIN(fitsChan) {
-    py::module mod("fitsChan", "Python wrapper for FitsChan");
-
-    py::module::import("astshim.channel");
+}  // namespace
 
+void wrapFitsChan(py::module &mod) {
     py::enum_<FitsKeyState>(mod, "FitsKeyState")
             .value("ABSENT", FitsKeyState::ABSENT)
             .value("NOVALUE", FitsKeyState::NOVALUE)
@@ -130,9 +128,6 @@ PYBIND11_PLUGIN(fitsChan) {
     cls.def("writeFits", &FitsChan::writeFits);
     cls.def("clearCard", &FitsChan::clearCard);
     cls.def("setCard", &FitsChan::setCard, "i"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -72,11 +72,9 @@ void wrapFrameMapping(py::module &mod) {
     cls.def_readwrite("mapping", &FrameMapping::mapping);
 }
 
-PYBIND11_PLUGIN(frame) {
-    py::module mod("frame", "Python wrapper for Frame");
-
-    py::module::import("astshim.mapping");
+}  // namespace
 
+void wrapFrame(py::module &mod) {
     wrapDirectionPoint(mod);
     wrapNReadValue(mod);
     wrapResolvedPoint(mod);
@@ -144,9 +142,6 @@ PYBIND11_PLUGIN(frame) {
     cls.def("setTop", &Frame::setTop, "axis"_a, "top"_a);
     cls.def("setUnit", &Frame::setUnit, "axis"_a, "unit"_a);
     cls.def("unformat", &Frame::unformat, "axis"_a, "str"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -28,13 +28,8 @@ using namespace pybind11::literals;
 #include "astshim/FrameSet.h"
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(frameSet) {
-    py::module mod("frameSet", "Python wrapper for FrameSet");
-
-    py::module::import("astshim.frame");
 
+void wrapFrameSet(py::module &mod) {
     py::class_<FrameSet, std::shared_ptr<FrameSet>, Frame> cls(mod, "FrameSet");
 
     cls.def(py::init<Frame const &, std::string const &>(), "frame"_a, "options"_a = "");
@@ -62,9 +57,6 @@ PYBIND11_PLUGIN(frameSet) {
     cls.def("remapFrame", &FrameSet::remapFrame, "iframe"_a, "map"_a);
     cls.def("removeFrame", &FrameSet::removeFrame, "iframe"_a);
     cls.def("renameVariant", &FrameSet::renameVariant, "name"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -27,17 +27,9 @@ using namespace pybind11::literals;
 #include "astshim/functional.h"
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(functional) {
-    py::module mod("functional");
-
-    py::module::import("astshim.frameSet");
 
+void wrapFunctional(py::module &mod) {
     mod.def("append", &append, "first"_a, "second"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
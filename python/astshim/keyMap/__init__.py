@@ -21,6 +21,5 @@
 #/
 
 from __future__ import absolute_import
-from .keyMap import *
 from .keyMapContinued import *
 
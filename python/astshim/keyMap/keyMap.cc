@@ -32,13 +32,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(keyMap) {
-    py::module mod("keyMap", "Python wrapper for KeyMap");
-
-    py::module::import("astshim.object");
 
+void wrapKeyMap(py::module &mod) {
     py::class_<KeyMap, std::shared_ptr<KeyMap>, Object> cls(mod, "KeyMap");
 
     cls.def(py::init<std::string const &>(), "options"_a = "");
@@ -146,9 +141,6 @@ PYBIND11_PLUGIN(keyMap) {
     cls.def("remove", &KeyMap::remove, "key"_a);
     cls.def("rename", &KeyMap::rename, "oldKey"_a, "newKey"_a);
     cls.def("type", &KeyMap::type, "key"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -1,6 +1,6 @@
 from __future__ import absolute_import, division, print_function
 
-from .keyMap import KeyMap
+from .._astshimLib import KeyMap
 
 __all__ = []  # import only for side effects
 
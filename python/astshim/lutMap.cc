@@ -32,13 +32,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(lutMap) {
-    py::module mod("lutMap", "Python wrapper for LutMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapLutMap(py::module &mod) {
     py::class_<LutMap, std::shared_ptr<LutMap>, Mapping> cls(mod, "LutMap");
 
     cls.def(py::init<std::vector<double> const &, double, double, std::string const &>(), "lut"_a, "start"_a,
@@ -48,9 +43,6 @@ PYBIND11_PLUGIN(lutMap) {
     cls.def_property_readonly("lutInterp", &LutMap::getLutInterp);
 
     cls.def("copy", &LutMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
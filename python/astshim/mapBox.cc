@@ -21,7 +21,7 @@
  */
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
-#include "numpy/arrayobject.h"
+#include "numpyImport.h"
 #include "ndarray/pybind11.h"
 
 #include "astshim/MapBox.h"
@@ -31,21 +31,14 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(mapBox) {
-    py::module mod("mapBox", "Python wrapper for MapBox");
-
-    // Need to import numpy for ndarray and eigen conversions
-    if (_import_array() < 0) {
-        PyErr_SetString(PyExc_ImportError, "numpy.core.multiarray failed to import");
-        return nullptr;
-    }
 
+void wrapMapBox(py::module &mod) {
     py::class_<MapBox> cls(mod, "MapBox");
 
-    cls.def(py::init<Mapping const &, std::vector<double> const &, std::vector<double> const &, int, int>(),
-            "map"_a, "lbnd"_a, "ubnd"_a, "minOutCoord"_a = 1, "maxOutCoord"_a = 0);
+    cls.def(py::init<Mapping const &, std::vector<double> const &, std::vector<double> const &, int, int, int,
+                     int>(),
+            "map"_a, "lbnd"_a, "ubnd"_a, "minOutCoord"_a = 1, "maxOutCoord"_a = 0, "nSamples"_a = 0,
+            "nRefine"_a = 1);
 
     cls.def_readonly("lbndIn", &MapBox::lbndIn);
     cls.def_readonly("ubndIn", &MapBox::ubndIn);
@@ -56,8 +49,15 @@ PYBIND11_PLUGIN(mapBox) {
     cls.def_readonly("xl", &MapBox::xl);
     cls.def_readonly("xu", &MapBox::xu);
 
-    return mod.ptr();
+    py::class_<MapBoxBatch> clsBatch(mod, "MapBoxBatch");
+
+    clsBatch.def(py::init<Mapping const &, ConstArray2D const &, ConstArray2D const &, int, int, int>(),
+                 "map"_a, "lbnd"_a, "ubnd"_a, "minOutCoord"_a = 1, "maxOutCoord"_a = 0, "nThreads"_a = 1);
+
+    clsBatch.def_readonly("minOutCoord", &MapBoxBatch::minOutCoord);
+    clsBatch.def_readonly("maxOutCoord", &MapBoxBatch::maxOutCoord);
+    clsBatch.def_readonly("lbndOut", &MapBoxBatch::lbndOut);
+    clsBatch.def_readonly("ubndOut", &MapBoxBatch::ubndOut);
 }
 
-}  // namespace
 }  // namespace ast
@@ -0,0 +1,51 @@
+/*
+ * LSST Data Management System
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ * See the COPYRIGHT file
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <vector>
+
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include "astshim/Mapping.h"
+#include "astshim/MapSplitCache.h"
+
+namespace py = pybind11;
+using namespace pybind11::literals;
+
+namespace ast {
+
+void wrapMapSplitCache(py::module &mod) {
+    py::class_<MapSplitCache> cls(mod, "MapSplitCache");
+
+    cls.def(py::init<std::size_t>(), "maxSize"_a = 10000000);
+
+    cls.def_property_readonly("maxSize", &MapSplitCache::getMaxSize);
+    cls.def_property_readonly("nEntries", &MapSplitCache::getNEntries);
+    cls.def_property_readonly("nHits", &MapSplitCache::getNHits);
+    cls.def_property_readonly("nMisses", &MapSplitCache::getNMisses);
+    cls.def_property_readonly("size", &MapSplitCache::getSize);
+
+    cls.def("split", &MapSplitCache::split, "map"_a, "in"_a);
+    cls.def("clear", &MapSplitCache::clear);
+    cls.def("resetStats", &MapSplitCache::resetStats);
+}
+
+}  // namespace ast
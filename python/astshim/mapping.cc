@@ -19,12 +19,18 @@
  * the GNU General Public License along with this program.  If not,
  * see <https://www.lsstcorp.org/LegalNotices/>.
  */
+#include <sstream>
+#include <stdexcept>
+#include <vector>
+
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h>
-#include "numpy/arrayobject.h"
+#include "numpyImport.h"
 #include "ndarray/pybind11.h"
 
 #include "astshim/base.h"
+#include "astshim/detail/utils.h"
 #include "astshim/Mapping.h"
 #include "astshim/Object.h"
 #include "astshim/ParallelMap.h"
@@ -36,20 +42,204 @@ using namespace pybind11::literals;
 namespace ast {
 namespace {
 
-PYBIND11_PLUGIN(mapping) {
-    py::module mod("mapping", "Python wrapper for Mapping");
+using PyMapping = py::class_<Mapping, std::shared_ptr<Mapping>, Object>;
+
+/*
+Call `func` and return its result, optionally releasing the GIL while it runs
+
+If `releaseGIL` is true then the GIL is released and `mapping` is locked for exclusive use
+by the calling thread (waiting until any other thread unlocks it) while `func` runs.
+Afterwards `mapping` is left locked if the calling thread already had it locked, else it is unlocked.
+This allows independent mappings to be used concurrently from Python threads, or one mapping
+to be shared between threads (once the thread that created it has called `unlock`).
+If `releaseGIL` is false then `func` is simply called.
+*/
+template <typename Func>
+auto callReleasingGil(Mapping &mapping, bool releaseGIL, Func const &func) -> decltype(func()) {
+    if (!releaseGIL) {
+        return func();
+    }
+    py::gil_scoped_release release;
+    // use the const raw pointer because locking does not modify the mapping (see Object::getStateId)
+    detail::ThreadLockGuard lock(static_cast<Mapping const &>(mapping).getRawPtr());
+    return func();
+}
+
+/*
+Return a numpy array as an Array2D that shares its data, for use as the output of a transform
+
+The shape of the array is checked by the transform.
+
+@throws std::invalid_argument if `out` is not a writeable, C-contiguous, 2-dimensional array of float64
+*/
+Array2D arrayFromOut(py::array const &out) {
+    auto *rawArr = reinterpret_cast<PyArrayObject *>(out.ptr());
+    if (PyArray_TYPE(rawArr) != NPY_DOUBLE) {
+        throw std::invalid_argument("out must be an array of float64");
+    }
+    if (PyArray_NDIM(rawArr) != 2) {
+        std::ostringstream os;
+        os << "out has " << PyArray_NDIM(rawArr) << " dimensions; it must have 2";
+        throw std::invalid_argument(os.str());
+    }
+    if (!PyArray_IS_C_CONTIGUOUS(rawArr)) {
+        throw std::invalid_argument("out must be C-contiguous");
+    }
+    if (!PyArray_ISWRITEABLE(rawArr)) {
+        throw std::invalid_argument("out must be writeable");
+    }
+    return out.cast<Array2D>();
+}
+
+/*
+Transform a 2-d array of points, putting the results into `to`
+
+`from` may be any array type accepted by Mapping::applyForward.
+*/
+template <typename FromArray>
+void tranInto(Mapping const &mapping, FromArray const &from, bool doForward, Array2D const &to,
+              bool badToNan) {
+    if (doForward) {
+        mapping.applyForward(from, to, badToNan);
+    } else {
+        mapping.applyInverse(from, to, badToNan);
+    }
+}
+
+/*
+Transform a 2-d array of points, optionally releasing the GIL (see callReleasingGil)
+
+@param[in] mapping  Mapping to use
+@param[in] from  Points to transform; any array type accepted by Mapping::applyForward
+@param[in] doForward  If true then perform a forward transform, else inverse
+@param[in] to  Array for the results, or an empty array to allocate a new one
+@param[in] releaseGIL  Release the GIL while transforming?
+@param[in] badToNan  Replace `AST__BAD` with `nan` in the results?
+@return the results (`to`, if it was not empty)
+*/
+template <typename FromArray>
+Array2D tranArray(Mapping &mapping, FromArray const &from, bool doForward, Array2D to, bool releaseGIL,
+                  bool badToNan) {
+    return callReleasingGil(mapping, releaseGIL, [&]() {
+        if (to.getData() == nullptr) {
+            to = ndarray::allocate(doForward ? mapping.getNOut() : mapping.getNIn(),
+                                   from.template getSize<1>());
+        }
+        tranInto(mapping, from, doForward, to, badToNan);
+        return to;
+    });
+}
 
-    py::module::import("astshim.object");
-    py::module::import("astshim.mapBox");
-    py::module::import("astshim.mapSplit");
+/*
+Transform a 2-d numpy array of points, as tranArray
 
-    // Need to import numpy for ndarray and eigen conversions
-    if (_import_array() < 0) {
-        PyErr_SetString(PyExc_ImportError, "numpy.core.multiarray failed to import");
-        return nullptr;
+Arrays of float32 or float64 are read in place, whatever their strides;
+other arrays are first converted to float64.
+*/
+Array2D tranNumpyArray(Mapping &mapping, py::array const &from, bool doForward, Array2D const &to,
+                       bool releaseGIL, bool badToNan) {
+    if (PyArray_TYPE(reinterpret_cast<PyArrayObject *>(from.ptr())) == NPY_FLOAT) {
+        return tranArray(mapping, from.cast<ndarray::Array<float const, 2, 0>>(), doForward, to, releaseGIL,
+                         badToNan);
     }
+    return tranArray(mapping, from.cast<ndarray::Array<double const, 2, 0>>(), doForward, to, releaseGIL,
+                     badToNan);
+}
 
-    py::class_<Mapping, std::shared_ptr<Mapping>, Object> cls(mod, "Mapping");
+/*
+Transform a vector of points with axes adjacent, optionally releasing the GIL (see callReleasingGil)
+*/
+std::vector<double> tranVector(Mapping &mapping, std::vector<double> const &from, bool doForward,
+                               bool releaseGIL) {
+    return callReleasingGil(mapping, releaseGIL, [&mapping, &from, doForward]() {
+        return doForward ? mapping.applyForward(from) : mapping.applyInverse(from);
+    });
+}
+
+/*
+Wrap the overloads of applyForward or applyInverse
+
+The overloads that transform 2-d arrays accept `badToNan`; if false then `AST__BAD` is left in the results.
+
+@param[in] cls  Python wrapper for Mapping
+@param[in] name  Name of method: "applyForward" or "applyInverse"
+@param[in] doForward  True for applyForward, false for applyInverse
+*/
+void declareApply(PyMapping &cls, char const *name, bool doForward) {
+    cls.def(name,
+            [doForward](Mapping &self, py::array const &from, bool releaseGIL, bool badToNan) -> py::object {
+                if (from.ndim() == 1) {
+                    // a vector of points with axes adjacent, as for a list
+                    if (!badToNan) {
+                        throw std::invalid_argument("badToNan=False is only supported for 2-d arrays");
+                    }
+                    auto fromVec = from.cast<std::vector<double>>();
+                    return py::cast(tranVector(self, fromVec, doForward, releaseGIL));
+                }
+                return py::cast(tranNumpyArray(self, from, doForward, Array2D(), releaseGIL, badToNan));
+            },
+            "from"_a, "releaseGIL"_a = false, "badToNan"_a = true);
+    // lists of lists and other sequences that are not numpy arrays
+    cls.def(name,
+            [doForward](Mapping &self, ConstArray2D const &from, bool releaseGIL, bool badToNan) {
+                return tranArray(self, from, doForward, Array2D(), releaseGIL, badToNan);
+            },
+            "from"_a, "releaseGIL"_a = false, "badToNan"_a = true);
+    cls.def(name,
+            [doForward](Mapping &self, std::vector<double> const &from, bool releaseGIL) {
+                return tranVector(self, from, doForward, releaseGIL);
+            },
+            "from"_a, "releaseGIL"_a = false);
+    // the overloads that take `out` put the results into that array and return it
+    cls.def(name,
+            [doForward](Mapping &self, py::array const &from, py::array const &out, bool releaseGIL,
+                        bool badToNan) {
+                tranNumpyArray(self, from, doForward, arrayFromOut(out), releaseGIL, badToNan);
+                return out;
+            },
+            "from"_a, "out"_a, "releaseGIL"_a = false, "badToNan"_a = true);
+    cls.def(name,
+            [doForward](Mapping &self, ConstArray2D const &from, py::array const &out, bool releaseGIL,
+                        bool badToNan) {
+                tranArray(self, from, doForward, arrayFromOut(out), releaseGIL, badToNan);
+                return out;
+            },
+            "from"_a, "out"_a, "releaseGIL"_a = false, "badToNan"_a = true);
+    // the threaded overloads always release the GIL; each worker thread uses its own copy of the mapping.
+    // nThreads is keyword-only, so that it cannot be confused with releaseGIL or badToNan
+    cls.def(name,
+            [doForward](Mapping &self, ConstArray2D const &from, int nThreads, int chunkSize, bool badToNan) {
+                py::gil_scoped_release release;
+                Array2D to = ndarray::allocate(doForward ? self.getNOut() : self.getNIn(), from.getSize<1>());
+                if (doForward) {
+                    self.applyForwardThreaded(from, to, nThreads, chunkSize, badToNan);
+                } else {
+                    self.applyInverseThreaded(from, to, nThreads, chunkSize, badToNan);
+                }
+                return to;
+            },
+            "from"_a, py::kw_only(), "nThreads"_a, "chunkSize"_a = 0, "badToNan"_a = true);
+    cls.def(name,
+            [doForward](Mapping &self, ConstArray2D const &from, py::array const &out, int nThreads,
+                        int chunkSize, bool badToNan) {
+                Array2D to = arrayFromOut(out);
+                {
+                    py::gil_scoped_release release;
+                    if (doForward) {
+                        self.applyForwardThreaded(from, to, nThreads, chunkSize, badToNan);
+                    } else {
+                        self.applyInverseThreaded(from, to, nThreads, chunkSize, badToNan);
+                    }
+                }
+                return out;
+            },
+            "from"_a, "out"_a, py::kw_only(), "nThreads"_a, "chunkSize"_a = 0, "badToNan"_a = true);
+}
+
+}  // namespace
+
+void wrapMapping(py::module &mod) {
+    PyMapping cls(mod, "Mapping");
 
     cls.def_property_readonly("nIn", &Mapping::getNIn);
     cls.def_property_readonly("nOut", &Mapping::getNOut);
@@ -59,37 +249,37 @@ PYBIND11_PLUGIN(mapping) {
     cls.def_property_readonly("isInverted", &Mapping::isInverted);
     cls.def_property_readonly("isLinear", &Mapping::getIsLinear);
     cls.def_property("report", &Mapping::getReport, &Mapping::setReport);
+    cls.def_property("simplifyThreshold", &Mapping::getSimplifyThreshold, &Mapping::setSimplifyThreshold);
 
     cls.def("copy", &Mapping::copy);
     cls.def("getInverse", &Mapping::getInverse);
     cls.def("linearApprox", &Mapping::linearApprox, "lbnd"_a, "ubnd"_a, "tol"_a);
+    cls.def("jacobian", &Mapping::jacobian, "at"_a);
     cls.def("then", &Mapping::then, "next"_a);
     cls.def("under", &Mapping::under, "next"_a);
     cls.def("rate", &Mapping::rate, "at"_a, "ax1"_a, "ax2"_a);
     cls.def("simplify", &Mapping::simplify);
+    cls.def_static("getGridSize", &Mapping::getGridSize, "lbnd"_a, "ubnd"_a);
     // wrap the overloads of applyForward, applyInverse, tranGridForward and tranGridInverse that return a new
-    // result
-    cls.def("applyForward", (Array2D(Mapping::*)(ConstArray2D const &) const) & Mapping::applyForward,
-            "from"_a);
-    cls.def("applyForward",
-            (std::vector<double>(Mapping::*)(std::vector<double> const &) const) & Mapping::applyForward,
-            "from"_a);
-    cls.def("applyInverse", (Array2D(Mapping::*)(ConstArray2D const &) const) & Mapping::applyInverse,
-            "from"_a);
-    cls.def("applyInverse",
-            (std::vector<double>(Mapping::*)(std::vector<double> const &) const) & Mapping::applyInverse,
-            "from"_a);
+    // result; in Python the pre-allocated result, if any, is specified as `out`
+    declareApply(cls, "applyForward", true);
+    declareApply(cls, "applyInverse", false);
     cls.def("tranGridForward",
-            (Array2D(Mapping::*)(PointI const &, PointI const &, double, int, int) const) &
-                    Mapping::tranGridForward,
-            "lbnd"_a, "ubnd"_a, "tol"_a, "maxpix"_a, "nPoints"_a);
+            [](Mapping &self, PointI const &lbnd, PointI const &ubnd, double tol, int maxpix, int nPoints,
+               bool releaseGIL) {
+                return callReleasingGil(self, releaseGIL, [&]() {
+                    return self.tranGridForward(lbnd, ubnd, tol, maxpix, nPoints);
+                });
+            },
+            "lbnd"_a, "ubnd"_a, "tol"_a, "maxpix"_a, "nPoints"_a = 0, "releaseGIL"_a = false);
     cls.def("tranGridInverse",
-            (Array2D(Mapping::*)(PointI const &, PointI const &, double, int, int) const) &
-                    Mapping::tranGridInverse,
-            "lbnd"_a, "ubnd"_a, "tol"_a, "maxpix"_a, "nPoints"_a);
-
-    return mod.ptr();
+            [](Mapping &self, PointI const &lbnd, PointI const &ubnd, double tol, int maxpix, int nPoints,
+               bool releaseGIL) {
+                return callReleasingGil(self, releaseGIL, [&]() {
+                    return self.tranGridInverse(lbnd, ubnd, tol, maxpix, nPoints);
+                });
+            },
+            "lbnd"_a, "ubnd"_a, "tol"_a, "maxpix"_a, "nPoints"_a = 0, "releaseGIL"_a = false);
 }
 
-}  // namespace
 }  // namespace ast
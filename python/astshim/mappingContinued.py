@@ -0,0 +1,95 @@
+#
+# LSST Data Management System
+#
+# This product includes software developed by the
+# LSST Project (http://www.lsst.org/).
+# See the COPYRIGHT file
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the LSST License Statement and
+# the GNU General Public License along with this program.  If not,
+# see <https://www.lsstcorp.org/LegalNotices/>.
+#
+
+"""Python-only additions to Mapping
+"""
+from __future__ import absolute_import, division, print_function
+
+from ._astshimLib import Mapping
+
+__all__ = []  # import only for side effects
+
+
+def _tranGridBlocks(mapping, doForward, lbnd, ubnd, tol, maxpix, nRows, releaseGIL):
+    """Implement tranGridForwardBlocks and tranGridInverseBlocks
+    """
+    if len(lbnd) != len(ubnd):
+        raise ValueError("lbnd = {} and ubnd = {} have different lengths".format(lbnd, ubnd))
+    if nRows < 1:
+        raise ValueError("nRows = {} must be positive".format(nRows))
+    tranGrid = mapping.tranGridForward if doForward else mapping.tranGridInverse
+    lastAxis = len(lbnd) - 1
+    for startRow in range(lbnd[lastAxis], ubnd[lastAxis] + 1, nRows):
+        blockLbnd = list(lbnd)
+        blockUbnd = list(ubnd)
+        blockLbnd[lastAxis] = startRow
+        blockUbnd[lastAxis] = min(startRow + nRows - 1, ubnd[lastAxis])
+        yield blockLbnd, blockUbnd, tranGrid(blockLbnd, blockUbnd, tol, maxpix, releaseGIL=releaseGIL)
+
+
+def tranGridForwardBlocks(self, lbnd, ubnd, tol, maxpix, nRows, releaseGIL=False):
+    """Transform a grid of points in the forward direction, one block of rows at a time
+
+    This is a generator, so only one block of results need be in memory at a time,
+    e.g. to stream a very large grid to disk or to a resampler.
+    A row is a line of points along the first input axis, and blocks are successive ranges
+    along the last input axis, so each block is a contiguous section of the full grid.
+    Each block is transformed by a separate call to ``tranGridForward``,
+    so the piece-wise linear approximations may differ slightly from those for the whole grid.
+
+    Parameters
+    ----------
+    lbnd : `list` of `int`
+        The coordinates of the centre of the first pixel in the input grid, one per input axis.
+    ubnd : `list` of `int`
+        The coordinates of the centre of the last pixel in the input grid, one per input axis.
+    tol : `float`
+        The maximum tolerable geometrical distortion; see ``tranGridForward``.
+    maxpix : `int`
+        Initial scale size for the adaptive algorithm; see ``tranGridForward``.
+    nRows : `int`
+        Maximum number of values along the last input axis per block.
+    releaseGIL : `bool`
+        Release the GIL while transforming each block? See ``tranGridForward``.
+
+    Yields
+    ------
+    blockLbnd : `list` of `int`
+        Lower bounds of the block.
+    blockUbnd : `list` of `int`
+        Upper bounds of the block.
+    points : `numpy.ndarray`
+        Transformed points, with shape (nOut, nPts), where nPts is the number of points in the block.
+    """
+    return _tranGridBlocks(self, True, lbnd, ubnd, tol, maxpix, nRows, releaseGIL)
+
+
+def tranGridInverseBlocks(self, lbnd, ubnd, tol, maxpix, nRows, releaseGIL=False):
+    """Transform a grid of points in the inverse direction, one block of rows at a time
+
+    See tranGridForwardBlocks for details, swapping nIn and nOut.
+    """
+    return _tranGridBlocks(self, False, lbnd, ubnd, tol, maxpix, nRows, releaseGIL)
+
+
+Mapping.tranGridForwardBlocks = tranGridForwardBlocks
+Mapping.tranGridInverseBlocks = tranGridInverseBlocks
@@ -0,0 +1,62 @@
+/*
+ * LSST Data Management System
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ * See the COPYRIGHT file
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <vector>
+
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+#include "numpyImport.h"
+#include "ndarray/pybind11.h"
+
+#include "astshim/base.h"
+#include "astshim/Mapping.h"
+#include "astshim/MappingPool.h"
+
+namespace py = pybind11;
+using namespace pybind11::literals;
+
+namespace ast {
+
+void wrapMappingPool(py::module &mod) {
+    py::class_<MappingPool> cls(mod, "MappingPool");
+
+    cls.def(py::init<Mapping const &, int>(), "mapping"_a, "nThreads"_a = 0);
+
+    cls.def_property_readonly("nIn", &MappingPool::getNIn);
+    cls.def_property_readonly("nOut", &MappingPool::getNOut);
+    cls.def_property_readonly("nThreads", &MappingPool::getNThreads);
+
+    // release the GIL while the workers run, so that other Python threads may continue
+    cls.def("applyForward",
+            [](MappingPool &self, std::vector<ConstArray2D> const &batches) {
+                py::gil_scoped_release release;
+                return self.applyForward(batches);
+            },
+            "batches"_a);
+    cls.def("applyInverse",
+            [](MappingPool &self, std::vector<ConstArray2D> const &batches) {
+                py::gil_scoped_release release;
+                return self.applyInverse(batches);
+            },
+            "batches"_a);
+}
+
+}  // namespace ast
@@ -33,13 +33,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(mathMap) {
-    py::module mod("mathMap", "Python wrapper for MathMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapMathMap(py::module &mod) {
     py::class_<MathMap, std::shared_ptr<MathMap>, Mapping> cls(mod, "MathMap");
 
     cls.def(py::init<int, int, std::vector<std::string> const &, std::vector<std::string> const &,
@@ -51,9 +46,6 @@ PYBIND11_PLUGIN(mathMap) {
     cls.def_property_readonly("simpIF", &MathMap::getSimpIF);
 
     cls.def("copy", &MathMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
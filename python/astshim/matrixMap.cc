@@ -21,7 +21,7 @@
  */
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
-#include "numpy/arrayobject.h"
+#include "numpyImport.h"
 #include "ndarray/pybind11.h"
 
 #include "astshim/Mapping.h"
@@ -31,19 +31,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(matrixMap) {
-    py::module mod("matrixMap", "Python wrapper for MatrixMap");
-
-    py::module::import("astshim.mapping");
-
-    // Need to import numpy for ndarray and eigen conversions
-    if (_import_array() < 0) {
-        PyErr_SetString(PyExc_ImportError, "numpy.core.multiarray failed to import");
-        return nullptr;
-    }
 
+void wrapMatrixMap(py::module &mod) {
     py::class_<MatrixMap, std::shared_ptr<MatrixMap>, Mapping> cls(mod, "MatrixMap");
 
     cls.def(py::init<ndarray::Array<double, 2, 2> const &, std::string const &>(), "matrix"_a,
@@ -51,9 +40,6 @@ PYBIND11_PLUGIN(matrixMap) {
     cls.def(py::init<std::vector<double> const &, std::string const &>(), "diag"_a, "options"_a = "");
 
     cls.def("copy", &MatrixMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -31,21 +31,13 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(normMap) {
-    py::module mod("normMap", "Python wrapper for NormMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapNormMap(py::module &mod) {
     py::class_<NormMap, std::shared_ptr<NormMap>, Mapping> cls(mod, "NormMap");
 
     cls.def(py::init<Frame const &, std::string const &>(), "frame"_a, "options"_a = "");
 
     cls.def("copy", &NormMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -0,0 +1,38 @@
+/*
+ * LSST Data Management System
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ * See the COPYRIGHT file
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#ifndef ASTSHIM_PYTHON_NUMPYIMPORT_H
+#define ASTSHIM_PYTHON_NUMPYIMPORT_H
+
+/*
+Include the numpy C API in a source file of the _astshimLib Python module
+
+Include this instead of "numpy/arrayobject.h". All source files of the module share one
+pointer to the numpy C API, which is set by _import_array in _astshimLib.cc;
+that file defines ASTSHIM_IMPORT_NUMPY before including this header.
+*/
+#define PY_ARRAY_UNIQUE_SYMBOL ASTSHIM_NUMPY_ARRAY_API
+#ifndef ASTSHIM_IMPORT_NUMPY
+#define NO_IMPORT_ARRAY
+#endif
+#include "numpy/arrayobject.h"
+
+#endif
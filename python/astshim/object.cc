@@ -28,34 +28,34 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(object) {
-    py::module mod("object", "Python wrapper for Object");
-
-    py::module::import("astshim.base");
 
+void wrapObject(py::module &mod) {
     py::class_<Object, std::shared_ptr<Object>> cls(mod, "Object");
 
     cls.def_static("fromString", &Object::fromString);
+    cls.def("toString", &Object::toString);
     // do not wrap fromAstObject because it uses a bare AST pointer
 
     cls.def("__str__", &Object::getClassName);
     cls.def("__repr__", [](Object const &self) { return "astshim." + self.getClassName(); });
     cls.def("__eq__", &Object::operator==, py::is_operator());
     cls.def("__ne__", &Object::operator!=, py::is_operator());
+    cls.def("__hash__", &Object::hash);
 
     cls.def_property_readonly("className", &Object::getClassName);
     cls.def_property("id", &Object::getID, &Object::setID);
     cls.def_property("ident", &Object::getIdent, &Object::setIdent);
     cls.def_property_readonly("objSize", &Object::getObjSize);
+    cls.def_property_readonly("stateId", &Object::getStateId);
     cls.def_property("useDefs", &Object::getUseDefs, &Object::setUseDefs);
 
     cls.def("copy", &Object::copy);
     cls.def("clear", &Object::clear, "attrib"_a);
     cls.def("hasAttribute", &Object::hasAttribute, "attrib"_a);
+    cls.def_static("getModificationCount", &Object::getModificationCount);
     cls.def("getNObject", &Object::getNObject);
     cls.def("getRefCount", &Object::getRefCount);
+    cls.def("isUnchangedSince", &Object::isUnchangedSince, "stateId"_a, "modificationCount"_a);
     cls.def("lock", &Object::lock, "wait"_a);
     cls.def("same", &Object::same, "other"_a);
     // do not wrap the ostream version of show, since there is no obvious Python equivalent to ostream
@@ -63,9 +63,6 @@ PYBIND11_PLUGIN(object) {
     cls.def("test", &Object::test, "attrib"_a);
     cls.def("unlock", &Object::unlock, "report"_a = false);
     // do not wrap getRawPtr, since it returns a bare AST pointer
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -31,22 +31,14 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(parallelMap) {
-    py::module mod("parallelMap", "Python wrapper for ParallelMap");
-
-    py::module::import("astshim.cmpMap");
 
+void wrapParallelMap(py::module &mod) {
     py::class_<ParallelMap, std::shared_ptr<ParallelMap>, CmpMap> cls(mod, "ParallelMap");
 
     cls.def(py::init<Mapping const &, Mapping const &, std::string const &>(), "map1"_a, "map2"_a,
             "options"_a = "");
 
     cls.def("copy", &ParallelMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
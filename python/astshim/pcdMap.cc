@@ -32,13 +32,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(pcdMap) {
-    py::module mod("pcdMap", "Python wrapper for PcdMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapPcdMap(py::module &mod) {
     py::class_<PcdMap, std::shared_ptr<PcdMap>, Mapping> cls(mod, "PcdMap");
 
     cls.def(py::init<double, std::vector<double> const &, std::string const &>(), "disco"_a, "pcdcen"_a,
@@ -48,9 +43,6 @@ PYBIND11_PLUGIN(pcdMap) {
     cls.def_property_readonly("pcdCen", (std::vector<double>(PcdMap::*)() const) & PcdMap::getPcdCen);
 
     cls.def("copy", &PcdMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
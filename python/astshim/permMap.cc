@@ -32,13 +32,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(permMap) {
-    py::module mod("permMap", "Python wrapper for PermMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapPermMap(py::module &mod) {
     py::class_<PermMap, std::shared_ptr<PermMap>, Mapping> cls(mod, "PermMap");
 
     cls.def(py::init<std::vector<int> const &, std::vector<int> const &, std::vector<double> const &,
@@ -46,9 +41,6 @@ PYBIND11_PLUGIN(permMap) {
             "inperm"_a, "outperm"_a, "constant"_a = std::vector<double>(), "options"_a = "");
 
     cls.def("copy", &PermMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -0,0 +1,48 @@
+#
+# LSST Data Management System
+#
+# This product includes software developed by the
+# LSST Project (http://www.lsst.org/).
+# See the COPYRIGHT file
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the LSST License Statement and
+# the GNU General Public License along with this program.  If not,
+# see <https://www.lsstcorp.org/LegalNotices/>.
+#
+
+"""Support for pickling astshim objects
+
+Objects are pickled as the compact string representation from Object.toString.
+The functions are written in Python because pickle cannot find functions
+wrapped by pybind11 by name.
+"""
+from __future__ import absolute_import
+
+from ._astshimLib import Object
+
+__all__ = []
+
+
+def _unpickleObject(data):
+    """Make an astshim object from the string returned by Object.toString
+    """
+    return Object.fromString(data)
+
+
+def _reduceObject(self):
+    """Implement Object.__reduce__ for pickle
+    """
+    return (_unpickleObject, (self.toString(),))
+
+
+Object.__reduce__ = _reduceObject
@@ -0,0 +1,58 @@
+/*
+ * LSST Data Management System
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ * See the COPYRIGHT file
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+#include "numpyImport.h"
+#include "ndarray/pybind11.h"
+
+#include "astshim/base.h"
+#include "astshim/Mapping.h"
+#include "astshim/PiecewiseLinearApprox.h"
+
+namespace py = pybind11;
+using namespace pybind11::literals;
+
+namespace ast {
+
+void wrapPiecewiseLinearApprox(py::module &mod) {
+    py::class_<PiecewiseLinearApprox> cls(mod, "PiecewiseLinearApprox");
+
+    py::class_<PiecewiseLinearApprox::Tile> clsTile(cls, "Tile");
+    clsTile.def_readonly("lbnd", &PiecewiseLinearApprox::Tile::lbnd);
+    clsTile.def_readonly("ubnd", &PiecewiseLinearApprox::Tile::ubnd);
+    clsTile.def_readonly("children", &PiecewiseLinearApprox::Tile::children);
+    clsTile.def_readonly("isLinear", &PiecewiseLinearApprox::Tile::isLinear);
+    clsTile.def_readonly("fit", &PiecewiseLinearApprox::Tile::fit);
+
+    cls.def(py::init<Mapping const &, PointD const &, PointD const &, double, double>(), "map"_a, "lbnd"_a,
+            "ubnd"_a, "tol"_a, "minSize"_a = 1.0);
+
+    cls.def_readonly("nIn", &PiecewiseLinearApprox::nIn);
+    cls.def_readonly("nOut", &PiecewiseLinearApprox::nOut);
+    cls.def_readonly("tol", &PiecewiseLinearApprox::tol);
+    cls.def_readonly("tiles", &PiecewiseLinearApprox::tiles);
+
+    cls.def("applyForward", &PiecewiseLinearApprox::applyForward, "from"_a);
+    cls.def("findTile", &PiecewiseLinearApprox::findTile, "point"_a);
+}
+
+}  // namespace ast
@@ -24,7 +24,7 @@
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
-#include "numpy/arrayobject.h"
+#include "numpyImport.h"
 #include "ndarray/pybind11.h"
 
 #include "astshim/Mapping.h"
@@ -34,19 +34,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(polyMap) {
-    py::module mod("polyMap", "Python wrapper for PolyMap");
-
-    py::module::import("astshim.mapping");
-
-    // Need to import numpy for ndarray and eigen conversions
-    if (_import_array() < 0) {
-        PyErr_SetString(PyExc_ImportError, "numpy.core.multiarray failed to import");
-        return nullptr;
-    }
 
+void wrapPolyMap(py::module &mod) {
     py::class_<PolyMap, std::shared_ptr<PolyMap>, Mapping> cls(mod, "PolyMap");
 
     cls.def(py::init<ndarray::Array<double, 2, 2> const &, ndarray::Array<double, 2, 2> const &,
@@ -58,13 +47,13 @@ PYBIND11_PLUGIN(polyMap) {
     cls.def_property_readonly("iterInverse", &PolyMap::getIterInverse);
     cls.def_property_readonly("nIterInverse", &PolyMap::getNIterInverse);
     cls.def_property_readonly("tolInverse", &PolyMap::getTolInverse);
+    cls.def_property("nativeEval", &PolyMap::getNativeEval, &PolyMap::setNativeEval);
 
     cls.def("copy", &PolyMap::copy);
+    cls.def("getCoeffForward", &PolyMap::getCoeffForward);
+    cls.def("getCoeffInverse", &PolyMap::getCoeffInverse);
     cls.def("polyTran", &PolyMap::polyTran, "forward"_a, "acc"_a, "maxacc"_a, "maxorder"_a, "lbnd"_a,
             "ubnd"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
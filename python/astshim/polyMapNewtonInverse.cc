@@ -0,0 +1,59 @@
+/*
+ * LSST Data Management System
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ * See the COPYRIGHT file
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <vector>
+
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+#include "numpyImport.h"
+#include "ndarray/pybind11.h"
+
+#include "astshim/base.h"
+#include "astshim/PolyMap.h"
+#include "astshim/PolyMapNewtonInverse.h"
+
+namespace py = pybind11;
+using namespace pybind11::literals;
+
+namespace ast {
+
+void wrapPolyMapNewtonInverse(py::module &mod) {
+    py::class_<PolyMapNewtonInverse> cls(mod, "PolyMapNewtonInverse");
+
+    cls.def(py::init<PolyMap const &, std::vector<double> const &, std::vector<double> const &, int, double,
+                     int>(),
+            "polyMap"_a, "lbnd"_a = std::vector<double>(), "ubnd"_a = std::vector<double>(), "maxOrder"_a = 5,
+            "tol"_a = 0.0, "maxIter"_a = 20);
+
+    cls.def_property_readonly("nAxes", &PolyMapNewtonInverse::getNAxes);
+    cls.def_property_readonly("tol", &PolyMapNewtonInverse::getTol);
+    cls.def_property_readonly("maxIter", &PolyMapNewtonInverse::getMaxIter);
+    cls.def_property_readonly("hasCoarseInverse", &PolyMapNewtonInverse::hasCoarseInverse);
+    cls.def_property_readonly("nPoints", &PolyMapNewtonInverse::getNPoints);
+    cls.def_property_readonly("nConverged", &PolyMapNewtonInverse::getNConverged);
+    cls.def_property_readonly("nIterations", &PolyMapNewtonInverse::getNIterations);
+    cls.def_property_readonly("maxIterationsUsed", &PolyMapNewtonInverse::getMaxIterationsUsed);
+
+    cls.def("applyInverse", &PolyMapNewtonInverse::applyInverse, "to"_a);
+    cls.def("resetStats", &PolyMapNewtonInverse::resetStats);
+}
+
+}  // namespace ast
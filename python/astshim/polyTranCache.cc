@@ -0,0 +1,73 @@
+/*
+ * LSST Data Management System
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ * See the COPYRIGHT file
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <memory>
+#include <string>
+#include <vector>
+
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include "astshim/ChebyMap.h"
+#include "astshim/PolyMap.h"
+#include "astshim/PolyTranCache.h"
+
+namespace py = pybind11;
+using namespace pybind11::literals;
+
+namespace ast {
+
+void wrapPolyTranCache(py::module &mod) {
+    py::class_<PolyTranCache> cls(mod, "PolyTranCache");
+
+    cls.def(py::init<std::size_t, std::string const &, std::size_t>(), "maxEntries"_a = 100,
+            "directory"_a = "", "maxSize"_a = 10000000);
+
+    cls.def_property_readonly("directory", &PolyTranCache::getDirectory);
+    cls.def_property_readonly("maxEntries", &PolyTranCache::getMaxEntries);
+    cls.def_property_readonly("maxSize", &PolyTranCache::getMaxSize);
+    cls.def_property_readonly("nEntries", &PolyTranCache::getNEntries);
+    cls.def_property_readonly("size", &PolyTranCache::getSize);
+    cls.def_property_readonly("nHits", &PolyTranCache::getNHits);
+    cls.def_property_readonly("nFileHits", &PolyTranCache::getNFileHits);
+    cls.def_property_readonly("nMisses", &PolyTranCache::getNMisses);
+
+    cls.def("polyTran",
+            (std::shared_ptr<PolyMap>(PolyTranCache::*)(PolyMap const &, bool, double, double, int,
+                                                        std::vector<double> const &,
+                                                        std::vector<double> const &)) &
+                    PolyTranCache::polyTran,
+            "mapping"_a, "forward"_a, "acc"_a, "maxacc"_a, "maxorder"_a, "lbnd"_a, "ubnd"_a);
+    cls.def("polyTran",
+            (std::shared_ptr<ChebyMap>(PolyTranCache::*)(ChebyMap const &, bool, double, double, int,
+                                                         std::vector<double> const &,
+                                                         std::vector<double> const &)) &
+                    PolyTranCache::polyTran,
+            "mapping"_a, "forward"_a, "acc"_a, "maxacc"_a, "maxorder"_a, "lbnd"_a, "ubnd"_a);
+    cls.def("polyTran",
+            (std::shared_ptr<ChebyMap>(PolyTranCache::*)(ChebyMap const &, bool, double, double, int)) &
+                    PolyTranCache::polyTran,
+            "mapping"_a, "forward"_a, "acc"_a, "maxacc"_a, "maxorder"_a);
+    cls.def("clear", &PolyTranCache::clear);
+    cls.def("resetStats", &PolyTranCache::resetStats);
+}
+
+}  // namespace ast
@@ -21,6 +21,8 @@
  */
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include "numpyImport.h"
+#include "ndarray/pybind11.h"
 
 #include "astshim/Mapping.h"
 #include "astshim/QuadApprox.h"
@@ -29,13 +31,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(quadApprox) {
-    py::module mod("quadApprox", "Python wrapper for QuadApprox");
-
-    py::module::import("astshim.mapping");
 
+void wrapQuadApprox(py::module &mod) {
     py::class_<QuadApprox> cls(mod, "QuadApprox");
 
     cls.def(py::init<Mapping const &, std::vector<double> const &, std::vector<double> const &, int, int>(),
@@ -43,9 +40,25 @@ PYBIND11_PLUGIN(quadApprox) {
 
     cls.def_readonly("fit", &QuadApprox::fit);
     cls.def_readonly("rms", &QuadApprox::rms);
+    cls.def_property_readonly("nOut", &QuadApprox::getNOut);
+
+    cls.def("applyForward", &QuadApprox::applyForward, "from"_a);
+
+    py::class_<TiledQuadApprox> clsTiled(mod, "TiledQuadApprox");
+
+    clsTiled.def(py::init<Mapping const &, std::vector<double> const &, std::vector<double> const &, int, int,
+                          int, int>(),
+                 "map"_a, "lbnd"_a, "ubnd"_a, "nxTiles"_a, "nyTiles"_a, "nx"_a = 3, "ny"_a = 3);
+
+    clsTiled.def_readonly("lbnd", &TiledQuadApprox::lbnd);
+    clsTiled.def_readonly("ubnd", &TiledQuadApprox::ubnd);
+    clsTiled.def_readonly("nxTiles", &TiledQuadApprox::nxTiles);
+    clsTiled.def_readonly("nyTiles", &TiledQuadApprox::nyTiles);
+    clsTiled.def_readonly("tiles", &TiledQuadApprox::tiles);
+    clsTiled.def_readonly("maxRms", &TiledQuadApprox::maxRms);
 
-    return mod.ptr();
+    clsTiled.def("applyForward", &TiledQuadApprox::applyForward, "from"_a);
+    clsTiled.def("getTile", &TiledQuadApprox::getTile, "ix"_a, "iy"_a, py::return_value_policy::copy);
 }
 
-}  // namespace
 }  // namespace ast
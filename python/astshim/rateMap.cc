@@ -30,22 +30,14 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(rateMap) {
-    py::module mod("rateMap", "Python wrapper for RateMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapRateMap(py::module &mod) {
     py::class_<RateMap, std::shared_ptr<RateMap>, Mapping> cls(mod, "RateMap");
 
     cls.def(py::init<Mapping const &, int, int, std::string const &>(), "map"_a, "ax1"_a, "ax2"_a,
             "options"_a = "");
 
     cls.def("copy", &RateMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
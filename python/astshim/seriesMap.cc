@@ -31,22 +31,14 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(seriesMap) {
-    py::module mod("seriesMap", "Python wrapper for SeriesMap");
-
-    py::module::import("astshim.cmpMap");
 
+void wrapSeriesMap(py::module &mod) {
     py::class_<SeriesMap, std::shared_ptr<SeriesMap>, CmpMap> cls(mod, "SeriesMap");
 
     cls.def(py::init<Mapping const &, Mapping const &, std::string const &>(), "map1"_a, "map2"_a,
             "options"_a = "");
 
     cls.def("copy", &SeriesMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -32,21 +32,13 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(shiftMap) {
-    py::module mod("shiftMap", "Python wrapper for ShiftMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapShiftMap(py::module &mod) {
     py::class_<ShiftMap, std::shared_ptr<ShiftMap>, Mapping> cls(mod, "ShiftMap");
 
     cls.def(py::init<std::vector<double> const &, std::string const &>(), "shift"_a, "options"_a = "");
 
     cls.def("copy", &ShiftMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
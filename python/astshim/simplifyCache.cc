@@ -0,0 +1,48 @@
+/*
+ * LSST Data Management System
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ * See the COPYRIGHT file
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <pybind11/pybind11.h>
+
+#include "astshim/Mapping.h"
+#include "astshim/SimplifyCache.h"
+
+namespace py = pybind11;
+using namespace pybind11::literals;
+
+namespace ast {
+
+void wrapSimplifyCache(py::module &mod) {
+    py::class_<SimplifyCache> cls(mod, "SimplifyCache");
+
+    cls.def(py::init<std::size_t>(), "maxSize"_a = 10000000);
+
+    cls.def_property_readonly("maxSize", &SimplifyCache::getMaxSize);
+    cls.def_property_readonly("nEntries", &SimplifyCache::getNEntries);
+    cls.def_property_readonly("nHits", &SimplifyCache::getNHits);
+    cls.def_property_readonly("nMisses", &SimplifyCache::getNMisses);
+    cls.def_property_readonly("size", &SimplifyCache::getSize);
+
+    cls.def("simplify", &SimplifyCache::simplify, "mapping"_a);
+    cls.def("clear", &SimplifyCache::clear);
+    cls.def("resetStats", &SimplifyCache::resetStats);
+}
+
+}  // namespace ast
@@ -33,13 +33,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(skyFrame) {
-    py::module mod("skyFrame", "Python wrapper for SkyFrame");
-
-    py::module::import("astshim.frame");
 
+void wrapSkyFrame(py::module &mod) {
     py::class_<SkyFrame, std::shared_ptr<SkyFrame>, Frame> cls(mod, "SkyFrame");
 
     cls.def(py::init<std::string const &>(), "options"_a = "");
@@ -75,9 +70,6 @@ PYBIND11_PLUGIN(skyFrame) {
     cls.def("setSkyRef", &SkyFrame::setSkyRef);
     cls.def("setSkyRefP", &SkyFrame::setSkyRefP);
     cls.def("skyOffsetMap", &SkyFrame::skyOffsetMap);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -32,22 +32,14 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(slaMap) {
-    py::module mod("slaMap", "Python wrapper for SlaMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapSlaMap(py::module &mod) {
     py::class_<SlaMap, std::shared_ptr<SlaMap>, Mapping> cls(mod, "SlaMap");
 
     cls.def(py::init<std::string const &>(), "options"_a = "");
 
     cls.def("copy", &SlaMap::copy);
     cls.def("add", &SlaMap::add, "cvt"_a, "args"_a = std::vector<double>());
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -34,13 +34,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(specFrame) {
-    py::module mod("specFrame", "Python wrapper for SpecFrame");
-
-    py::module::import("astshim.frame");
 
+void wrapSpecFrame(py::module &mod) {
     py::class_<SpecFrame, std::shared_ptr<SpecFrame>, Frame> cls(mod, "SpecFrame");
 
     cls.def(py::init<std::string const &>(), "options"_a = "");
@@ -75,9 +70,6 @@ PYBIND11_PLUGIN(specFrame) {
     cls.def("setSourceVRF", &SpecFrame::setSourceVRF, "vrf"_a);
     cls.def("setSpecOrigin", &SpecFrame::setSpecOrigin, "origin"_a);
     cls.def("setStdOfRest", &SpecFrame::setStdOfRest, "stdOfRest"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -30,13 +30,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(sphMap) {
-    py::module mod("sphMap", "Python wrapper for SphMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapSphMap(py::module &mod) {
     py::class_<SphMap, std::shared_ptr<SphMap>, Mapping> cls(mod, "SphMap");
 
     cls.def(py::init<std::string const &>(), "options"_a = "");
@@ -45,9 +40,6 @@ PYBIND11_PLUGIN(sphMap) {
     cls.def_property_readonly("polarLong", &SphMap::getPolarLong);
 
     cls.def("copy", &SphMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -30,11 +30,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(stream) {
-    py::module mod("stream", "Python wrapper for Stream.h");
 
+void wrapStream(py::module &mod) {
     // Stream
     py::class_<Stream, std::shared_ptr<Stream>> clsStream(mod, "Stream");
 
@@ -62,9 +59,6 @@ PYBIND11_PLUGIN(stream) {
     clsStringStream.def("getSourceData", &StringStream::getSourceData);
     clsStringStream.def("getSinkData", &StringStream::getSinkData);
     clsStringStream.def("sinkToSource", &StringStream::sinkToSource);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -1,12 +1,10 @@
+import pickle
 import unittest
 
 import numpy as np
 from numpy.testing import assert_allclose
 
-from .channel import Channel
-from .polyMap import PolyMap
-from .xmlChan import XmlChan
-from .stream import StringStream
+from ._astshimLib import Channel, PolyMap, StringStream, XmlChan
 
 
 class ObjectTestCase(unittest.TestCase):
@@ -56,6 +54,13 @@ class ObjectTestCase(unittest.TestCase):
         self.assertEqual(str(obj), str(obj_copy2))
         self.assertEqual(repr(obj), repr(obj_copy2))
 
+        # round trip with pickle
+        obj_copy3 = pickle.loads(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(type(obj), type(obj_copy3))
+        self.assertEqual(obj.show(), obj_copy3.show())
+        self.assertEqual(obj, obj_copy3)
+        self.assertEqual(hash(obj), hash(obj_copy3))
+
 
 class MappingTestCase(ObjectTestCase):
 
@@ -32,13 +32,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(timeFrame) {
-    py::module mod("timeFrame", "Python wrapper for TimeFrame");
-
-    py::module::import("astshim.frame");
 
+void wrapTimeFrame(py::module &mod) {
     py::class_<TimeFrame, std::shared_ptr<TimeFrame>, Frame> cls(mod, "TimeFrame");
 
     cls.def(py::init<std::string const &>(), "options"_a = "");
@@ -50,9 +45,6 @@ PYBIND11_PLUGIN(timeFrame) {
 
     cls.def("copy", &TimeFrame::copy);
     cls.def("currentTime", &TimeFrame::currentTime);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
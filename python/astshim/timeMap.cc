@@ -32,22 +32,14 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(timeMap) {
-    py::module mod("timeMap", "Python wrapper for TimeMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapTimeMap(py::module &mod) {
     py::class_<TimeMap, std::shared_ptr<TimeMap>, Mapping> cls(mod, "TimeMap");
 
     cls.def(py::init<std::string const &>(), "options"_a = "");
 
     cls.def("copy", &TimeMap::copy);
     cls.def("add", &TimeMap::add, "cvt"_a, "args"_a);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -30,13 +30,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(tranMap) {
-    py::module mod("tranMap", "Python wrapper for TranMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapTranMap(py::module &mod) {
     py::class_<TranMap, std::shared_ptr<TranMap>, Mapping> cls(mod, "TranMap");
 
     cls.def(py::init<Mapping const &, Mapping const &, std::string const &>(), "map1"_a, "map2"_a,
@@ -46,9 +41,6 @@ PYBIND11_PLUGIN(tranMap) {
     cls.def("__len__", [](TranMap const &) { return 2; });
 
     cls.def("copy", &TranMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
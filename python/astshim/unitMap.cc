@@ -30,21 +30,13 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(unitMap) {
-    py::module mod("unitMap", "Python wrapper for UnitMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapUnitMap(py::module &mod) {
     py::class_<UnitMap, std::shared_ptr<UnitMap>, Mapping> cls(mod, "UnitMap");
 
     cls.def(py::init<int, std::string const &>(), "ncoord"_a, "options"_a = "");
 
     cls.def("copy", &UnitMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
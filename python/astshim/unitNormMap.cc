@@ -32,21 +32,13 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(unitNormMap) {
-    py::module mod("unitNormMap", "Python wrapper for UnitNormMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapUnitNormMap(py::module &mod) {
     py::class_<UnitNormMap, std::shared_ptr<UnitNormMap>, Mapping> cls(mod, "UnitNormMap");
 
     cls.def(py::init<std::vector<double> const &, std::string const &>(), "centre"_a, "options"_a = "");
 
     cls.def("copy", &UnitNormMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -31,13 +31,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(wcsMap) {
-    py::module mod("wcsMap", "Python wrapper for WcsMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapWcsMap(py::module &mod) {
     py::enum_<WcsType>(mod, "WcsType")
             .value("AZP", WcsType::AZP)
             .value("SZP", WcsType::SZP)
@@ -86,9 +81,6 @@ PYBIND11_PLUGIN(wcsMap) {
     cls.def("copy", &WcsMap::copy);
     cls.def("getPVi_m", &WcsMap::getPVi_m, "i"_a, "m"_a);
     cls.def("getPVMax", &WcsMap::getPVMax);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
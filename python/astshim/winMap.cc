@@ -32,13 +32,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(winMap) {
-    py::module mod("winMap", "Python wrapper for WinMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapWinMap(py::module &mod) {
     py::class_<WinMap, std::shared_ptr<WinMap>, Mapping> cls(mod, "WinMap");
 
     cls.def(py::init<std::vector<double> const &, std::vector<double> const &, std::vector<double> const &,
@@ -46,9 +41,6 @@ PYBIND11_PLUGIN(winMap) {
             "ina"_a, "inb"_a, "outa"_a, "outb"_a, "options"_a = "");
 
     cls.def("copy", &WinMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
@@ -30,13 +30,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(xmlChan) {
-    py::module mod("xmlChan", "Python wrapper for XmlChan");
-
-    py::module::import("astshim.channel");
 
+void wrapXmlChan(py::module &mod) {
     py::class_<XmlChan, std::shared_ptr<XmlChan>, Channel> cls(mod, "XmlChan");
 
     cls.def(py::init<Stream &, std::string const &>(), "stream"_a, "options"_a = "");
@@ -44,9 +39,6 @@ PYBIND11_PLUGIN(xmlChan) {
     cls.def_property("xmlFormat", &XmlChan::getXmlFormat, &XmlChan::setXmlFormat);
     cls.def_property("xmlLength", &XmlChan::getXmlLength, &XmlChan::setXmlLength);
     cls.def_property("xmlPrefix", &XmlChan::getXmlPrefix, &XmlChan::setXmlPrefix);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
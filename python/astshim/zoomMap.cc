@@ -30,13 +30,8 @@ namespace py = pybind11;
 using namespace pybind11::literals;
 
 namespace ast {
-namespace {
-
-PYBIND11_PLUGIN(zoomMap) {
-    py::module mod("zoomMap", "Python wrapper for ZoomMap");
-
-    py::module::import("astshim.mapping");
 
+void wrapZoomMap(py::module &mod) {
     py::class_<ZoomMap, std::shared_ptr<ZoomMap>, Mapping> cls(mod, "ZoomMap");
 
     cls.def(py::init<int, double, std::string const &>(), "ncoord"_a, "zoom"_a, "options"_a = "");
@@ -44,9 +39,6 @@ PYBIND11_PLUGIN(zoomMap) {
     cls.def_property_readonly("zoom", &ZoomMap::getZoom);
 
     cls.def("copy", &ZoomMap::copy);
-
-    return mod.ptr();
 }
 
-}  // namespace
 }  // namespace ast
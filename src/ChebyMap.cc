@@ -19,6 +19,7 @@
  * the GNU General Public License along with this program.  If not,
  * see <https://www.lsstcorp.org/LegalNotices/>.
  */
+#include <cmath>
 #include <sstream>
 #include <stdexcept>
 
@@ -54,6 +55,61 @@ ChebyMap::ChebyMap(AstChebyMap *map) : Mapping(reinterpret_cast<AstMapping *>(ma
     }
 }
 
+Array2D ChebyMap::getCoeffForward() const { return detail::polyCoeffsImpl(*this, true); }
+
+Array2D ChebyMap::getCoeffInverse() const { return detail::polyCoeffsImpl(*this, false); }
+
+void ChebyMap::jacobianImpl(ConstArray2D const &at, Array3D const &jac) const {
+    if (isInverted() || !hasForward()) {
+        Mapping::jacobianImpl(at, jac);
+        return;
+    }
+    auto const coeffs = detail::polyCoeffsImpl(*this, true);
+    if (coeffs.getSize<0>() == 0) {
+        Mapping::jacobianImpl(at, jac);
+        return;
+    }
+    auto const domain = getDomain(true);
+    detail::chebyJacobian(coeffs, domain.lbnd, domain.ubnd, at, jac);
+}
+
+void ChebyMap::tranGridImpl(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix,
+                            bool doForward, Array2D const &to) const {
+    if (!doForward || isInverted() || !hasForward() || getReport()) {
+        Mapping::tranGridImpl(lbnd, ubnd, tol, maxpix, doForward, to);
+        return;
+    }
+    auto const coeffs = detail::polyCoeffsImpl(*this, true);
+    if (coeffs.getSize<0>() == 0) {
+        Mapping::tranGridImpl(lbnd, ubnd, tol, maxpix, doForward, to);
+        return;
+    }
+    auto const domain = getDomain(true);
+    // Let AST decide which grid coordinates along each axis are within the domain, so that points
+    // on the boundary are treated exactly as by the transform; the other axes are held at the center
+    int const nIn = getNIn();
+    std::vector<std::vector<bool>> inDomain(nIn);
+    for (int k = 0; k < nIn; ++k) {
+        int const nPts = ubnd[k] - lbnd[k] + 1;
+        Array2D probe = ndarray::allocate(ndarray::makeVector(nIn, nPts));
+        for (int m = 0; m < nIn; ++m) {
+            probe[m].deep() = 0.5 * (domain.lbnd[m] + domain.ubnd[m]);
+        }
+        for (int i = 0; i < nPts; ++i) {
+            probe[k][i] = lbnd[k] + i;
+        }
+        auto const result = applyForward(probe);
+        for (int i = 0; i < nPts; ++i) {
+            bool good = true;
+            for (int j = 0; j < result.getSize<0>(); ++j) {
+                good = good && !std::isnan(result[j][i]);
+            }
+            inDomain[k].push_back(good);
+        }
+    }
+    detail::chebyGrid(coeffs, domain.lbnd, domain.ubnd, inDomain, lbnd, ubnd, to);
+}
+
 ChebyDomain ChebyMap::getDomain(bool forward) const {
     int nElements = forward ? getNIn() : getNOut();
     std::vector<double> lbnd(nElements, 0.0);
@@ -20,19 +20,79 @@
  * see <https://www.lsstcorp.org/LegalNotices/>.
  */
 
+#include <algorithm>
+#include <atomic>
+#include <cmath>
+#include <exception>
+#include <limits>
+#include <memory>
+#include <sstream>
+#include <stdexcept>
+#include <thread>
 #include <vector>
 
 #include "ndarray.h"
 
 #include "astshim/base.h"
 #include "astshim/detail/utils.h"
+#include "astshim/detail/workerThreads.h"
 #include "astshim/MapBox.h"
 #include "astshim/Mapping.h"
 
 namespace ast {
+namespace {
+
+/// Maximum number of points in the sample grid of MapBox's approximate mode: nSamples^nIn
+std::size_t const MAX_SAMPLE_GRID_POINTS = 1000000;
+
+/*
+Check minOutCoord and maxOutCoord, returning maxOutCoord with 0 replaced by the number of outputs
+
+@throws std::invalid_argument if either is out of range
+*/
+int checkOutCoords(int nout, int minOutCoord, int maxOutCoord) {
+    if (maxOutCoord == 0) {
+        maxOutCoord = nout;
+    } else if ((maxOutCoord < 0) || (maxOutCoord > nout)) {
+        std::ostringstream os;
+        os << "maxOutCoord = " << maxOutCoord << " not in range [1, " << nout << "], or 0 for all remaining";
+        throw std::invalid_argument(os.str());
+    }
+    if ((minOutCoord < 0) || (minOutCoord > maxOutCoord)) {
+        std::ostringstream os;
+        os << "minOutCoord = " << minOutCoord << " not in range [1, " << maxOutCoord << "]";
+        throw std::invalid_argument(os.str());
+    }
+    return maxOutCoord;
+}
+
+/*
+Compute the output bounds of one input box for MapBoxBatch, replacing `AST__BAD` with `nan`
+
+@param[in] map  Mapping
+@param[in] lbnd  Lower bound of the input box; nIn values
+@param[in] ubnd  Upper bound of the input box; nIn values
+@param[in] minOutCoord, maxOutCoord  Range of output coordinates, starting from 1
+@param[out] lbndOut  Lower bound of the output box; 1 + maxOutCoord - minOutCoord values
+@param[out] ubndOut  Upper bound of the output box; 1 + maxOutCoord - minOutCoord values
+@param[in,out] xl, xu  Scratch space for the points at which the bounds occur; nIn values each
+*/
+void mapOneBox(Mapping const &map, double const *lbnd, double const *ubnd, int minOutCoord, int maxOutCoord,
+               double *lbndOut, double *ubndOut, std::vector<double> &xl, std::vector<double> &xu) {
+    bool const forward = true;
+    for (int i = 0, outcoord = minOutCoord; outcoord <= maxOutCoord; ++i, ++outcoord) {
+        astMapBox(map.getRawPtr(), lbnd, ubnd, forward, outcoord, &lbndOut[i], &ubndOut[i], xl.data(),
+                  xu.data());
+        assertOK();
+    }
+    detail::astBadToNan(lbndOut, 1 + maxOutCoord - minOutCoord);
+    detail::astBadToNan(ubndOut, 1 + maxOutCoord - minOutCoord);
+}
+
+}  // namespace
 
 MapBox::MapBox(Mapping const& map, std::vector<double> const& lbnd, std::vector<double> const& ubnd,
-               int minOutCoord, int maxOutCoord)
+               int minOutCoord, int maxOutCoord, int nSamples, int nRefine)
         : lbndIn(lbnd),
           ubndIn(ubnd),
           minOutCoord(minOutCoord),
@@ -41,7 +101,11 @@ MapBox::MapBox(Mapping const& map, std::vector<double> const& lbnd, std::vector<
           ubndOut(),
           xl(),
           xu() {
-    _compute(map, lbnd, ubnd, minOutCoord, maxOutCoord);
+    if (nSamples == 0) {
+        _compute(map, lbnd, ubnd, minOutCoord, maxOutCoord);
+    } else {
+        _computeSampled(map, lbnd, ubnd, minOutCoord, maxOutCoord, nSamples, nRefine);
+    }
 }
 
 void MapBox::_compute(Mapping const& map, std::vector<double> const& lbnd, std::vector<double> const& ubnd,
@@ -50,24 +114,13 @@ void MapBox::_compute(Mapping const& map, std::vector<double> const& lbnd, std::
     int const nout = map.getNOut();
     detail::assertEqual(lbnd.size(), "lbnd.size()", static_cast<std::size_t>(nin), "NIn");
     detail::assertEqual(ubnd.size(), "ubnd.size()", static_cast<std::size_t>(nin), "NIn");
-    if (maxOutCoord == 0) {
-        maxOutCoord = nout;
-        this->maxOutCoord = maxOutCoord;  // DM-10008
-    } else if ((maxOutCoord < 0) || (maxOutCoord > nout)) {
-        std::ostringstream os;
-        os << "maxOutCoord = " << maxOutCoord << " not in range [1, " << nout << "], or 0 for all remaining";
-        throw std::invalid_argument(os.str());
-    }
-    if ((minOutCoord < 0) || (minOutCoord > maxOutCoord)) {
-        std::ostringstream os;
-        os << "minOutCoord = " << minOutCoord << " not in range [1, " << maxOutCoord << "]";
-        throw std::invalid_argument(os.str());
-    }
+    maxOutCoord = checkOutCoords(nout, minOutCoord, maxOutCoord);
+    this->maxOutCoord = maxOutCoord;  // DM-10008
     int const npoints = 1 + maxOutCoord - minOutCoord;
     lbndOut.reserve(npoints);
     ubndOut.reserve(npoints);
-    xl = ndarray::allocate(ndarray::makeVector(npoints, nout));
-    xu = ndarray::allocate(ndarray::makeVector(npoints, nout));
+    xl = ndarray::allocate(ndarray::makeVector(npoints, nin));
+    xu = ndarray::allocate(ndarray::makeVector(npoints, nin));
     bool const forward = true;
     double lbndOut_i;
     double ubndOut_i;
@@ -88,4 +141,215 @@ void MapBox::_compute(Mapping const& map, std::vector<double> const& lbnd, std::
     detail::astBadToNan(xu);
 }
 
-}  // namespace ast
\ No newline at end of file
+void MapBox::_computeSampled(Mapping const& map, std::vector<double> const& lbnd,
+                             std::vector<double> const& ubnd, int minOutCoord, int maxOutCoord, int nSamples,
+                             int nRefine) {
+    int const nin = map.getNIn();
+    int const nout = map.getNOut();
+    detail::assertEqual(lbnd.size(), "lbnd.size()", static_cast<std::size_t>(nin), "NIn");
+    detail::assertEqual(ubnd.size(), "ubnd.size()", static_cast<std::size_t>(nin), "NIn");
+    maxOutCoord = checkOutCoords(nout, minOutCoord, maxOutCoord);
+    this->maxOutCoord = maxOutCoord;
+    if (nSamples < 3) {
+        std::ostringstream os;
+        os << "nSamples = " << nSamples << " must be 0 or at least 3";
+        throw std::invalid_argument(os.str());
+    }
+    if (nRefine < 0) {
+        std::ostringstream os;
+        os << "nRefine = " << nRefine << " < 0";
+        throw std::invalid_argument(os.str());
+    }
+    if ((nRefine > 0) && (nSamples < 4)) {
+        // each refinement pass shrinks the grid spacing by (nSamples - 1) / 2, which must be > 1
+        std::ostringstream os;
+        os << "nSamples = " << nSamples << " must be at least 4 if nRefine = " << nRefine << " > 0";
+        throw std::invalid_argument(os.str());
+    }
+    int const npoints = 1 + maxOutCoord - minOutCoord;
+    double const nan = std::numeric_limits<double>::quiet_NaN();
+    lbndOut.assign(npoints, nan);
+    ubndOut.assign(npoints, nan);
+    xl = ndarray::allocate(ndarray::makeVector(npoints, nin));
+    xu = ndarray::allocate(ndarray::makeVector(npoints, nin));
+    xl.deep() = nan;
+    xu.deep() = nan;
+
+    // the input box, with the bounds in order
+    std::vector<double> boxLo(nin);
+    std::vector<double> boxHi(nin);
+    for (int k = 0; k < nin; ++k) {
+        boxLo[k] = std::min(lbnd[k], ubnd[k]);
+        boxHi[k] = std::max(lbnd[k], ubnd[k]);
+    }
+    // check the size of the grid as it is computed, so that it cannot overflow
+    std::size_t gridSize = 1;
+    for (int k = 0; k < nin; ++k) {
+        gridSize *= nSamples;
+        if (gridSize > MAX_SAMPLE_GRID_POINTS) {
+            std::ostringstream os;
+            os << "nSamples^nIn = " << nSamples << "^" << nin << " > " << MAX_SAMPLE_GRID_POINTS
+               << "; use fewer samples, or nSamples = 0 for the accurate mode";
+            throw std::invalid_argument(os.str());
+        }
+    }
+    int const nGridPts = static_cast<int>(gridSize);
+    Array2D from = ndarray::allocate(ndarray::makeVector(nin, nGridPts));
+    Array2D to = ndarray::allocate(ndarray::makeVector(nout, nGridPts));
+
+    // transform a grid of nSamples points per axis spanning [lo, hi], clipped to the input box,
+    // and update the bounds with the results
+    auto sampleBox = [&](std::vector<double> lo, std::vector<double> hi) {
+        for (int k = 0; k < nin; ++k) {
+            lo[k] = std::max(lo[k], boxLo[k]);
+            hi[k] = std::min(hi[k], boxHi[k]);
+        }
+        for (int p = 0; p < nGridPts; ++p) {
+            for (int k = 0, ind = p; k < nin; ++k, ind /= nSamples) {
+                from[k][p] = lo[k] + (hi[k] - lo[k]) * (ind % nSamples) / (nSamples - 1);
+            }
+        }
+        map.applyForward(from, to);
+        for (int i = 0; i < npoints; ++i) {
+            auto const toRow = to[minOutCoord - 1 + i];
+            for (int p = 0; p < nGridPts; ++p) {
+                double const val = toRow[p];
+                if (std::isnan(val)) {
+                    continue;
+                }
+                if (std::isnan(lbndOut[i]) || val < lbndOut[i]) {
+                    lbndOut[i] = val;
+                    for (int k = 0; k < nin; ++k) {
+                        xl[i][k] = from[k][p];
+                    }
+                }
+                if (std::isnan(ubndOut[i]) || val > ubndOut[i]) {
+                    ubndOut[i] = val;
+                    for (int k = 0; k < nin; ++k) {
+                        xu[i][k] = from[k][p];
+                    }
+                }
+            }
+        }
+    };
+
+    sampleBox(boxLo, boxHi);
+    for (int i = 0; i < npoints; ++i) {
+        if (std::isnan(lbndOut[i])) {
+            std::ostringstream os;
+            os << "No valid output values found for output coordinate " << minOutCoord + i;
+            throw std::runtime_error(os.str());
+        }
+    }
+
+    // refine around each extreme point, using a grid spanning one grid spacing on either side
+    std::vector<double> spacing(nin);
+    for (int k = 0; k < nin; ++k) {
+        spacing[k] = (boxHi[k] - boxLo[k]) / (nSamples - 1);
+    }
+    std::vector<double> refineLo(nin);
+    std::vector<double> refineHi(nin);
+    for (int pass = 0; pass < nRefine; ++pass) {
+        for (int i = 0; i < npoints; ++i) {
+            for (auto const* extremes : {&xl, &xu}) {
+                // copy the point, since sampleBox may update it
+                std::vector<double> const center((*extremes)[i].begin(), (*extremes)[i].end());
+                for (int k = 0; k < nin; ++k) {
+                    refineLo[k] = center[k] - spacing[k];
+                    refineHi[k] = center[k] + spacing[k];
+                }
+                sampleBox(refineLo, refineHi);
+            }
+        }
+        for (auto& val : spacing) {
+            val *= 2.0 / (nSamples - 1);
+        }
+    }
+}
+
+MapBoxBatch::MapBoxBatch(Mapping const& map, ConstArray2D const& lbnd, ConstArray2D const& ubnd,
+                         int minOutCoord, int maxOutCoord, int nThreads)
+        : minOutCoord(minOutCoord), maxOutCoord(checkOutCoords(map.getNOut(), minOutCoord, maxOutCoord)),
+          lbndOut(), ubndOut() {
+    int const nin = map.getNIn();
+    detail::assertEqual(lbnd.getSize<1>(), "lbnd.size[1]", static_cast<std::size_t>(nin), "NIn");
+    detail::assertEqual(ubnd.getSize<1>(), "ubnd.size[1]", static_cast<std::size_t>(nin), "NIn");
+    detail::assertEqual(lbnd.getSize<0>(), "lbnd.size[0]", ubnd.getSize<0>(), "ubnd.size[0]");
+    if (nThreads < 0) {
+        std::ostringstream os;
+        os << "nThreads = " << nThreads << " < 0";
+        throw std::invalid_argument(os.str());
+    }
+    if (nThreads == 0) {
+        nThreads = static_cast<int>(std::max(1u, std::thread::hardware_concurrency()));
+    }
+    int const nBoxes = lbnd.getSize<0>();
+    int const nOutCoords = 1 + this->maxOutCoord - minOutCoord;
+    lbndOut = ndarray::allocate(ndarray::makeVector(nBoxes, nOutCoords));
+    ubndOut = ndarray::allocate(ndarray::makeVector(nBoxes, nOutCoords));
+    nThreads = std::min(nThreads, nBoxes);
+
+    // Use raw pointers to the rows, because indexing an ndarray creates and destroys references
+    // to its shared data manager, which is not thread-safe (and for numpy arrays needs the GIL)
+    double const *lbndData = lbnd.getData();
+    double const *ubndData = ubnd.getData();
+    double *lbndOutData = lbndOut.getData();
+    double *ubndOutData = ubndOut.getData();
+    auto const lbndStride = lbnd.getStride<0>();
+    auto const ubndStride = ubnd.getStride<0>();
+    auto const lbndOutStride = lbndOut.getStride<0>();
+    auto const ubndOutStride = ubndOut.getStride<0>();
+    auto mapBox = [&](Mapping const &boxMap, int i, std::vector<double> &xl, std::vector<double> &xu) {
+        mapOneBox(boxMap, lbndData + i * lbndStride, ubndData + i * ubndStride, minOutCoord,
+                  this->maxOutCoord, lbndOutData + i * lbndOutStride, ubndOutData + i * ubndOutStride,
+                  xl, xu);
+    };
+
+    if (nThreads <= 1) {
+        std::vector<double> xl(nin);
+        std::vector<double> xu(nin);
+        for (int i = 0; i < nBoxes; ++i) {
+            mapBox(map, i, xl, xu);
+        }
+        return;
+    }
+
+    // An AST object can only be used by the thread that has it locked, so give each worker its own copy
+    auto const workerMaps = detail::makeWorkerMappings(map, nThreads);
+    std::atomic<int> nextBox(0);
+    // record the error for each box, so the error for the first failed box can be reported
+    std::vector<std::exception_ptr> errors(nBoxes);
+    std::vector<std::exception_ptr> threadErrors(nThreads);
+    {
+        // if starting a thread fails then the threads already started are joined before the error propagates
+        detail::ThreadGroup threads;
+        for (int t = 0; t < nThreads; ++t) {
+            threads.start([&, t]() {
+                try {
+                    Mapping const& workerMap = *workerMaps[t];
+                    detail::ThreadLockGuard lock(workerMap.getRawPtr());
+                    std::vector<double> xl(nin);
+                    std::vector<double> xu(nin);
+                    for (int i = nextBox++; i < nBoxes; i = nextBox++) {
+                        try {
+                            mapBox(workerMap, i, xl, xu);
+                        } catch (...) {
+                            errors[i] = std::current_exception();
+                        }
+                    }
+                } catch (...) {
+                    threadErrors[t] = std::current_exception();
+                }
+            });
+        }
+    }
+    for (auto const& errorList : {threadErrors, errors}) {
+        for (auto const& error : errorList) {
+            if (error) {
+                std::rethrow_exception(error);
+            }
+        }
+    }
+}
+
+}  // namespace ast
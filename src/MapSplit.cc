@@ -33,8 +33,7 @@
 namespace ast {
 
 MapSplit::MapSplit(Mapping const &map, std::vector<int> const &in) {
-    std::vector<int> locOut;
-    locOut.reserve(map.getNOut());  // the max # of elements astMapSplit may set
+    std::vector<int> locOut(map.getNOut());  // the max # of elements astMapSplit may set
     AstMapping *rawSplitMap;
     astMapSplit(map.getRawPtr(), in.size(), in.data(), locOut.data(), &rawSplitMap);
     assertOK();
@@ -0,0 +1,63 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+
+#include <sstream>
+#include <string>
+
+#include "astshim/Mapping.h"
+#include "astshim/MapSplitCache.h"
+
+namespace ast {
+namespace {
+
+/// Return the extra key for a split: the picked inputs
+std::string makeExtraKey(std::vector<int> const &in) {
+    std::ostringstream os;
+    for (int val : in) {
+        os << val << ",";
+    }
+    return os.str();
+}
+
+}  // namespace
+
+MapSplitCache::MapSplitCache(std::size_t maxSize) : _cache(maxSize), _nHits(0), _nMisses(0) {}
+
+MapSplit MapSplitCache::split(Mapping const &map, std::vector<int> const &in) {
+    std::string const extra = makeExtraKey(in);
+    auto entry = _cache.find(map, extra);
+    // a cached split mapping that has been modified since it was cached must be replaced
+    if (entry && (entry->mapSplit.splitMap->getStateId() == entry->splitStateId)) {
+        ++_nHits;
+        return entry->mapSplit;
+    }
+
+    ++_nMisses;
+    MapSplit mapSplit(map, in);
+    std::size_t const size = mapSplit.splitMap->getObjSize();
+    _cache.insert(map, extra, Entry{mapSplit, mapSplit.splitMap->getStateId()}, size);
+    return mapSplit;
+}
+
+void MapSplitCache::clear() { _cache.clear(); }
+
+}  // namespace ast
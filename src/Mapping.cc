@@ -19,20 +19,71 @@
  * the GNU General Public License along with this program.  If not,
  * see <https://www.lsstcorp.org/LegalNotices/>.
  */
+#include <algorithm>
+#include <atomic>
 #include <cmath>
+#include <exception>
 #include <limits>
 #include <memory>
 #include <sstream>
 #include <stdexcept>
+#include <thread>
+#include <type_traits>
+#include <utility>
+#include <vector>
 
 #include "astshim/base.h"
 #include "astshim/detail/utils.h"
+#include "astshim/detail/workerThreads.h"
 #include "astshim/Frame.h"
 #include "astshim/Mapping.h"
 #include "astshim/ParallelMap.h"
 #include "astshim/SeriesMap.h"
 
 namespace ast {
+namespace {
+
+/*
+Number of points transformed per call to astTranN when the results are converted from AST__BAD to nan,
+or when the input must be gathered; small enough that the results are still in cache for the conversion
+*/
+int const BLOCK_SIZE = 4096;
+
+/*
+Replace `AST__BAD` with `nan` in the `nPts` points of `to` starting at index `start`
+*/
+void badToNanRange(Array2D const &to, int start, int nPts) {
+    for (int axis = 0, nAxes = to.getSize<0>(); axis < nAxes; ++axis) {
+        detail::astBadToNan(to.getData() + axis * to.getStride<0>() + start, nPts);
+    }
+}
+
+/*
+Compute the Jacobian of a mapping whose forward transformation is linear (or affine)
+
+The constant matrix is found by transforming the origin and the unit vector along each input axis,
+and is copied to every point of `jac`, which has dimensions (nPts, nOut, nIn).
+*/
+void linearJacobian(Mapping const &mapping, Array3D const &jac) {
+    int const nIn = mapping.getNIn();
+    int const nOut = mapping.getNOut();
+    Array2D probes = ndarray::allocate(ndarray::makeVector(nIn, nIn + 1));
+    probes.deep() = 0.0;
+    for (int k = 0; k < nIn; ++k) {
+        probes[k][k + 1] = 1.0;
+    }
+    Array2D results = ndarray::allocate(ndarray::makeVector(nOut, nIn + 1));
+    mapping.applyForward(probes, results);
+    for (int i = 0, nPts = jac.getSize<0>(); i < nPts; ++i) {
+        for (int j = 0; j < nOut; ++j) {
+            for (int k = 0; k < nIn; ++k) {
+                jac[i][j][k] = results[j][k + 1] - results[j][0];
+            }
+        }
+    }
+}
+
+}  // namespace
 
 SeriesMap Mapping::then(Mapping const &next) const { return SeriesMap(*this, next); }
 
@@ -60,6 +111,63 @@ Array2D Mapping::linearApprox(PointD const &lbnd, PointD const &ubnd, double tol
     return fit;
 }
 
+Array3D Mapping::jacobian(ConstArray2D const &at) const {
+    detail::assertEqual(at.getSize<0>(), "at.size[0]", static_cast<std::size_t>(getNIn()), "nIn");
+    int const nPts = at.getSize<1>();
+    Array3D jac = ndarray::allocate(ndarray::makeVector(nPts, getNOut(), getNIn()));
+    jacobianImpl(at, jac);
+    return jac;
+}
+
+void Mapping::jacobianImpl(ConstArray2D const &at, Array3D const &jac) const {
+    if (getIsLinear()) {
+        linearJacobian(*this, jac);
+        return;
+    }
+    int const nIn = getNIn();
+    int const nOut = getNOut();
+    int const nPts = at.getSize<1>();
+    double const relStep = std::cbrt(std::numeric_limits<double>::epsilon());
+    Array2D fromPlus = ndarray::copy(at);
+    Array2D fromMinus = ndarray::copy(at);
+    Array2D toPlus = ndarray::allocate(ndarray::makeVector(nOut, nPts));
+    Array2D toMinus = ndarray::allocate(ndarray::makeVector(nOut, nPts));
+    // offset one input axis at a time, transforming all points at once for each offset
+    for (int k = 0; k < nIn; ++k) {
+        for (int i = 0; i < nPts; ++i) {
+            double const step = relStep * std::max(std::abs(at[k][i]), 1.0);
+            fromPlus[k][i] = at[k][i] + step;
+            fromMinus[k][i] = at[k][i] - step;
+        }
+        applyForward(fromPlus, toPlus);
+        applyForward(fromMinus, toMinus);
+        for (int i = 0; i < nPts; ++i) {
+            // use the actual separation of the points, which is exact, rather than 2 * step
+            double const dx = fromPlus[k][i] - fromMinus[k][i];
+            for (int j = 0; j < nOut; ++j) {
+                jac[i][j][k] = (toPlus[j][i] - toMinus[j][i]) / dx;
+            }
+        }
+        for (int i = 0; i < nPts; ++i) {
+            fromPlus[k][i] = fromMinus[k][i] = at[k][i];
+        }
+    }
+}
+
+void Mapping::tranImpl(int nPts, int nFromAxes, int fromDim, double const *from, bool doForward,
+                       int nToAxes, int toDim, double *to) const {
+    astTranN(getRawPtr(), nPts, nFromAxes, fromDim, from, static_cast<int>(doForward), nToAxes, toDim, to);
+    assertOK();
+}
+
+void Mapping::tranGridImpl(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix, bool doForward,
+                           Array2D const &to) const {
+    // AST writes output axis i at to.getData() + i * nPts, which matches the (nToAxes, nPts) layout of `to`
+    astTranGrid(getRawPtr(), static_cast<int>(lbnd.size()), lbnd.data(), ubnd.data(), tol, maxpix,
+                static_cast<int>(doForward), to.getSize<0>(), to.getSize<1>(), to.getData());
+    assertOK();
+}
+
 template <typename Class>
 std::shared_ptr<Class> Mapping::decompose(int i, bool copy) const {
     if ((i < 0) || (i > 1)) {
@@ -106,7 +214,39 @@ std::shared_ptr<Class> Mapping::decompose(int i, bool copy) const {
     return Object::fromAstObject<Class>(reinterpret_cast<AstObject *>(retRawMap), copy);
 }
 
-void Mapping::_tran(ConstArray2D const &from, bool doForward, Array2D const &to) const {
+std::shared_ptr<Mapping const> Mapping::_getSimplified(int nPts) const {
+    if ((_simplifyThreshold <= 0) || (nPts < _simplifyThreshold)) {
+        return nullptr;
+    }
+    if (_simplified && isUnchangedSince(_simplifiedStateId, _simplifiedModificationCount)) {
+        return _simplified;
+    }
+    // this mapping may have been modified (e.g. through a shared component), so compare its contents
+    std::uint64_t const modificationCount = getModificationCount();
+    std::string text = toString();
+    if (!_simplified || (text != _simplifiedText)) {
+        auto simplified = simplify();
+        // The copy is left unlocked between uses, so that this mapping can be used by any thread
+        // that has it locked; lock the copy again before freeing it
+        simplified->unlock();
+        _simplified = std::shared_ptr<Mapping>(simplified.get(), [simplified](Mapping *simp) mutable {
+            simp->lock(true);
+            simplified.reset();
+        });
+        _simplifiedText = std::move(text);
+    }
+    _simplifiedStateId = getStateId();
+    _simplifiedModificationCount = modificationCount;
+    return _simplified;
+}
+
+void Mapping::_tran(ConstArray2D const &from, bool doForward, Array2D const &to, int nThreads,
+                     int chunkSize, bool badToNan) const {
+    if (auto simplified = _getSimplified(from.getSize<1>())) {
+        detail::ThreadLockGuard lock(simplified->getRawPtr());
+        simplified->_tran(from, doForward, to, nThreads, chunkSize, badToNan);
+        return;
+    }
     int const nFromAxes = doForward ? getNIn() : getNOut();
     int const nToAxes = doForward ? getNOut() : getNIn();
     detail::assertEqual(from.getSize<0>(), "from.size[0]", static_cast<std::size_t>(nFromAxes),
@@ -114,27 +254,171 @@ void Mapping::_tran(ConstArray2D const &from, bool doForward, Array2D const &to)
     detail::assertEqual(to.getSize<0>(), "to.size[0]", static_cast<std::size_t>(nToAxes), "to coords");
     detail::assertEqual(from.getSize<1>(), "from.size[1]", to.getSize<1>(), "to.size[1]");
     int const nPts = from.getSize<1>();
-    astTranN(getRawPtr(), nPts, nFromAxes, nPts, from.getData(), static_cast<int>(doForward), nToAxes, nPts,
-             to.getData());
-    assertOK();
-    detail::astBadToNan(to);
+    if (nThreads < 0) {
+        std::ostringstream os;
+        os << "nThreads = " << nThreads << " < 0";
+        throw std::invalid_argument(os.str());
+    }
+    if (nThreads == 0) {
+        nThreads = static_cast<int>(std::max(1u, std::thread::hardware_concurrency()));
+    }
+    if (chunkSize <= 0) {
+        chunkSize = std::max(1, (nPts + nThreads - 1) / nThreads);
+    }
+    int const nChunks = (nPts + chunkSize - 1) / chunkSize;
+    nThreads = std::min(nThreads, nChunks);
+    if (nThreads <= 1) {
+        _tranRangeBlocked(from, doForward, to, 0, nPts, badToNan);
+        return;
+    }
+
+    // An AST object can only be used by the thread that has it locked, so give each worker its own copy
+    auto const workerMaps = detail::makeWorkerMappings(*this, nThreads);
+    std::atomic<int> nextChunk(0);
+    std::vector<std::exception_ptr> errors(nThreads);
+    {
+        // if starting a thread fails then the threads already started are joined before the error propagates
+        detail::ThreadGroup threads;
+        for (int i = 0; i < nThreads; ++i) {
+            threads.start([&, i]() {
+                try {
+                    Mapping const &workerMap = *workerMaps[i];
+                    detail::ThreadLockGuard lock(workerMap.getRawPtr());
+                    for (int chunk = nextChunk++; chunk < nChunks; chunk = nextChunk++) {
+                        int const start = chunk * chunkSize;
+                        workerMap._tranRangeBlocked(from, doForward, to, start,
+                                                    std::min(chunkSize, nPts - start), badToNan);
+                    }
+                } catch (...) {
+                    errors[i] = std::current_exception();
+                }
+            });
+        }
+    }
+    for (auto const &error : errors) {
+        if (error) {
+            std::rethrow_exception(error);
+        }
+    }
+}
+
+void Mapping::_tranRange(ConstArray2D const &from, bool doForward, Array2D const &to, int start, int nPts,
+                         bool badToNan) const {
+    tranImpl(nPts, from.getSize<0>(), from.getStride<0>(), from.getData() + start, doForward, to.getSize<0>(),
+             to.getStride<0>(), to.getData() + start);
+    if (badToNan) {
+        badToNanRange(to, start, nPts);
+    }
+}
+
+void Mapping::_tranRangeBlocked(ConstArray2D const &from, bool doForward, Array2D const &to, int start,
+                                int nPts, bool badToNan) const {
+    if (!badToNan) {
+        _tranRange(from, doForward, to, start, nPts, false);
+        return;
+    }
+    for (int blockStart = start, end = start + nPts; blockStart < end; blockStart += BLOCK_SIZE) {
+        _tranRange(from, doForward, to, blockStart, std::min(BLOCK_SIZE, end - blockStart), true);
+    }
+}
+
+template <typename T>
+void Mapping::_tranStrided(ndarray::Array<T const, 2, 0> const &from, bool doForward, Array2D const &to,
+                           bool badToNan) const {
+    if (auto simplified = _getSimplified(from.template getSize<1>())) {
+        detail::ThreadLockGuard lock(simplified->getRawPtr());
+        simplified->_tranStrided(from, doForward, to, badToNan);
+        return;
+    }
+    int const nFromAxes = doForward ? getNIn() : getNOut();
+    int const nToAxes = doForward ? getNOut() : getNIn();
+    detail::assertEqual(from.template getSize<0>(), "from.size[0]", static_cast<std::size_t>(nFromAxes),
+                        "from coords");
+    detail::assertEqual(to.getSize<0>(), "to.size[0]", static_cast<std::size_t>(nToAxes), "to coords");
+    detail::assertEqual(from.template getSize<1>(), "from.size[1]", to.getSize<1>(), "to.size[1]");
+    int const nPts = from.template getSize<1>();
+    std::ptrdiff_t const axisStride = from.template getStride<0>();
+    std::ptrdiff_t const pointStride = from.template getStride<1>();
+    // the stride between axes is irrelevant if there is only one axis
+    std::ptrdiff_t const indim = nFromAxes == 1 ? nPts : axisStride;
+    if (std::is_same<T, double>::value && (pointStride == 1) && (indim >= nPts)) {
+        // AST can read the points in place
+        int const blockSize = badToNan ? BLOCK_SIZE : std::max(nPts, 1);
+        auto fromData = reinterpret_cast<double const *>(from.getData());
+        for (int start = 0; start < nPts; start += blockSize) {
+            int const nBlockPts = std::min(blockSize, nPts - start);
+            tranImpl(nBlockPts, nFromAxes, static_cast<int>(indim), fromData + start, doForward, nToAxes,
+                     nPts, to.getData() + start);
+            if (badToNan) {
+                badToNanRange(to, start, nBlockPts);
+            }
+        }
+    } else {
+        int const blockSize = std::min(nPts, BLOCK_SIZE);
+        std::vector<double> block(static_cast<std::size_t>(nFromAxes) * blockSize);
+        for (int start = 0; start < nPts; start += blockSize) {
+            int const nBlockPts = std::min(blockSize, nPts - start);
+            for (int axis = 0; axis < nFromAxes; ++axis) {
+                T const *fromPtr = from.getData() + axis * axisStride + start * pointStride;
+                double *blockPtr = block.data() + axis * blockSize;
+                for (int i = 0; i < nBlockPts; ++i) {
+                    blockPtr[i] = static_cast<double>(fromPtr[i * pointStride]);
+                }
+            }
+            tranImpl(nBlockPts, nFromAxes, blockSize, block.data(), doForward, nToAxes, nPts,
+                     to.getData() + start);
+            if (badToNan) {
+                badToNanRange(to, start, nBlockPts);
+            }
+        }
+    }
+}
+
+int Mapping::getGridSize(PointI const &lbnd, PointI const &ubnd) {
+    detail::assertEqual(lbnd.size(), "lbnd.size", ubnd.size(), "ubnd.size");
+    long long gridSize = 1;
+    for (std::size_t i = 0; i < lbnd.size(); ++i) {
+        if (ubnd[i] < lbnd[i]) {
+            std::ostringstream os;
+            os << "ubnd[" << i << "] = " << ubnd[i] << " < lbnd[" << i << "] = " << lbnd[i];
+            throw std::invalid_argument(os.str());
+        }
+        gridSize *= static_cast<long long>(ubnd[i]) - lbnd[i] + 1;
+        if (gridSize > std::numeric_limits<int>::max()) {
+            throw std::invalid_argument("The grid has too many points");
+        }
+    }
+    return static_cast<int>(gridSize);
 }
 
 void Mapping::_tranGrid(PointI const &lbnd, PointI const &ubnd, double tol, int maxpix, bool doForward,
                         Array2D const &to) const {
+    if (auto simplified = _getSimplified(to.getSize<1>())) {
+        detail::ThreadLockGuard lock(simplified->getRawPtr());
+        simplified->_tranGrid(lbnd, ubnd, tol, maxpix, doForward, to);
+        return;
+    }
     int const nFromAxes = doForward ? getNIn() : getNOut();
     int const nToAxes = doForward ? getNOut() : getNIn();
     detail::assertEqual(lbnd.size(), "lbnd.size", static_cast<std::size_t>(nFromAxes), "from coords");
     detail::assertEqual(ubnd.size(), "ubnd.size", static_cast<std::size_t>(nFromAxes), "from coords");
-    detail::assertEqual(to.getSize<1>(), "to.size[1]", static_cast<std::size_t>(nToAxes), "to coords");
-    int const nPts = to.getSize<0>();
-    astTranGrid(getRawPtr(), nFromAxes, lbnd.data(), ubnd.data(), tol, maxpix, static_cast<int>(doForward),
-                nToAxes, nPts, to.getData());
-    assertOK();
+    detail::assertEqual(to.getSize<0>(), "to.size[0]", static_cast<std::size_t>(nToAxes), "to coords");
+    int const nPts = to.getSize<1>();
+    int const gridSize = getGridSize(lbnd, ubnd);
+    if (nPts < gridSize) {
+        std::ostringstream os;
+        os << "to has " << nPts << " points, but the grid has " << gridSize;
+        throw std::invalid_argument(os.str());
+    }
+    tranGridImpl(lbnd, ubnd, tol, maxpix, doForward, to);
     detail::astBadToNan(to);
 }
 
 // Explicit instantiations
+template void Mapping::_tranStrided(ndarray::Array<float const, 2, 0> const &, bool, Array2D const &,
+                                    bool) const;
+template void Mapping::_tranStrided(ndarray::Array<double const, 2, 0> const &, bool, Array2D const &,
+                                    bool) const;
 template std::shared_ptr<Frame> Mapping::decompose(int i, bool) const;
 template std::shared_ptr<Mapping> Mapping::decompose(int i, bool) const;
 
@@ -0,0 +1,148 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <algorithm>
+#include <sstream>
+#include <stdexcept>
+
+#include "astshim/detail/workerThreads.h"
+#include "astshim/Mapping.h"
+#include "astshim/MappingPool.h"
+
+namespace ast {
+
+MappingPool::MappingPool(Mapping const &mapping, int nThreads)
+        : _nIn(mapping.getNIn()), _nOut(mapping.getNOut()) {
+    if (nThreads < 0) {
+        std::ostringstream os;
+        os << "nThreads = " << nThreads << " < 0";
+        throw std::invalid_argument(os.str());
+    }
+    if (nThreads == 0) {
+        nThreads = static_cast<int>(std::max(1u, std::thread::hardware_concurrency()));
+    }
+    // make all copies before starting any threads, so a failure to copy leaves no threads to clean up
+    auto workerMaps = detail::makeWorkerMappings(mapping, nThreads);
+    // reserve space first, so that adding a started thread to _threads cannot fail
+    _threads.reserve(nThreads);
+    try {
+        for (auto &workerMap : workerMaps) {
+            _threads.emplace_back(&MappingPool::_work, this, std::move(workerMap));
+        }
+    } catch (...) {
+        // the destructor is not called if the constructor throws, so stop the threads already started
+        _stopWorkers();
+        throw;
+    }
+}
+
+MappingPool::~MappingPool() { _stopWorkers(); }
+
+void MappingPool::_stopWorkers() {
+    {
+        std::lock_guard<std::mutex> lock(_mutex);
+        _stop = true;
+    }
+    _jobReady.notify_all();
+    for (auto &thread : _threads) {
+        thread.join();
+    }
+}
+
+std::vector<Array2D> MappingPool::_tran(std::vector<ConstArray2D> const &batches, bool doForward) {
+    int const nFromAxes = doForward ? _nIn : _nOut;
+    int const nToAxes = doForward ? _nOut : _nIn;
+    std::vector<Array2D> results;
+    results.reserve(batches.size());
+    for (auto const &batch : batches) {
+        if (batch.getSize<0>() != static_cast<std::size_t>(nFromAxes)) {
+            std::ostringstream os;
+            os << "batch " << results.size() << " has " << batch.getSize<0>() << " axes; expected "
+               << nFromAxes;
+            throw std::invalid_argument(os.str());
+        }
+        // allocate the results in this thread, since ndarray reference counting is not thread safe
+        results.push_back(ndarray::allocate(ndarray::makeVector(nToAxes, batch.getSize<1>())));
+    }
+    if (batches.empty()) {
+        return results;
+    }
+
+    std::lock_guard<std::mutex> callLock(_callMutex);
+    std::unique_lock<std::mutex> lock(_mutex);
+    _doForward = doForward;
+    _batches = &batches;
+    _results = &results;
+    _nextBatch = 0;
+    _nActive = getNThreads();
+    _errors.assign(batches.size(), nullptr);
+    ++_jobId;
+    _jobReady.notify_all();
+    _jobDone.wait(lock, [this] { return _nActive == 0; });
+    _batches = nullptr;
+    _results = nullptr;
+    for (auto const &error : _errors) {
+        if (error) {
+            std::rethrow_exception(error);
+        }
+    }
+    return results;
+}
+
+void MappingPool::_work(std::shared_ptr<Mapping> mapping) {
+    mapping->lock(true);
+    std::uint64_t lastJobId = 0;
+    std::unique_lock<std::mutex> lock(_mutex);
+    while (true) {
+        _jobReady.wait(lock, [&] { return _stop || _jobId != lastJobId; });
+        if (_stop) {
+            break;
+        }
+        lastJobId = _jobId;
+        while (_nextBatch < _batches->size()) {
+            std::size_t const i = _nextBatch++;
+            ConstArray2D const &from = (*_batches)[i];
+            Array2D const &to = (*_results)[i];
+            bool const doForward = _doForward;
+            lock.unlock();
+            std::exception_ptr error;
+            try {
+                if (doForward) {
+                    mapping->applyForward(from, to);
+                } else {
+                    mapping->applyInverse(from, to);
+                }
+            } catch (...) {
+                error = std::current_exception();
+            }
+            lock.lock();
+            _errors[i] = error;
+        }
+        if (--_nActive == 0) {
+            _jobDone.notify_one();
+        }
+    }
+    lock.unlock();
+    // free the copy while this thread still has it locked
+    mapping.reset();
+}
+
+}  // namespace ast
@@ -20,6 +20,8 @@
  * see <https://www.lsstcorp.org/LegalNotices/>.
  */
 #include <algorithm>
+#include <atomic>
+#include <cstring>
 #include <functional>
 #include <ostream>
 #include <sstream>
@@ -75,14 +77,102 @@ extern "C" void sinkToOstream(const char *text) {
     (*osptr) << text << std::endl;
 }
 
+/// State of a structural hash being computed by sinkToHash
+struct HashState {
+    std::uint64_t hash = detail::FNV_OFFSET_BASIS;  ///< 64-bit FNV-1a hash of the text so far
+    int nObjects = 0;                       ///< number of objects (including nested objects) seen so far
+};
+
+/**
+C function to add data to a 64-bit FNV-1a hash
+
+Like sinkToOstream, this uses astChannelData to retrieve a pointer to the hash state,
+so code using this function must call `astPutChannelData(ch, &state)` before calling `astWrite(ch, obj)`,
+where `state` is a HashState. Each line is followed by a newline, as in the text written by sinkToOstream.
+*/
+extern "C" void sinkToHash(const char *text) {
+    auto statePtr = reinterpret_cast<HashState *>(astChannelData);
+    std::size_t const nIndent = std::strspn(text, " ");
+    if (std::strncmp(text + nIndent, "Begin ", 6) == 0) {
+        ++statePtr->nObjects;
+    }
+    statePtr->hash = detail::fnv1aHash(text, std::strlen(text), statePtr->hash);
+    statePtr->hash = detail::fnv1aHash("\n", 1, statePtr->hash);
+}
+
 }  // anonymous namespace
 
 bool Object::operator==(Object const &rhs) const {
+    if (same(rhs)) {
+        return true;
+    }
+    if (getClassName() != rhs.getClassName()) {
+        return false;
+    }
+    if (astIsAMapping(getRawPtr())) {
+        if ((getI("NIn") != rhs.getI("NIn")) || (getI("NOut") != rhs.getI("NOut"))) {
+            return false;
+        }
+    }
+    // comparing hashes is only worthwhile if neither object has to be serialized to compute one
+    if (_isHashCached() && rhs._isHashCached() && (_hash != rhs._hash)) {
+        return false;
+    }
     auto thisStr = this->show(false);
     auto rhsStr = rhs.show(false);
     return rhsStr == thisStr;
 }
 
+std::size_t Object::hash() const {
+    if (!_isHashCached()) {
+        std::uint64_t const modificationCount = getModificationCount();
+        HashState state;
+        auto ch = astChannel(nullptr, sinkToHash, "%s", "Comment=0");
+        // Store a pointer to the hash state in the channel, as required by sinkToHash
+        astPutChannelData(ch, &state);
+        astWrite(ch, this->getRawPtr());
+        astAnnul(ch);
+        assertOK();
+        _hash = static_cast<std::size_t>(state.hash);
+        _hashStateId = _stateId;
+        _hashModificationCount = modificationCount;
+        _containsObjects = state.nObjects > 1;
+    }
+    return _hash;
+}
+
+bool Object::isUnchangedSince(std::uint64_t stateId, std::uint64_t modificationCount) const {
+    if (stateId != _stateId) {
+        return false;
+    }
+    if (modificationCount == getModificationCount()) {
+        return true;
+    }
+    // Contained objects may have been modified through other objects that share them.
+    // The objects an object contains are fixed when it is made, so whether it contains any
+    // is known if the hash has been computed since the state ID last changed.
+    if (_hashStateId != _stateId) {
+        hash();
+    }
+    return !_containsObjects;
+}
+
+namespace {
+
+std::atomic<std::uint64_t> nextStateId(1);
+std::atomic<std::uint64_t> modificationCount(0);
+
+}  // anonymous namespace
+
+std::uint64_t Object::getModificationCount() { return modificationCount; }
+
+std::uint64_t Object::_makeStateId() { return nextStateId++; }
+
+std::uint64_t Object::_makeModifiedStateId() {
+    ++modificationCount;
+    return nextStateId++;
+}
+
 std::shared_ptr<Object> Object::_basicFromAstObject(AstObject *rawObj) {
     static std::unordered_map<std::string, std::function<std::shared_ptr<Object>(AstObject *)>>
             ClassCasterMap = {
@@ -0,0 +1,146 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <limits>
+#include <sstream>
+#include <stdexcept>
+#include <vector>
+
+#include "astshim/detail/utils.h"
+#include "astshim/Mapping.h"
+#include "astshim/PiecewiseLinearApprox.h"
+
+namespace ast {
+
+PiecewiseLinearApprox::PiecewiseLinearApprox(Mapping const &map, PointD const &lbnd, PointD const &ubnd,
+                                             double tol, double minSize)
+        : nIn(map.getNIn()), nOut(map.getNOut()), tol(tol), tiles() {
+    detail::assertEqual(lbnd.size(), "lbnd.size", static_cast<std::size_t>(nIn), "nIn");
+    detail::assertEqual(ubnd.size(), "ubnd.size", static_cast<std::size_t>(nIn), "nIn");
+    for (int k = 0; k < nIn; ++k) {
+        if (!(ubnd[k] >= lbnd[k])) {
+            std::ostringstream os;
+            os << "ubnd[" << k << "] = " << ubnd[k] << " < lbnd[" << k << "] = " << lbnd[k];
+            throw std::invalid_argument(os.str());
+        }
+    }
+    if (!(minSize > 0)) {
+        std::ostringstream os;
+        os << "minSize = " << minSize << " must be positive";
+        throw std::invalid_argument(os.str());
+    }
+    if (!map.hasForward()) {
+        throw std::runtime_error("The mapping has no forward transformation");
+    }
+
+    tiles.push_back(Tile{lbnd, ubnd, {}, false, {}});
+    // indices of tiles that have not yet been fit; each is fit or split exactly once
+    std::vector<int> toDo = {0};
+    std::vector<double> fit((1 + nIn) * nOut);
+    while (!toDo.empty()) {
+        int const tileInd = toDo.back();
+        toDo.pop_back();
+        PointD const tileLbnd = tiles[tileInd].lbnd;
+        PointD const tileUbnd = tiles[tileInd].ubnd;
+        bool const isLinear = astLinearApprox(map.getRawPtr(), tileLbnd.data(), tileUbnd.data(), tol,
+                                              fit.data());
+        assertOK();
+        if (isLinear) {
+            tiles[tileInd].isLinear = true;
+            tiles[tileInd].fit = fit;
+            continue;
+        }
+        // split the tile in half along its longest axis, if it is long enough
+        int splitAxis = 0;
+        for (int k = 1; k < nIn; ++k) {
+            if (tileUbnd[k] - tileLbnd[k] > tileUbnd[splitAxis] - tileLbnd[splitAxis]) {
+                splitAxis = k;
+            }
+        }
+        if (tileUbnd[splitAxis] - tileLbnd[splitAxis] <= minSize) {
+            continue;
+        }
+        double const mid = 0.5 * (tileLbnd[splitAxis] + tileUbnd[splitAxis]);
+        PointD lowerUbnd = tileUbnd;
+        lowerUbnd[splitAxis] = mid;
+        PointD upperLbnd = tileLbnd;
+        upperLbnd[splitAxis] = mid;
+        int const lowerInd = static_cast<int>(tiles.size());
+        tiles.push_back(Tile{tileLbnd, lowerUbnd, {}, false, {}});
+        tiles.push_back(Tile{upperLbnd, tileUbnd, {}, false, {}});
+        tiles[tileInd].children = {lowerInd, lowerInd + 1};
+        toDo.push_back(lowerInd + 1);
+        toDo.push_back(lowerInd);
+    }
+}
+
+Array2D PiecewiseLinearApprox::applyForward(ConstArray2D const &from) const {
+    detail::assertEqual(from.getSize<0>(), "from.size[0]", static_cast<std::size_t>(nIn), "nIn");
+    int const nPts = from.getSize<1>();
+    Array2D to = ndarray::allocate(ndarray::makeVector(nOut, nPts));
+    double const nan = std::numeric_limits<double>::quiet_NaN();
+    for (int i = 0; i < nPts; ++i) {
+        int const tileInd = _findTile(from.getData() + i, from.getStride<0>());
+        if (tileInd < 0 || !tiles[tileInd].isLinear) {
+            for (int j = 0; j < nOut; ++j) {
+                to[j][i] = nan;
+            }
+            continue;
+        }
+        std::vector<double> const &fit = tiles[tileInd].fit;
+        for (int j = 0; j < nOut; ++j) {
+            double value = fit[j];
+            for (int k = 0; k < nIn; ++k) {
+                value += fit[nOut + j * nIn + k] * from[k][i];
+            }
+            to[j][i] = value;
+        }
+    }
+    return to;
+}
+
+int PiecewiseLinearApprox::findTile(PointD const &point) const {
+    detail::assertEqual(point.size(), "point.size", static_cast<std::size_t>(nIn), "nIn");
+    return _findTile(point.data(), 1);
+}
+
+int PiecewiseLinearApprox::_findTile(double const *point, int stride) const {
+    auto contains = [&](Tile const &tile) {
+        for (int k = 0; k < nIn; ++k) {
+            double const val = point[k * stride];
+            if (!(val >= tile.lbnd[k] && val <= tile.ubnd[k])) {
+                return false;
+            }
+        }
+        return true;
+    };
+    if (!contains(tiles[0])) {
+        return -1;
+    }
+    int tileInd = 0;
+    while (!tiles[tileInd].children.empty()) {
+        int const upperInd = tiles[tileInd].children[1];
+        tileInd = contains(tiles[upperInd]) ? upperInd : tiles[tileInd].children[0];
+    }
+    return tileInd;
+}
+
+}  // namespace ast
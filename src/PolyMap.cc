@@ -40,6 +40,48 @@ PolyMap::PolyMap(AstPolyMap *map) : Mapping(reinterpret_cast<AstMapping *>(map))
     }
 }
 
+Array2D PolyMap::getCoeffForward() const { return detail::polyCoeffsImpl(*this, true); }
+
+Array2D PolyMap::getCoeffInverse() const { return detail::polyCoeffsImpl(*this, false); }
+
+void PolyMap::jacobianImpl(ConstArray2D const &at, Array3D const &jac) const {
+    if (isInverted() || !hasForward()) {
+        Mapping::jacobianImpl(at, jac);
+        return;
+    }
+    auto const coeffs = detail::polyCoeffsImpl(*this, true);
+    if (coeffs.getSize<0>() == 0) {
+        Mapping::jacobianImpl(at, jac);
+        return;
+    }
+    detail::polyJacobian(coeffs, at, jac);
+}
+
+void PolyMap::tranImpl(int nPts, int nFromAxes, int fromDim, double const *from, bool doForward,
+                       int nToAxes, int toDim, double *to) const {
+    if (doForward && _nativeEval) {
+        if (auto plan = _getForwardPlan()) {
+            plan->apply(nPts, fromDim, from, toDim, to);
+            return;
+        }
+    }
+    Mapping::tranImpl(nPts, nFromAxes, fromDim, from, doForward, nToAxes, toDim, to);
+}
+
+std::shared_ptr<detail::PolyEvalPlan const> PolyMap::_getForwardPlan() const {
+    if (_forwardPlanStateId != getStateId()) {
+        _forwardPlan.reset();
+        if (!isInverted() && hasForward() && !getReport()) {
+            auto const coeffs = detail::polyCoeffsImpl(*this, true);
+            if (coeffs.getSize<0>() > 0) {
+                _forwardPlan = detail::PolyEvalPlan::make(coeffs, getNOut());
+            }
+        }
+        _forwardPlanStateId = getStateId();
+    }
+    return _forwardPlan;
+}
+
 /// Make a raw AstPolyMap with specified forward and inverse transforms.
 AstPolyMap *PolyMap::_makeRawPolyMap(ndarray::Array<double, 2, 2> const &coeff_f,
                                      ndarray::Array<double, 2, 2> const &coeff_i,
@@ -0,0 +1,290 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <sstream>
+#include <stdexcept>
+#include <vector>
+
+#include "astshim/detail/polyMapUtils.h"
+#include "astshim/detail/utils.h"
+#include "astshim/PolyMap.h"
+#include "astshim/PolyMapNewtonInverse.h"
+
+namespace ast {
+namespace {
+
+/*
+Number of points for which Newton steps are taken at once
+*/
+int const BATCH_SIZE = 64;
+
+/*
+Solve the linear system `a x = b` by Gaussian elimination with partial pivoting
+
+@param[in,out] a  The `n x n` matrix, in row major order; it is overwritten.
+@param[in,out] b  The right hand side, which is replaced by the solution.
+@param[in] n  Number of equations.
+@return false if `a` is singular, in which case `b` is garbage.
+*/
+bool solveLinear(std::vector<double> &a, std::vector<double> &b, int n) {
+    for (int col = 0; col < n; ++col) {
+        int pivot = col;
+        for (int row = col + 1; row < n; ++row) {
+            if (std::abs(a[row * n + col]) > std::abs(a[pivot * n + col])) {
+                pivot = row;
+            }
+        }
+        if (a[pivot * n + col] == 0.0 || !std::isfinite(a[pivot * n + col])) {
+            return false;
+        }
+        if (pivot != col) {
+            std::swap_ranges(a.begin() + pivot * n, a.begin() + (pivot + 1) * n, a.begin() + col * n);
+            std::swap(b[pivot], b[col]);
+        }
+        for (int row = col + 1; row < n; ++row) {
+            double const factor = a[row * n + col] / a[col * n + col];
+            for (int k = col; k < n; ++k) {
+                a[row * n + k] -= factor * a[col * n + k];
+            }
+            b[row] -= factor * b[col];
+        }
+    }
+    for (int row = n - 1; row >= 0; --row) {
+        double sum = b[row];
+        for (int k = row + 1; k < n; ++k) {
+            sum -= a[row * n + k] * b[k];
+        }
+        b[row] = sum / a[row * n + row];
+    }
+    return true;
+}
+
+}  // namespace
+
+PolyMapNewtonInverse::PolyMapNewtonInverse(PolyMap const &polyMap, std::vector<double> const &lbnd,
+                                           std::vector<double> const &ubnd, int maxOrder, double tol,
+                                           int maxIter)
+        : _nAxes(polyMap.getNIn()),
+          _tol(tol > 0 ? tol : polyMap.getTolInverse()),
+          _maxIter(maxIter),
+          _polyMap(),
+          _coeffs(),
+          _coarseMap(),
+          _linearOffset(_nAxes, 0.0),
+          _linearMatrix(_nAxes * _nAxes, 0.0),
+          _nPoints(0),
+          _nConverged(0),
+          _nIterations(0),
+          _maxIterationsUsed(0) {
+    if (polyMap.isInverted()) {
+        throw std::invalid_argument("polyMap is inverted");
+    }
+    detail::assertEqual(polyMap.getNOut(), "polyMap.getNOut()", _nAxes, "polyMap.getNIn()");
+    if (maxIter < 1) {
+        std::ostringstream os;
+        os << "maxIter = " << maxIter << " < 1";
+        throw std::invalid_argument(os.str());
+    }
+    if (polyMap.hasForward()) {
+        _coeffs = detail::polyCoeffsImpl(polyMap, true);
+    }
+    if (_coeffs.getSize<0>() == 0) {
+        throw std::invalid_argument("polyMap has no forward polynomial");
+    }
+    _polyMap = polyMap.copy();
+
+    // the constant and linear terms give the initial guess when there is nothing better
+    for (int c = 0, nCoeff = _coeffs.getSize<0>(); c < nCoeff; ++c) {
+        int const out = static_cast<int>(std::lround(_coeffs[c][1])) - 1;
+        int totalPower = 0;
+        int linearAxis = 0;
+        for (int k = 0; k < _nAxes; ++k) {
+            int const power = static_cast<int>(std::lround(_coeffs[c][2 + k]));
+            totalPower += power;
+            if (power == 1) {
+                linearAxis = k;
+            }
+        }
+        if (totalPower == 0) {
+            _linearOffset[out] += _coeffs[c][0];
+        } else if (totalPower == 1) {
+            _linearMatrix[out * _nAxes + linearAxis] += _coeffs[c][0];
+        }
+    }
+
+    if (!lbnd.empty() || !ubnd.empty()) {
+        detail::assertEqual(lbnd.size(), "lbnd.size", static_cast<std::size_t>(_nAxes), "nAxes");
+        detail::assertEqual(ubnd.size(), "ubnd.size", static_cast<std::size_t>(_nAxes), "nAxes");
+        double extent = 0;
+        for (int k = 0; k < _nAxes; ++k) {
+            extent = std::max(extent, ubnd[k] - lbnd[k]);
+        }
+        // the coarse inverse need only be good enough for Newton's method to converge quickly;
+        // use it as the forward transform of a new PolyMap, so it is evaluated natively
+        auto const fitted = polyMap.polyTran(false, 1.0e-3 * extent, extent, maxOrder, lbnd, ubnd);
+        auto const coarseCoeffs = detail::polyCoeffsImpl(fitted, false);
+        if (coarseCoeffs.getSize<0>() == 0) {
+            throw std::runtime_error("Could not fit a coarse inverse polynomial");
+        }
+        _coarseMap = std::make_shared<PolyMap>(coarseCoeffs, _nAxes);
+    }
+}
+
+Array2D PolyMapNewtonInverse::applyInverse(ConstArray2D const &to) {
+    int const n = _nAxes;
+    detail::assertEqual(to.getSize<0>(), "to.size[0]", static_cast<std::size_t>(n), "nAxes");
+    int const nPts = to.getSize<1>();
+    double const nan = std::numeric_limits<double>::quiet_NaN();
+    Array2D from = ndarray::allocate(ndarray::makeVector(n, nPts));
+    if (_coarseMap) {
+        _coarseMap->applyForward(to, from);
+    }
+
+    // the converged point with the highest index so far, and the Jacobian there, for warm starts
+    int anchorIndex = -1;
+    std::vector<double> anchorFrom(n), anchorTo(n), anchorJac(n * n);
+    std::vector<double> a(n * n), b(n);
+    std::vector<int> active;
+    std::vector<int> nIter(BATCH_SIZE);
+    for (int start = 0; start < nPts; start += BATCH_SIZE) {
+        int const end = std::min(start + BATCH_SIZE, nPts);
+
+        // pick the initial guess for each point of the batch
+        active.clear();
+        for (int i = start; i < end; ++i) {
+            nIter[i - start] = 0;
+            bool isFinite = true;
+            for (int k = 0; k < n; ++k) {
+                isFinite = isFinite && std::isfinite(to[k][i]);
+            }
+            if (!isFinite) {
+                for (int k = 0; k < n; ++k) {
+                    from[k][i] = nan;
+                }
+                continue;
+            }
+            bool haveGuess = false;
+            if (_coarseMap) {
+                haveGuess = true;
+                for (int k = 0; k < n; ++k) {
+                    haveGuess = haveGuess && std::isfinite(from[k][i]);
+                }
+            }
+            if (!haveGuess && anchorIndex >= 0) {
+                a = anchorJac;
+                for (int k = 0; k < n; ++k) {
+                    b[k] = to[k][i] - anchorTo[k];
+                }
+                if (solveLinear(a, b, n)) {
+                    for (int k = 0; k < n; ++k) {
+                        from[k][i] = anchorFrom[k] + b[k];
+                    }
+                    haveGuess = true;
+                }
+            }
+            if (!haveGuess) {
+                a = _linearMatrix;
+                for (int k = 0; k < n; ++k) {
+                    b[k] = to[k][i] - _linearOffset[k];
+                }
+                bool const isSolved = solveLinear(a, b, n);
+                for (int k = 0; k < n; ++k) {
+                    from[k][i] = isSolved ? b[k] : 0.0;
+                }
+            }
+            active.push_back(i);
+        }
+
+        // take Newton steps for all unconverged points of the batch at once
+        for (int iter = 0; iter < _maxIter && !active.empty(); ++iter) {
+            int const nActive = active.size();
+            Array2D at = ndarray::allocate(ndarray::makeVector(n, nActive));
+            for (int j = 0; j < nActive; ++j) {
+                for (int k = 0; k < n; ++k) {
+                    at[k][j] = from[k][active[j]];
+                }
+            }
+            Array2D const atTo = _polyMap->applyForward(at);
+            Array3D const jac = ndarray::allocate(ndarray::makeVector(nActive, n, n));
+            detail::polyJacobian(_coeffs, at, jac);
+            int nStillActive = 0;
+            for (int j = 0; j < nActive; ++j) {
+                int const i = active[j];
+                ++nIter[i - start];
+                for (int row = 0; row < n; ++row) {
+                    for (int col = 0; col < n; ++col) {
+                        a[row * n + col] = jac[j][row][col];
+                    }
+                    b[row] = to[row][i] - atTo[row][j];
+                }
+                bool isConverged = false;
+                bool isFailed = !solveLinear(a, b, n);
+                if (!isFailed) {
+                    double maxStep = 0;
+                    double maxCoord = 1;
+                    for (int k = 0; k < n; ++k) {
+                        from[k][i] += b[k];
+                        maxStep = std::max(maxStep, std::abs(b[k]));
+                        maxCoord = std::max(maxCoord, std::abs(from[k][i]));
+                    }
+                    isFailed = !std::isfinite(maxStep) || !std::isfinite(maxCoord);
+                    isConverged = maxStep <= _tol * maxCoord;
+                }
+                if (isFailed) {
+                    for (int k = 0; k < n; ++k) {
+                        from[k][i] = nan;
+                    }
+                } else if (isConverged) {
+                    ++_nConverged;
+                    if (i > anchorIndex) {
+                        anchorIndex = i;
+                        for (int row = 0; row < n; ++row) {
+                            anchorFrom[row] = from[row][i];
+                            anchorTo[row] = to[row][i];
+                            for (int col = 0; col < n; ++col) {
+                                anchorJac[row * n + col] = jac[j][row][col];
+                            }
+                        }
+                    }
+                } else {
+                    active[nStillActive++] = i;
+                }
+            }
+            active.resize(nStillActive);
+        }
+        for (int i : active) {
+            for (int k = 0; k < n; ++k) {
+                from[k][i] = nan;
+            }
+        }
+        for (int i = start; i < end; ++i) {
+            _nIterations += nIter[i - start];
+            _maxIterationsUsed = std::max(_maxIterationsUsed, nIter[i - start]);
+        }
+    }
+    _nPoints += nPts;
+    return from;
+}
+
+}  // namespace ast
@@ -0,0 +1,175 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+
+#include <cstdint>
+#include <cstdio>
+#include <exception>
+#include <fstream>
+#include <iomanip>
+#include <iterator>
+#include <memory>
+#include <random>
+#include <sstream>
+
+#include "astshim/detail/utils.h"
+#include "astshim/ChebyMap.h"
+#include "astshim/Mapping.h"
+#include "astshim/PolyMap.h"
+#include "astshim/PolyTranCache.h"
+
+namespace ast {
+namespace {
+
+/*
+Return a string describing the arguments of a call to polyTran, other than the mapping
+*/
+std::string makeArgs(bool forward, double acc, double maxacc, int maxorder, std::vector<double> const &lbnd,
+                     std::vector<double> const &ubnd) {
+    std::ostringstream os;
+    os << std::setprecision(17) << "forward=" << forward << " acc=" << acc << " maxacc=" << maxacc
+       << " maxorder=" << maxorder << " lbnd=";
+    for (auto val : lbnd) {
+        os << val << ",";
+    }
+    os << " ubnd=";
+    for (auto val : ubnd) {
+        os << val << ",";
+    }
+    return os.str();
+}
+
+/*
+Return the 64-bit FNV-1a hash of a string, formatted as 16 hexadecimal digits
+
+Unlike std::hash, this is the same for all compilers, so file names are portable.
+*/
+std::string hashString(std::string const &str) {
+    std::uint64_t const hash = detail::fnv1aHash(str.data(), str.size());
+    std::ostringstream os;
+    os << std::hex << std::setw(16) << std::setfill('0') << hash;
+    return os.str();
+}
+
+}  // namespace
+
+PolyTranCache::PolyTranCache(std::size_t maxEntries, std::string const &directory, std::size_t maxSize)
+        : _directory(directory), _cache(maxSize, maxEntries), _nHits(0), _nFileHits(0), _nMisses(0) {}
+
+std::shared_ptr<PolyMap> PolyTranCache::polyTran(PolyMap const &mapping, bool forward, double acc,
+                                                 double maxacc, int maxorder, std::vector<double> const &lbnd,
+                                                 std::vector<double> const &ubnd) {
+    return _polyTran(mapping, forward, acc, maxacc, maxorder, lbnd, ubnd);
+}
+
+std::shared_ptr<ChebyMap> PolyTranCache::polyTran(ChebyMap const &mapping, bool forward, double acc,
+                                                  double maxacc, int maxorder,
+                                                  std::vector<double> const &lbnd,
+                                                  std::vector<double> const &ubnd) {
+    return _polyTran(mapping, forward, acc, maxacc, maxorder, lbnd, ubnd);
+}
+
+std::shared_ptr<ChebyMap> PolyTranCache::polyTran(ChebyMap const &mapping, bool forward, double acc,
+                                                  double maxacc, int maxorder) {
+    // use the same bounds as ChebyMap::polyTran
+    auto const domain = mapping.getDomain(!forward);
+    return _polyTran(mapping, forward, acc, maxacc, maxorder, domain.lbnd, domain.ubnd);
+}
+
+void PolyTranCache::clear() { _cache.clear(); }
+
+template <typename MapT>
+std::shared_ptr<MapT> PolyTranCache::_polyTran(MapT const &mapping, bool forward, double acc, double maxacc,
+                                               int maxorder, std::vector<double> const &lbnd,
+                                               std::vector<double> const &ubnd) {
+    std::string const args = makeArgs(forward, acc, maxacc, maxorder, lbnd, ubnd);
+    auto cachedFitMap = _cache.find(mapping, args);
+    if (cachedFitMap) {
+        ++_nHits;
+        return std::static_pointer_cast<MapT>((*cachedFitMap)->copy());
+    }
+
+    // the key of a file is the arguments followed by the serialized mapping
+    std::string const key = _directory.empty() ? "" : args + "\n" + mapping.toString();
+    std::shared_ptr<Mapping> fitMap;
+    if (!_directory.empty()) {
+        fitMap = _readFile(key);
+        if (!std::dynamic_pointer_cast<MapT>(fitMap)) {
+            fitMap.reset();
+        }
+    }
+    if (fitMap) {
+        ++_nFileHits;
+    } else {
+        ++_nMisses;
+        fitMap = mapping.polyTran(forward, acc, maxacc, maxorder, lbnd, ubnd).copy();
+        if (!_directory.empty()) {
+            _writeFile(key, *fitMap);
+        }
+    }
+    _cache.insert(mapping, args, fitMap, fitMap->getObjSize());
+    return std::static_pointer_cast<MapT>(fitMap->copy());
+}
+
+std::shared_ptr<Mapping> PolyTranCache::_readFile(std::string const &key) const {
+    std::ifstream is(_getPath(key), std::ios::binary);
+    if (!is) {
+        return nullptr;
+    }
+    // the file holds the length of the key, a newline, the key and the serialized fit
+    std::size_t keySize = 0;
+    if (!(is >> keySize) || is.get() != '\n') {
+        return nullptr;
+    }
+    std::string const contents((std::istreambuf_iterator<char>(is)), std::istreambuf_iterator<char>());
+    if (contents.size() <= keySize || contents.compare(0, keySize, key) != 0) {
+        return nullptr;
+    }
+    try {
+        return std::dynamic_pointer_cast<Mapping>(Object::fromString(contents.substr(keySize)));
+    } catch (std::exception const &) {
+        return nullptr;
+    }
+}
+
+void PolyTranCache::_writeFile(std::string const &key, Mapping const &fitMap) const {
+    std::string const path = _getPath(key);
+    std::ostringstream tempPath;
+    tempPath << path << ".tmp" << std::hex << std::random_device()();
+    {
+        std::ofstream os(tempPath.str(), std::ios::binary);
+        os << key.size() << "\n" << key << fitMap.toString();
+        os.close();
+        if (!os) {
+            std::remove(tempPath.str().c_str());
+            return;
+        }
+    }
+    if (std::rename(tempPath.str().c_str(), path.c_str()) != 0) {
+        std::remove(tempPath.str().c_str());
+    }
+}
+
+std::string PolyTranCache::_getPath(std::string const &key) const {
+    return _directory + "/polyTran-" + hashString(key) + ".ast";
+}
+
+}  // namespace ast
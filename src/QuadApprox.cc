@@ -20,6 +20,11 @@
  * see <https://www.lsstcorp.org/LegalNotices/>.
  */
 
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <sstream>
+#include <stdexcept>
 #include <vector>
 
 #include "astshim/detail/utils.h"
@@ -42,4 +47,98 @@ QuadApprox::QuadApprox(Mapping const& map, std::vector<double> const& lbnd, std:
     }
 }
 
-}  // namespace ast
\ No newline at end of file
+namespace {
+
+/*
+Evaluate quadratic coefficients (in the format of QuadApprox.fit) for point `i` of `from`,
+putting the results into point `i` of `to`
+*/
+inline void evalQuad(std::vector<double> const& fit, ConstArray2D const& from, int i, Array2D const& to) {
+    double const x = from[0][i];
+    double const y = from[1][i];
+    for (int j = 0, nOut = to.getSize<0>(); j < nOut; ++j) {
+        double const* a = &fit[6 * j];
+        to[j][i] = a[0] + x * (a[1] + a[3] * y + a[4] * x) + y * (a[2] + a[5] * y);
+    }
+}
+
+}  // namespace
+
+Array2D QuadApprox::applyForward(ConstArray2D const& from) const {
+    detail::assertEqual(from.getSize<0>(), "from.size[0]", static_cast<std::size_t>(2), "nIn");
+    int const nPts = from.getSize<1>();
+    Array2D to = ndarray::allocate(ndarray::makeVector(getNOut(), nPts));
+    for (int i = 0; i < nPts; ++i) {
+        evalQuad(fit, from, i, to);
+    }
+    return to;
+}
+
+TiledQuadApprox::TiledQuadApprox(Mapping const& map, std::vector<double> const& lbnd,
+                                 std::vector<double> const& ubnd, int nxTiles, int nyTiles, int nx, int ny)
+        : lbnd(lbnd), ubnd(ubnd), nxTiles(nxTiles), nyTiles(nyTiles), tiles(), maxRms(0) {
+    detail::assertEqual(map.getNIn(), "map.getNIn()", 2, "required nIn");
+    detail::assertEqual(lbnd.size(), "lbnd.size", static_cast<std::size_t>(2), "nIn");
+    detail::assertEqual(ubnd.size(), "ubnd.size", static_cast<std::size_t>(2), "nIn");
+    for (int k = 0; k < 2; ++k) {
+        if (!(ubnd[k] > lbnd[k])) {
+            std::ostringstream os;
+            os << "ubnd[" << k << "] = " << ubnd[k] << " <= lbnd[" << k << "] = " << lbnd[k];
+            throw std::invalid_argument(os.str());
+        }
+    }
+    if (nxTiles < 1 || nyTiles < 1) {
+        std::ostringstream os;
+        os << "nxTiles = " << nxTiles << " and nyTiles = " << nyTiles << " must both be positive";
+        throw std::invalid_argument(os.str());
+    }
+    double const xTileSize = (ubnd[0] - lbnd[0]) / nxTiles;
+    double const yTileSize = (ubnd[1] - lbnd[1]) / nyTiles;
+    tiles.reserve(nxTiles * nyTiles);
+    for (int iy = 0; iy < nyTiles; ++iy) {
+        for (int ix = 0; ix < nxTiles; ++ix) {
+            // compute the edges the same way for adjacent tiles, so the tiles exactly cover the box
+            std::vector<double> tileLbnd = {lbnd[0] + ix * xTileSize, lbnd[1] + iy * yTileSize};
+            std::vector<double> tileUbnd = {ix + 1 == nxTiles ? ubnd[0] : lbnd[0] + (ix + 1) * xTileSize,
+                                            iy + 1 == nyTiles ? ubnd[1] : lbnd[1] + (iy + 1) * yTileSize};
+            tiles.emplace_back(map, tileLbnd, tileUbnd, nx, ny);
+            maxRms = std::max(maxRms, tiles.back().rms);
+        }
+    }
+}
+
+Array2D TiledQuadApprox::applyForward(ConstArray2D const& from) const {
+    detail::assertEqual(from.getSize<0>(), "from.size[0]", static_cast<std::size_t>(2), "nIn");
+    int const nPts = from.getSize<1>();
+    int const nOut = tiles.front().getNOut();
+    Array2D to = ndarray::allocate(ndarray::makeVector(nOut, nPts));
+    double const xScale = nxTiles / (ubnd[0] - lbnd[0]);
+    double const yScale = nyTiles / (ubnd[1] - lbnd[1]);
+    for (int i = 0; i < nPts; ++i) {
+        double const x = from[0][i];
+        double const y = from[1][i];
+        if (!(x >= lbnd[0] && x <= ubnd[0] && y >= lbnd[1] && y <= ubnd[1])) {
+            for (int j = 0; j < nOut; ++j) {
+                to[j][i] = std::numeric_limits<double>::quiet_NaN();
+            }
+            continue;
+        }
+        // points on the upper edge of the box belong to the last tile
+        int const ix = std::min(static_cast<int>((x - lbnd[0]) * xScale), nxTiles - 1);
+        int const iy = std::min(static_cast<int>((y - lbnd[1]) * yScale), nyTiles - 1);
+        evalQuad(tiles[iy * nxTiles + ix].fit, from, i, to);
+    }
+    return to;
+}
+
+QuadApprox const& TiledQuadApprox::getTile(int ix, int iy) const {
+    if (ix < 0 || ix >= nxTiles || iy < 0 || iy >= nyTiles) {
+        std::ostringstream os;
+        os << "tile (" << ix << ", " << iy << ") not in range [0, " << nxTiles << ") x [0, " << nyTiles
+           << ")";
+        throw std::out_of_range(os.str());
+    }
+    return tiles[iy * nxTiles + ix];
+}
+
+}  // namespace ast
@@ -0,0 +1,48 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+
+#include <memory>
+
+#include "astshim/Mapping.h"
+#include "astshim/SimplifyCache.h"
+
+namespace ast {
+
+SimplifyCache::SimplifyCache(std::size_t maxSize) : _cache(maxSize), _nHits(0), _nMisses(0) {}
+
+std::shared_ptr<Mapping> SimplifyCache::simplify(Mapping const &mapping) {
+    auto entry = _cache.find(mapping, "");
+    // a cached simplified mapping that has been modified since it was cached must be replaced
+    if (entry && (entry->simpMap->getStateId() == entry->simpStateId)) {
+        ++_nHits;
+        return entry->simpMap;
+    }
+
+    ++_nMisses;
+    auto simpMap = mapping.simplify();
+    _cache.insert(mapping, "", Entry{simpMap, simpMap->getStateId()}, simpMap->getObjSize());
+    return simpMap;
+}
+
+void SimplifyCache::clear() { _cache.clear(); }
+
+}  // namespace ast
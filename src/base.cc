@@ -8,10 +8,17 @@
 namespace ast {
 namespace {
 
-static std::ostringstream errorMsgStream;
+/*
+Error messages reported by AST for the calling thread
+
+Each thread has its own buffer, so that threads reporting errors at the same time
+do not mix up each other's messages. AST's status is also per-thread (if AST was built
+with POSIX thread support), so a failure in one thread does not affect another.
+*/
+thread_local std::ostringstream errorMsgStream;
 
 /*
-Write an error message to `errorMsgStream`
+Write an error message to `errorMsgStream` for the calling thread
 
 Intended to be registered as an error handler to AST by calling `astSetPutErr(reportError)`.
 */
@@ -29,6 +36,9 @@ public:
     ErrorHandler &operator=(ErrorHandler const &) = delete;
     ErrorHandler &operator=(ErrorHandler &&) = delete;
 
+    /*
+    Return and clear the error message for the calling thread, and clear the thread's AST status
+    */
     static std::string getErrMsg() {
         auto errMsg = errorMsgStream.str();
         // clear status bits
@@ -48,7 +58,8 @@ public:
 
 void assertOK(AstObject *rawPtr1, AstObject *rawPtr2) {
     // Construct ErrorHandler once, the first time this function is called.
-    // This is done to initialize `errorMsgStream` and register `reportError` as the AST error handler.
+    // This is done to register `reportError` as the AST error handler;
+    // initialization of function-local statics is thread safe.
     // See https://isocpp.org/wiki/faq/ctors#static-init-order-on-first-use
     static ErrorHandler *errHandler = new ErrorHandler();
     if (!astOK) {
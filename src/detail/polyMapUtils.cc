@@ -19,12 +19,82 @@
  * the GNU General Public License along with this program.  If not,
  * see <https://www.lsstcorp.org/LegalNotices/>.
  */
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <sstream>
+#include <utility>
+#include <vector>
+
 #include "astshim/detail/polyMapUtils.h"
 #include "astshim/ChebyMap.h"
 #include "astshim/PolyMap.h"
 
 namespace ast {
 namespace detail {
+namespace {
+
+/*
+Number of points evaluated at a time by PolyEvalPlan::apply; small enough that the intermediate results
+for all inputs stay in cache
+*/
+int const PLAN_BLOCK_SIZE = 256;
+
+/*
+Decoded PolyMap or ChebyMap coefficients, for evaluating derivatives
+*/
+struct DecodedCoeffs {
+    /*
+    Decode a `ncoeff x (2 + nIn)` array of coefficients
+    */
+    DecodedCoeffs(ConstArray2D const &coeffs, int nIn)
+            : nCoeff(coeffs.getSize<0>()), nIn(nIn), values(nCoeff), outInds(nCoeff), orders(nCoeff * nIn) {
+        maxOrder = 0;
+        for (int c = 0; c < nCoeff; ++c) {
+            values[c] = coeffs[c][0];
+            outInds[c] = static_cast<int>(std::lround(coeffs[c][1])) - 1;
+            for (int k = 0; k < nIn; ++k) {
+                int const order = static_cast<int>(std::lround(coeffs[c][2 + k]));
+                orders[c * nIn + k] = order;
+                maxOrder = std::max(maxOrder, order);
+            }
+        }
+    }
+
+    /*
+    Add the derivatives at one point to `jac[pt]`, given tables of the basis functions and their
+    derivatives for each input axis: `basis[k * (maxOrder + 1) + n]` is the value of the order `n`
+    basis function for input axis `k`, and `dBasis` is its derivative.
+    */
+    template <typename JacRow>
+    void addDerivs(std::vector<double> const &basis, std::vector<double> const &dBasis, JacRow jacRow) const {
+        int const stride = maxOrder + 1;
+        for (int c = 0; c < nCoeff; ++c) {
+            int const *cOrders = &orders[c * nIn];
+            for (int k = 0; k < nIn; ++k) {
+                if (cOrders[k] == 0) {
+                    continue;
+                }
+                double term = values[c] * dBasis[k * stride + cOrders[k]];
+                for (int m = 0; m < nIn; ++m) {
+                    if (m != k) {
+                        term *= basis[m * stride + cOrders[m]];
+                    }
+                }
+                jacRow[outInds[c]][k] += term;
+            }
+        }
+    }
+
+    int nCoeff;
+    int nIn;
+    std::vector<double> values;  // coefficient values
+    std::vector<int> outInds;    // output index of each coefficient, starting from 0
+    std::vector<int> orders;     // power or Chebyshev order of each input: orders[c * nIn + k]
+    int maxOrder;                // maximum power or order of any input
+};
+
+}  // namespace
 
 template <class AstMapT, class MapT>
 AstMapT *polyTranImpl(MapT const &mapping, bool forward, double acc, double maxacc, int maxorder,
@@ -56,11 +126,371 @@ AstMapT *polyTranImpl(MapT const &mapping, bool forward, double acc, double maxa
     return reinterpret_cast<AstMapT *>(outRawMap);
 }
 
+template <class MapT>
+Array2D polyCoeffsImpl(MapT const &mapping, bool forward) {
+    if (mapping.isInverted()) {
+        // ask an uninverted copy for the coefficients of the other direction, so the result
+        // does not depend on whether astPolyCoeffs takes account of the Invert attribute
+        auto const uninverted = std::dynamic_pointer_cast<MapT>(mapping.getInverse());
+        return polyCoeffsImpl(*uninverted, !forward);
+    }
+    int const rowLen = 2 + (forward ? mapping.getNIn() : mapping.getNOut());
+    // find the number of coefficients, then get them
+    int nCoeff = 0;
+    astPolyCoeffs(mapping.getRawPtr(), static_cast<int>(forward), 0, nullptr, &nCoeff);
+    assertOK();
+    Array2D coeffs = ndarray::allocate(ndarray::makeVector(nCoeff, rowLen));
+    if (nCoeff > 0) {
+        astPolyCoeffs(mapping.getRawPtr(), static_cast<int>(forward), nCoeff * rowLen, coeffs.getData(),
+                      &nCoeff);
+        assertOK();
+    }
+    return coeffs;
+}
+
+void polyJacobian(ConstArray2D const &coeffs, ConstArray2D const &at, Array3D const &jac) {
+    int const nIn = at.getSize<0>();
+    int const nPts = at.getSize<1>();
+    DecodedCoeffs const decoded(coeffs, nIn);
+    int const stride = decoded.maxOrder + 1;
+    // powers of each input and their derivatives at one point
+    std::vector<double> powers(nIn * stride);
+    std::vector<double> dPowers(nIn * stride);
+    jac.deep() = 0.0;
+    for (int i = 0; i < nPts; ++i) {
+        bool isBad = false;
+        for (int k = 0; k < nIn; ++k) {
+            double const x = at[k][i];
+            isBad = isBad || std::isnan(x);
+            double *kPowers = &powers[k * stride];
+            double *kdPowers = &dPowers[k * stride];
+            kPowers[0] = 1.0;
+            kdPowers[0] = 0.0;
+            for (int n = 1; n < stride; ++n) {
+                kPowers[n] = kPowers[n - 1] * x;
+                kdPowers[n] = n * kPowers[n - 1];
+            }
+        }
+        if (isBad) {
+            jac[i].deep() = std::numeric_limits<double>::quiet_NaN();
+            continue;
+        }
+        decoded.addDerivs(powers, dPowers, jac[i]);
+    }
+}
+
+void chebyJacobian(ConstArray2D const &coeffs, std::vector<double> const &lbnd,
+                   std::vector<double> const &ubnd, ConstArray2D const &at, Array3D const &jac) {
+    int const nIn = at.getSize<0>();
+    int const nPts = at.getSize<1>();
+    DecodedCoeffs const decoded(coeffs, nIn);
+    int const stride = decoded.maxOrder + 1;
+    // Chebyshev polynomials of each normalized input and their derivatives with respect to the input
+    std::vector<double> cheby(nIn * stride);
+    std::vector<double> dCheby(nIn * stride);
+    jac.deep() = 0.0;
+    for (int i = 0; i < nPts; ++i) {
+        bool isBad = false;
+        for (int k = 0; k < nIn; ++k) {
+            double const x = at[k][i];
+            // the transform is only defined within the domain
+            isBad = isBad || !(x >= lbnd[k] && x <= ubnd[k]);
+            double const scale = 2.0 / (ubnd[k] - lbnd[k]);
+            double const xn = (2.0 * x - (ubnd[k] + lbnd[k])) / (ubnd[k] - lbnd[k]);
+            double *kCheby = &cheby[k * stride];
+            double *kdCheby = &dCheby[k * stride];
+            kCheby[0] = 1.0;
+            kdCheby[0] = 0.0;
+            if (stride > 1) {
+                kCheby[1] = xn;
+                kdCheby[1] = scale;
+            }
+            // T(n+1) = 2 xn T(n) - T(n-1), so T'(n+1) = 2 T(n) scale + 2 xn T'(n) - T'(n-1)
+            for (int n = 1; n + 1 < stride; ++n) {
+                kCheby[n + 1] = 2.0 * xn * kCheby[n] - kCheby[n - 1];
+                kdCheby[n + 1] = 2.0 * kCheby[n] * scale + 2.0 * xn * kdCheby[n] - kdCheby[n - 1];
+            }
+        }
+        if (isBad) {
+            jac[i].deep() = std::numeric_limits<double>::quiet_NaN();
+            continue;
+        }
+        decoded.addDerivs(cheby, dCheby, jac[i]);
+    }
+}
+
+void chebyGrid(ConstArray2D const &coeffs, std::vector<double> const &lbnd, std::vector<double> const &ubnd,
+               std::vector<std::vector<bool>> const &inDomain, PointI const &gridLbnd,
+               PointI const &gridUbnd, Array2D const &to) {
+    int const nIn = gridLbnd.size();
+    int const nOut = to.getSize<0>();
+    DecodedCoeffs const decoded(coeffs, nIn);
+    int const nCoeff = decoded.nCoeff;
+
+    // size of the grid along each axis, and the total number of grid points
+    std::vector<int> gridDims(nIn);
+    int gridSize = 1;
+    for (int k = 0; k < nIn; ++k) {
+        gridDims[k] = gridUbnd[k] - gridLbnd[k] + 1;
+        gridSize *= gridDims[k];
+    }
+
+    // number of Chebyshev polynomials needed for each output and axis: outDims[j * nIn + k];
+    // an output only depends on the axes for which this is more than 1, so (as for the transform)
+    // it is only bad at points where one of those axes is outside the domain
+    std::vector<int> outDims(nOut * nIn, 1);
+    for (int c = 0; c < nCoeff; ++c) {
+        for (int k = 0; k < nIn; ++k) {
+            int &dim = outDims[decoded.outInds[c] * nIn + k];
+            dim = std::max(dim, decoded.orders[c * nIn + k] + 1);
+        }
+    }
+    // number of Chebyshev polynomials needed for each axis by any output
+    std::vector<int> dims(nIn, 1);
+    for (int j = 0; j < nOut; ++j) {
+        for (int k = 0; k < nIn; ++k) {
+            dims[k] = std::max(dims[k], outDims[j * nIn + k]);
+        }
+    }
+
+    // normalized coordinates of each grid line
+    std::vector<std::vector<double>> xn(nIn);
+    for (int k = 0; k < nIn; ++k) {
+        for (int i = 0; i < gridDims[k]; ++i) {
+            double const x = gridLbnd[k] + i;
+            xn[k].push_back((2.0 * x - (ubnd[k] + lbnd[k])) / (ubnd[k] - lbnd[k]));
+        }
+    }
+    // tables of the Chebyshev polynomials along each axis but the first: cheby[k][i * dims[k] + n] = T_n(xn)
+    std::vector<std::vector<double>> cheby(nIn);
+    for (int k = 1; k < nIn; ++k) {
+        cheby[k].resize(gridDims[k] * dims[k]);
+        for (int i = 0; i < gridDims[k]; ++i) {
+            double *kCheby = &cheby[k][i * dims[k]];
+            kCheby[0] = 1.0;
+            if (dims[k] > 1) {
+                kCheby[1] = xn[k][i];
+            }
+            for (int n = 1; n + 1 < dims[k]; ++n) {
+                kCheby[n + 1] = 2.0 * xn[k][i] * kCheby[n] - kCheby[n - 1];
+            }
+        }
+    }
+
+    // work[k] holds the coefficients for axes [0, k] after contracting the axes above k
+    std::vector<std::vector<double>> work(nIn);
+    std::vector<int> strides(nIn + 1);
+    for (int j = 0; j < nOut; ++j) {
+        int const *jDims = &outDims[j * nIn];
+        // the stride of each axis in the dense coefficient arrays of this output (the first is fastest)
+        strides[0] = 1;
+        for (int k = 0; k < nIn; ++k) {
+            strides[k + 1] = strides[k] * jDims[k];
+            work[k].resize(strides[k + 1]);
+        }
+        double *toData = to[j].getData();
+        auto &top = work[nIn - 1];
+        std::fill(top.begin(), top.end(), 0.0);
+        for (int c = 0; c < nCoeff; ++c) {
+            if (decoded.outInds[c] == j) {
+                int index = 0;
+                for (int k = 0; k < nIn; ++k) {
+                    index += decoded.orders[c * nIn + k] * strides[k];
+                }
+                top[index] += decoded.values[c];
+            }
+        }
+
+        // visit each line of the grid along the first axis, contracting the coefficients
+        // with the Chebyshev polynomials for each outer axis only when its index changes
+        std::vector<int> ind(nIn, 0);
+        int contracted = nIn;  // work[k] is valid for ind[k + 1...] for k >= contracted - 1
+        for (int lineStart = 0; lineStart < gridSize; lineStart += gridDims[0]) {
+            bool lineGood = true;
+            for (int k = 1; k < nIn; ++k) {
+                lineGood = lineGood && (jDims[k] == 1 || inDomain[k][ind[k]]);
+            }
+            if (lineGood) {
+                for (int k = contracted - 1; k >= 1; --k) {
+                    double const *chebyRow = &cheby[k][ind[k] * dims[k]];
+                    double const *src = work[k].data();
+                    double *dest = work[k - 1].data();
+                    int const sliceSize = strides[k];
+                    std::fill(dest, dest + sliceSize, 0.0);
+                    for (int n = 0; n < jDims[k]; ++n) {
+                        double const tn = chebyRow[n];
+                        double const *srcSlice = src + n * sliceSize;
+                        for (int m = 0; m < sliceSize; ++m) {
+                            dest[m] += tn * srcSlice[m];
+                        }
+                    }
+                }
+                contracted = 1;
+                // evaluate the 1-d polynomial in the first axis by Clenshaw's recurrence
+                double const *a = work[0].data();
+                for (int i = 0; i < gridDims[0]; ++i) {
+                    if (jDims[0] > 1 && !inDomain[0][i]) {
+                        toData[lineStart + i] = AST__BAD;
+                        continue;
+                    }
+                    double const x = xn[0][i];
+                    double b1 = 0.0;
+                    double b2 = 0.0;
+                    for (int n = jDims[0] - 1; n >= 1; --n) {
+                        double const b0 = a[n] + 2.0 * x * b1 - b2;
+                        b2 = b1;
+                        b1 = b0;
+                    }
+                    toData[lineStart + i] = a[0] + x * b1 - b2;
+                }
+            } else {
+                std::fill(toData + lineStart, toData + lineStart + gridDims[0], AST__BAD);
+            }
+            // advance to the next line; the outermost axis that changes must be contracted again
+            for (int k = 1; k < nIn; ++k) {
+                if (++ind[k] < gridDims[k]) {
+                    contracted = std::max(contracted, k + 1);
+                    break;
+                }
+                ind[k] = 0;
+            }
+        }
+    }
+}
+
+std::shared_ptr<PolyEvalPlan const> PolyEvalPlan::make(ConstArray2D const &coeffs, int nOut) {
+    int const nCoeff = coeffs.getSize<0>();
+    int const nIn = coeffs.getSize<1>() - 2;
+    DecodedCoeffs const decoded(coeffs, nIn);
+    // AST makes an output with a bad coefficient bad everywhere; leave that to AST
+    if (std::find(decoded.values.begin(), decoded.values.end(), AST__BAD) != decoded.values.end()) {
+        return nullptr;
+    }
+    std::vector<Output> outputs(nOut);
+    for (int j = 0; j < nOut; ++j) {
+        auto &output = outputs[j];
+        output.dims.assign(nIn, 1);
+        int nTerms = 0;
+        for (int c = 0; c < nCoeff; ++c) {
+            if (decoded.outInds[c] != j) {
+                continue;
+            }
+            ++nTerms;
+            for (int k = 0; k < nIn; ++k) {
+                output.dims[k] = std::max(output.dims[k], decoded.orders[c * nIn + k] + 1);
+            }
+        }
+        // a total-order polynomial in two inputs fills about half of the dense array;
+        // many more zeros than that means evaluating the terms one at a time is faster
+        output.strides.resize(nIn);
+        long long size = 1;
+        for (int k = 0; k < nIn; ++k) {
+            output.strides[k] = static_cast<int>(size);
+            size *= output.dims[k];
+            if (size > 8LL * nTerms + 64) {
+                return nullptr;
+            }
+        }
+        output.coeffs.assign(size, 0.0);
+        for (int c = 0; c < nCoeff; ++c) {
+            if (decoded.outInds[c] != j) {
+                continue;
+            }
+            int index = 0;
+            for (int k = 0; k < nIn; ++k) {
+                index += decoded.orders[c * nIn + k] * output.strides[k];
+            }
+            output.coeffs[index] += decoded.values[c];
+        }
+        output.nonZero.resize(std::max(nIn - 1, 0));
+        for (int k = 0; k < nIn - 1; ++k) {
+            int const sliceSize = output.strides[k + 1];
+            for (int start = 0; start < size; start += sliceSize) {
+                output.nonZero[k].push_back(std::any_of(output.coeffs.begin() + start,
+                                                        output.coeffs.begin() + start + sliceSize,
+                                                        [](double val) { return val != 0.0; }));
+            }
+        }
+    }
+    return std::shared_ptr<PolyEvalPlan const>(new PolyEvalPlan(nIn, std::move(outputs)));
+}
+
+void PolyEvalPlan::apply(int nPts, int fromDim, double const *from, int toDim, double *to) const {
+    int const nOut = getNOut();
+    std::vector<std::vector<double>> acc(_nIn, std::vector<double>(PLAN_BLOCK_SIZE));
+    std::vector<double const *> x(_nIn);
+    for (int start = 0; start < nPts; start += PLAN_BLOCK_SIZE) {
+        int const nBlockPts = std::min(PLAN_BLOCK_SIZE, nPts - start);
+        for (int k = 0; k < _nIn; ++k) {
+            x[k] = from + k * static_cast<std::ptrdiff_t>(fromDim) + start;
+        }
+        for (int j = 0; j < nOut; ++j) {
+            auto const &output = _outputs[j];
+            _evalSlice(output, _nIn - 1, 0, nBlockPts, x.data(), acc);
+            double *toPtr = to + j * static_cast<std::ptrdiff_t>(toDim) + start;
+            std::copy(acc[_nIn - 1].begin(), acc[_nIn - 1].begin() + nBlockPts, toPtr);
+            // as for AST, an output is bad if one of its terms uses a bad input with a power > 0;
+            // treat nan as bad, too (AST would produce nan, which is the same once converted)
+            for (int k = 0; k < _nIn; ++k) {
+                if (output.dims[k] == 1) {
+                    continue;
+                }
+                for (int i = 0; i < nBlockPts; ++i) {
+                    if (x[k][i] == AST__BAD || std::isnan(x[k][i])) {
+                        toPtr[i] = AST__BAD;
+                    }
+                }
+            }
+        }
+    }
+}
+
+void PolyEvalPlan::_evalSlice(Output const &output, int axis, int offset, int nPts, double const *const *x,
+                              std::vector<std::vector<double>> &acc) const {
+    double *res = acc[axis].data();
+    double const *xAxis = x[axis];
+    int const dim = output.dims[axis];
+    if (axis == 0) {
+        double const *c = output.coeffs.data() + offset;
+        for (int i = 0; i < nPts; ++i) {
+            res[i] = c[dim - 1];
+        }
+        for (int p = dim - 2; p >= 0; --p) {
+            double const cp = c[p];
+            for (int i = 0; i < nPts; ++i) {
+                res[i] = res[i] * xAxis[i] + cp;
+            }
+        }
+        return;
+    }
+    double const *sub = acc[axis - 1].data();
+    int const stride = output.strides[axis];
+    std::fill(res, res + nPts, 0.0);
+    bool isZero = true;  // is `res` still all zero?
+    for (int p = dim - 1; p >= 0; --p) {
+        if (!isZero) {
+            for (int i = 0; i < nPts; ++i) {
+                res[i] *= xAxis[i];
+            }
+        }
+        int const subOffset = offset + p * stride;
+        if (output.nonZero[axis - 1][subOffset / stride]) {
+            _evalSlice(output, axis - 1, subOffset, nPts, x, acc);
+            for (int i = 0; i < nPts; ++i) {
+                res[i] += sub[i];
+            }
+            isZero = false;
+        }
+    }
+}
+
 // Explicit instantiations
 template AstChebyMap *polyTranImpl<AstChebyMap>(ChebyMap const &, bool, double, double, int,
                                                 std::vector<double> const &, std::vector<double> const &);
 template AstPolyMap *polyTranImpl<AstPolyMap>(PolyMap const &, bool, double, double, int,
                                               std::vector<double> const &, std::vector<double> const &);
+template Array2D polyCoeffsImpl(ChebyMap const &, bool);
+template Array2D polyCoeffsImpl(PolyMap const &, bool);
 
 }  // namespace detail
 }  // namespace ast
\ No newline at end of file
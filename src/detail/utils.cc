@@ -25,13 +25,8 @@ namespace ast {
 namespace detail {
 
 void astBadToNan(ast::Array2D const &arr) {
-    for (auto i = arr.begin(); i != arr.end(); ++i) {
-        for (auto j = i->begin(); j != i->end(); ++j) {
-            if (*j == AST__BAD) {
-                *j = std::numeric_limits<double>::quiet_NaN();
-            }
-        }
-    }
+    // Array2D is contiguous, so process it as one flat block
+    astBadToNan(arr.getData(), arr.getNumElements());
 }
 
 std::string getClassName(AstObject const *rawObj) {
@@ -0,0 +1,45 @@
+/*
+ * LSST Data Management System
+ * Copyright 2017 AURA/LSST.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+
+#include "astshim/Mapping.h"
+#include "astshim/detail/workerThreads.h"
+
+namespace ast {
+namespace detail {
+
+std::vector<std::shared_ptr<Mapping>> makeWorkerMappings(Mapping const &mapping, int nCopies) {
+    std::vector<std::shared_ptr<Mapping>> workerMaps;
+    workerMaps.reserve(nCopies);
+    for (int i = 0; i < nCopies; ++i) {
+        std::shared_ptr<Mapping> copy = mapping.copy();
+        copy->unlock();
+        // lock the copy again before freeing it, since only a thread that has it locked may free it
+        workerMaps.emplace_back(copy.get(), [copy](Mapping *workerMap) mutable {
+            workerMap->lock(true);
+            copy.reset();
+        });
+    }
+    return workerMaps;
+}
+
+}  // namespace detail
+}  // namespace ast
@@ -2,7 +2,7 @@ from __future__ import absolute_import, division, print_function
 import unittest
 
 import numpy as np
-from numpy.polynomial.chebyshev import chebval, chebval2d
+from numpy.polynomial.chebyshev import chebder, chebval, chebval2d
 import numpy.testing as npt
 
 import astshim
@@ -345,7 +345,7 @@ class TestChebyMap(MappingTestCase):
 
         # fit an inverse transform
         chebyMap2 = chebyMap1.polyTran(forward=False, acc=0.0001, maxacc=0.001, maxorder=6,
-                                       lbnd = lbnd_f, ubnd=ubnd_f)
+                                       lbnd=lbnd_f, ubnd=ubnd_f)
         self.assertTrue(chebyMap2.hasForward)
         self.assertTrue(chebyMap2.hasInverse)
         # forward should be identical to the original
@@ -418,7 +418,7 @@ class TestChebyMap(MappingTestCase):
 
         with self.assertRaises(RuntimeError):
             chebyMap1.polyTran(forward=False, acc=0.0001, maxacc=0.001, maxorder=6,
-                               lbnd = lbnd_f, ubnd=ubnd_f)
+                               lbnd=lbnd_f, ubnd=ubnd_f)
 
     def test_chebyGetDomain(self):
         """Test ChebyMap.getDomain's ability to estimate values
@@ -455,6 +455,126 @@ class TestChebyMap(MappingTestCase):
         npt.assert_allclose(domain.lbnd, pred_lbnd, atol=0.0001)
         npt.assert_allclose(domain.ubnd, pred_ubnd, atol=0.0001)
 
+    def test_ChebyMapJacobian(self):
+        """Test ChebyMap.jacobian, which is computed from the coefficients
+        """
+        lbnd_f = [-2.0, -2.5]
+        ubnd_f = [1.5, 2.5]
+        # y1 = 1.2 T2(x1') T0(x2') - 0.5 T1(x1') T1(x2') + 0.3 T3(x1') T2(x2')
+        # y2 = 1.0 T0(x1') T1(x2')
+        coeff_f = np.array([
+            [1.2, 1, 2, 0],
+            [-0.5, 1, 1, 1],
+            [0.3, 1, 3, 2],
+            [1.0, 2, 0, 1],
+        ])
+        c1 = np.zeros((4, 3))
+        c1[2, 0] = 1.2
+        c1[1, 1] = -0.5
+        c1[3, 2] = 0.3
+        c2 = np.zeros((4, 3))
+        c2[0, 1] = 1.0
+        # d(normalized x)/dx for each axis
+        scale = 2.0 / (np.array(ubnd_f) - np.array(lbnd_f))
+
+        cm = astshim.ChebyMap(coeff_f, 2, lbnd_f, ubnd_f)
+        indata = np.array([
+            [-2.0, -0.5, 0.5, 1.5, 3.0],
+            [-2.5, 1.5, 0.5, 2.5, 0.0],
+        ])
+        jacArr = cm.jacobian(indata)
+        self.assertEqual(jacArr.shape, (5, 2, 2))
+        normIndata = normalize(indata, lbnd_f, ubnd_f)
+        for (x1, x2), jac in zip(normIndata.T[0:4], jacArr[0:4]):
+            predJac = [
+                [chebval2d(x1, x2, chebder(c, axis=axis)) * scale[axis] for axis in range(2)]
+                for c in (c1, c2)
+            ]
+            npt.assert_allclose(jac, predJac, atol=1e-13)
+        # the last point is outside the domain
+        self.assertTrue(np.all(np.isnan(jacArr[4])))
+
+    def test_ChebyMapTranGrid(self):
+        """Test ChebyMap.tranGridForward, which is computed from the coefficients
+        """
+        lbnd_f = [-2.0, -2.5]
+        ubnd_f = [1.5, 2.5]
+        coeff_f = np.array([
+            [1.2, 1, 2, 0],
+            [-0.5, 1, 1, 1],
+            [0.3, 1, 3, 2],
+            [1.0, 2, 0, 1],
+            [0.7, 2, 0, 0],
+        ])
+        cm = astshim.ChebyMap(coeff_f, 2, lbnd_f, ubnd_f)
+
+        # the grid extends beyond the domain on all sides
+        lbnd = [-3, -4]
+        ubnd = [2, 3]
+        yGrid, xGrid = np.mgrid[lbnd[1]:ubnd[1] + 1, lbnd[0]:ubnd[0] + 1]
+        gridPoints = np.array([xGrid.flatten(), yGrid.flatten()], dtype=float)
+        predOutdata = cm.applyForward(gridPoints)
+        # each output is bad only where an axis it depends on is outside the domain;
+        # output 2 does not depend on x1
+        outside1 = (gridPoints[0] < lbnd_f[0]) | (gridPoints[0] > ubnd_f[0])
+        outside2 = (gridPoints[1] < lbnd_f[1]) | (gridPoints[1] > ubnd_f[1])
+        npt.assert_array_equal(np.isnan(predOutdata[0]), outside1 | outside2)
+        npt.assert_array_equal(np.isnan(predOutdata[1]), outside2)
+
+        outdata = cm.tranGridForward(lbnd, ubnd, 0, 100)
+        self.assertEqual(outdata.shape, predOutdata.shape)
+        npt.assert_allclose(outdata, predOutdata, atol=1e-13)
+
+        # the inverted map uses AST's own inverse transformation
+        cmInv = cm.getInverse()
+        npt.assert_allclose(cmInv.tranGridInverse(lbnd, ubnd, 0, 100), predOutdata, atol=1e-13)
+
+        # a 1-d ChebyMap
+        cm1 = astshim.ChebyMap(np.array([[1.5, 1, 0], [-0.5, 1, 3]]), 1, [-2.0], [2.0])
+        outdata1 = cm1.tranGridForward([-3], [3], 0, 100)
+        self.assertEqual(outdata1.shape, (1, 7))
+        # applyForward returns a list for 1-d input
+        npt.assert_allclose(outdata1[0], np.array(cm1.applyForward(np.arange(-3.0, 4.0))), atol=1e-13)
+
+    def test_ChebyMapGetCoeffs(self):
+        """Test ChebyMap.getCoeffForward and getCoeffInverse
+        """
+        def sortRows(arr):
+            return sorted(tuple(row) for row in arr)
+
+        lbnd_f = [-2.0, -2.5]
+        ubnd_f = [1.5, 2.5]
+        coeff_f = np.array([
+            [1.2, 1, 2, 0],
+            [-0.5, 1, 1, 1],
+            [1.0, 2, 0, 1],
+        ])
+        lbnd_i = [-1.0, -3.0]
+        ubnd_i = [2.0, 3.0]
+        coeff_i = np.array([
+            [0.5, 1, 1, 0],
+            [2.0, 2, 0, 1],
+        ])
+        cm = astshim.ChebyMap(coeff_f, coeff_i, lbnd_f, ubnd_f, lbnd_i, ubnd_i)
+        coeffs = cm.getCoeffForward()
+        self.assertEqual(coeffs.shape, (3, 4))
+        self.assertEqual(sortRows(coeffs), sortRows(coeff_f))
+        self.assertEqual(sortRows(cm.getCoeffInverse()), sortRows(coeff_i))
+        invCm = cm.getInverse()
+        self.assertEqual(sortRows(invCm.getCoeffForward()), sortRows(coeff_i))
+        self.assertEqual(sortRows(invCm.getCoeffInverse()), sortRows(coeff_f))
+
+        # the coefficients and domain are enough to make an equivalent ChebyMap
+        cmForward = astshim.ChebyMap(coeff_f, 2, lbnd_f, ubnd_f)
+        self.assertEqual(cmForward.getCoeffInverse().shape, (0, 4))
+        domain = cm.getDomain(True)
+        cmCopy = astshim.ChebyMap(cm.getCoeffForward(), 2, domain.lbnd, domain.ubnd)
+        indata = np.array([
+            [-2.0, -0.5, 0.5, 1.5],
+            [-2.5, 1.5, 0.5, 2.5],
+        ])
+        npt.assert_allclose(cmCopy.applyForward(indata), cm.applyForward(indata))
+
     def test_normalize(self):
         """Test the local utility function `normalize`
         """
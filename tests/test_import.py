@@ -0,0 +1,23 @@
+from __future__ import absolute_import, division, print_function
+import sys
+import unittest
+
+import astshim
+
+
+class TestImport(unittest.TestCase):
+
+    def test_SingleExtensionModule(self):
+        """All wrapped classes come from one compiled extension module"""
+        self.assertIn("astshim._astshimLib", sys.modules)
+        for name in ("Object", "Mapping", "KeyMap", "FrameSet", "PolyMap", "SkyFrame"):
+            self.assertEqual(getattr(astshim, name).__module__, "astshim._astshimLib")
+
+        extensionNames = [name for name, module in sys.modules.items()
+                          if name.startswith("astshim") and module is not None and
+                          getattr(module, "__file__", "").endswith((".so", ".pyd"))]
+        self.assertEqual(extensionNames, ["astshim._astshimLib"])
+
+
+if __name__ == "__main__":
+    unittest.main()
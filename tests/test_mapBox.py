@@ -5,7 +5,7 @@ import numpy as np
 from numpy.testing import assert_allclose
 
 import astshim
-from astshim.test import MappingTestCase
+from astshim.test import MappingTestCase, makeTwoWayPolyMap
 
 
 class TestMapBox(MappingTestCase):
@@ -48,6 +48,40 @@ class TestMapBox(MappingTestCase):
             self.assertAlmostEqual(mapbox.xl[i, i], mapbox2.xl[i, i])
             self.assertAlmostEqual(mapbox.xu[i, i], mapbox2.xu[i, i])
 
+    def test_MapBoxBatch(self):
+        """Test MapBoxBatch against MapBox"""
+        polyMap = makeTwoWayPolyMap(2, 2)
+        rng = np.random.RandomState(12)
+        nBoxes = 50
+        lbnd = rng.uniform(-10, 10, size=(nBoxes, 2))
+        ubnd = lbnd + rng.uniform(-5, 5, size=(nBoxes, 2))
+        predLbndOut = np.array([astshim.MapBox(polyMap, lb, ub).lbndOut for lb, ub in zip(lbnd, ubnd)])
+        predUbndOut = np.array([astshim.MapBox(polyMap, lb, ub).ubndOut for lb, ub in zip(lbnd, ubnd)])
+
+        for nThreads in (1, 3, 0):
+            batch = astshim.MapBoxBatch(polyMap, lbnd, ubnd, nThreads=nThreads)
+            self.assertEqual((batch.minOutCoord, batch.maxOutCoord), (1, 2))
+            self.assertEqual(batch.lbndOut.shape, (nBoxes, 2))
+            assert_allclose(batch.lbndOut, predLbndOut)
+            assert_allclose(batch.ubndOut, predUbndOut)
+
+        batch = astshim.MapBoxBatch(polyMap, lbnd, ubnd, minOutCoord=2, nThreads=2)
+        self.assertEqual((batch.minOutCoord, batch.maxOutCoord), (2, 2))
+        assert_allclose(batch.lbndOut, predLbndOut[:, 1:2])
+        assert_allclose(batch.ubndOut, predUbndOut[:, 1:2])
+
+        batch = astshim.MapBoxBatch(polyMap, lbnd[0:0], ubnd[0:0], nThreads=2)
+        self.assertEqual(batch.lbndOut.shape, (0, 2))
+
+        with self.assertRaises(ValueError):
+            astshim.MapBoxBatch(polyMap, lbnd, ubnd[0:10])
+        with self.assertRaises(ValueError):
+            astshim.MapBoxBatch(polyMap, lbnd[:, 0:1], ubnd[:, 0:1])
+        with self.assertRaises(ValueError):
+            astshim.MapBoxBatch(polyMap, lbnd, ubnd, maxOutCoord=3)
+        with self.assertRaises(ValueError):
+            astshim.MapBoxBatch(polyMap, lbnd, ubnd, nThreads=-1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,132 @@
+from __future__ import absolute_import, division, print_function
+import unittest
+
+import numpy as np
+
+import astshim
+from astshim.test import MappingTestCase
+
+
+class TestMapSplitCache(MappingTestCase):
+
+    def setUp(self):
+        self.zoomMap = astshim.ZoomMap(3, 1.3)
+        shiftMap = astshim.ShiftMap([1.0, 2.0, 3.0])
+        self.seriesMap = self.zoomMap.then(shiftMap)
+
+    def entrySize(self, mapping, inputs):
+        """Return the size of a cache entry: split mapping, serialized mapping and picked inputs"""
+        splitMap = astshim.MapSplit(mapping, inputs).splitMap
+        return splitMap.objSize + len(mapping.toString()) + len("".join("%d," % val for val in inputs))
+
+    def test_MapSplitCacheBasics(self):
+        cache = astshim.MapSplitCache()
+        self.assertEqual(cache.maxSize, 10000000)
+        self.assertEqual(cache.nEntries, 0)
+        self.assertEqual(cache.size, 0)
+
+        split1 = cache.split(self.seriesMap, [1, 3])
+        predSplit = astshim.MapSplit(self.seriesMap, [1, 3])
+        self.assertEqual(split1.splitMap, predSplit.splitMap)
+        self.assertEqual(tuple(split1.origIn), (1, 3))
+        self.assertEqual(tuple(split1.origOut), tuple(predSplit.origOut))
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 1))
+        self.assertEqual(cache.nEntries, 1)
+        self.assertEqual(cache.size, self.entrySize(self.seriesMap, [1, 3]))
+
+        split2 = cache.split(self.seriesMap, [1, 3])
+        self.assertTrue(split2.splitMap.same(split1.splitMap))
+        self.assertEqual(tuple(split2.origOut), tuple(split1.origOut))
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 1))
+
+        # different inputs are a new entry, even if they are the same inputs in another order
+        split3 = cache.split(self.seriesMap, [2])
+        self.assertEqual(tuple(split3.origOut), (2,))
+        cache.split(self.seriesMap, [3, 1])
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 3))
+        self.assertEqual(cache.nEntries, 3)
+
+        # an equal but different mapping shares the entry
+        split4 = cache.split(self.seriesMap.copy(), [1, 3])
+        self.assertTrue(split4.splitMap.same(split1.splitMap))
+        self.assertEqual((cache.nHits, cache.nMisses), (2, 3))
+        self.assertEqual(cache.nEntries, 3)
+
+        cache.resetStats()
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 0))
+        self.assertEqual(cache.nEntries, 3)
+        cache.clear()
+        self.assertEqual(cache.nEntries, 0)
+        self.assertEqual(cache.size, 0)
+        cache.split(self.seriesMap, [1, 3])
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 1))
+
+        # the copies returned by each call to FrameSet.getMapping share one entry
+        frameSet = astshim.FrameSet(astshim.Frame(3), self.seriesMap, astshim.Frame(3))
+        cache.split(frameSet.getMapping(), [2])
+        cache.resetStats()
+        cache.split(frameSet.getMapping(), [2])
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 0))
+
+    def test_MapSplitCacheModified(self):
+        cache = astshim.MapSplitCache()
+        cache.split(self.seriesMap, [2])
+
+        # modifying the original mapping is detected
+        self.seriesMap.ident = "modified"
+        cache.split(self.seriesMap, [2])
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 2))
+
+        # modifying a cached split mapping is detected
+        split1 = cache.split(self.seriesMap, [2])
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 2))
+        split1.splitMap.ident = "modified split"
+        split2 = cache.split(self.seriesMap, [2])
+        self.assertFalse(split2.splitMap.same(split1.splitMap))
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 3))
+        self.assertEqual(cache.nEntries, 2)
+
+        # modifying a component shared with a series map is detected;
+        # Ident is one of the few attributes whose change is visible through the series map
+        zoomMap = astshim.ZoomMap(3, 2.0)
+        seriesMap = zoomMap.then(astshim.ShiftMap([1.0, 2.0, 3.0]))
+        indata = np.array([[1.0, 2.0], [3.0, 4.0]])
+        split3 = cache.split(seriesMap, [2, 3])
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 4))
+        zoomMap.ident = "modified component"
+        split4 = cache.split(seriesMap, [2, 3])
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 5))
+        self.assertEqual(cache.nEntries, 4)
+        self.assertFalse(split4.splitMap.same(split3.splitMap))
+        self.assertEqual(split4.splitMap, astshim.MapSplit(seriesMap, [2, 3]).splitMap)
+        np.testing.assert_allclose(split4.splitMap.applyForward(indata), indata * 2.0 + [[2.0], [3.0]])
+        cache.split(seriesMap, [2, 3])
+        self.assertEqual((cache.nHits, cache.nMisses), (2, 5))
+
+    def test_MapSplitCacheFailure(self):
+        # a rotation by 45 degrees cannot be split by axis
+        matrixMap = astshim.MatrixMap(np.array([[1.0, -1.0], [1.0, 1.0]]))
+        cache = astshim.MapSplitCache()
+        for i in range(2):
+            with self.assertRaises(RuntimeError):
+                cache.split(matrixMap, [1])
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 2))
+        self.assertEqual(cache.nEntries, 0)
+
+    def test_MapSplitCacheMaxSize(self):
+        # entries for different inputs have different sizes; room for the larger one only
+        size1 = self.entrySize(self.seriesMap, [1])
+        size12 = self.entrySize(self.seriesMap, [1, 2])
+        self.assertLess(size1, size12)
+        cache = astshim.MapSplitCache(maxSize=size12)
+        cache.split(self.seriesMap, [1, 2])
+        self.assertEqual(cache.size, size12)
+        cache.split(self.seriesMap, [1])
+        self.assertEqual(cache.nEntries, 1)
+        self.assertEqual(cache.size, size1)
+        cache.split(self.seriesMap, [1, 2])
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,12 @@
 from __future__ import absolute_import, division, print_function
+import threading
 import unittest
 
 import numpy as np
 from numpy.testing import assert_allclose
 
 import astshim
-from astshim.test import MappingTestCase
+from astshim.test import MappingTestCase, makeTwoWayPolyMap
 
 
 class TestMapping(MappingTestCase):
@@ -47,6 +48,227 @@ class TestMapping(MappingTestCase):
         self.checkRoundTrip(self.zoommap, indata)
         self.checkRoundTrip(invmap, indata)
 
+    def test_MappingReleaseGIL(self):
+        """Test applyForward, applyInverse and tranGridForward with the GIL released
+        """
+        indata = np.array([
+            [1.0, 2.0, -6.0, 30.0, 0.0],
+            [3.0, 99.0, -5.0, 21.0, 0.0],
+        ], dtype=float)
+        predOutdata = self.zoommap.applyForward(indata)
+        predGrid = self.zoommap.tranGridForward([0, 0], [2, 1], 0, 100, 6)
+
+        assert_allclose(self.zoommap.applyForward(indata, releaseGIL=True), predOutdata)
+        assert_allclose(self.zoommap.applyForward(list(indata.flat), releaseGIL=True),
+                        list(predOutdata.flat))
+        assert_allclose(self.zoommap.applyInverse(predOutdata, releaseGIL=True), indata)
+        assert_allclose(self.zoommap.tranGridForward([0, 0], [2, 1], 0, 100, 6, releaseGIL=True),
+                        predGrid)
+
+        # the mapping is still locked by this thread, so it can be used normally
+        assert_allclose(self.zoommap.applyForward(indata), predOutdata)
+
+        # once unlocked, other threads may use it in turn
+        self.zoommap.unlock()
+        results = []
+
+        def transform():
+            results.append(self.zoommap.applyForward(indata, releaseGIL=True))
+
+        for i in range(3):
+            thread = threading.Thread(target=transform)
+            thread.start()
+            thread.join()
+        self.assertEqual(len(results), 3)
+        for outdata in results:
+            assert_allclose(outdata, predOutdata)
+
+        # each thread unlocks the mapping when done; lock it again so this thread can use it
+        self.zoommap.lock(True)
+        assert_allclose(self.zoommap.applyForward(indata), predOutdata)
+
+    def test_MappingTranGrid(self):
+        """Test tranGridForward, tranGridInverse and their block-by-block versions
+        """
+        lbnd = [-1, 2]
+        ubnd = [3, 5]
+        self.assertEqual(astshim.Mapping.getGridSize(lbnd, ubnd), 20)
+        # the first axis varies fastest
+        yGrid, xGrid = np.mgrid[lbnd[1]:ubnd[1] + 1, lbnd[0]:ubnd[0] + 1]
+        gridPoints = np.array([xGrid.flatten(), yGrid.flatten()], dtype=float)
+        predOutdata = self.zoommap.applyForward(gridPoints)
+
+        outdata = self.zoommap.tranGridForward(lbnd, ubnd, 0, 100)
+        self.assertEqual(outdata.shape, (2, 20))
+        assert_allclose(outdata, predOutdata)
+        outdata = self.zoommap.tranGridForward(lbnd, ubnd, 0, 100, 25)
+        self.assertEqual(outdata.shape, (2, 25))
+        assert_allclose(outdata[:, 0:20], predOutdata)
+        assert_allclose(self.zoommap.tranGridInverse(lbnd, ubnd, 0, 100),
+                        self.zoommap.applyInverse(gridPoints))
+
+        with self.assertRaises(ValueError):
+            self.zoommap.tranGridForward(lbnd, ubnd, 0, 100, 19)  # too few points
+        with self.assertRaises(ValueError):
+            self.zoommap.tranGridForward(lbnd, [3], 0, 100)
+        with self.assertRaises(ValueError):
+            astshim.Mapping.getGridSize([0, 5], [3, 4])
+
+        for nRows in (1, 3, 4, 10):
+            blocks = list(self.zoommap.tranGridForwardBlocks(lbnd, ubnd, 0, 100, nRows))
+            self.assertEqual(len(blocks), (4 + nRows - 1) // nRows)
+            self.assertEqual(blocks[0][0], lbnd)
+            self.assertEqual(blocks[-1][1], ubnd)
+            for blockLbnd, blockUbnd, blockOutdata in blocks:
+                self.assertEqual(blockLbnd[0], lbnd[0])
+                self.assertEqual(blockUbnd[0], ubnd[0])
+                self.assertEqual(blockOutdata.shape[1], astshim.Mapping.getGridSize(blockLbnd, blockUbnd))
+            assert_allclose(np.concatenate([block[2] for block in blocks], axis=1), predOutdata)
+        inverseBlocks = self.zoommap.tranGridInverseBlocks(lbnd, ubnd, 0, 100, 3)
+        assert_allclose(np.concatenate([block[2] for block in inverseBlocks], axis=1),
+                        self.zoommap.applyInverse(gridPoints))
+        with self.assertRaises(ValueError):
+            list(self.zoommap.tranGridForwardBlocks(lbnd, ubnd, 0, 100, 0))
+
+    def test_MappingThreaded(self):
+        """Test applyForward and applyInverse using several threads
+        """
+        polyMap = makeTwoWayPolyMap(2, 3)
+        nPts = 1001
+        indata = np.array([
+            np.linspace(-5.0, 5.0, nPts),
+            np.linspace(0.0, 3.0, nPts),
+        ])
+        predOutdata = polyMap.applyForward(indata)
+        predRoundTrip = polyMap.applyInverse(predOutdata)
+        for nThreads, chunkSize in ((1, 0), (2, 0), (3, 0), (3, 10), (4, 1), (0, 0), (4, 5000)):
+            outdata = polyMap.applyForward(indata, nThreads=nThreads, chunkSize=chunkSize)
+            assert_allclose(outdata, predOutdata)
+            roundTrip = polyMap.applyInverse(outdata, nThreads=nThreads, chunkSize=chunkSize)
+            assert_allclose(roundTrip, predRoundTrip)
+
+        # nThreads is keyword-only, so a positional bool is always releaseGIL
+        assert_allclose(polyMap.applyForward(indata, True, False), predOutdata)
+        with self.assertRaises(TypeError):
+            polyMap.applyForward(indata, True, False, 2)
+
+        with self.assertRaises(ValueError):
+            polyMap.applyForward(indata, nThreads=-1)
+        with self.assertRaises(ValueError):
+            polyMap.applyForward(indata[0:1], nThreads=2)  # wrong number of axes
+
+    def test_MappingOut(self):
+        """Test applyForward and applyInverse with a pre-allocated output array
+        """
+        polyMap = makeTwoWayPolyMap(2, 3)
+        indata = np.array([
+            [1.0, 2.0, -6.0, 30.0, 0.0],
+            [3.0, 99.0, -5.0, 21.0, 0.0],
+        ], dtype=float)
+        predOutdata = polyMap.applyForward(indata)
+        predRoundTrip = polyMap.applyInverse(predOutdata)
+
+        out = np.zeros((3, 5), dtype=float)
+        retOut = polyMap.applyForward(indata, out=out)
+        self.assertIs(retOut, out)
+        assert_allclose(out, predOutdata)
+        # reuse the output array
+        polyMap.applyForward(indata[:, ::-1].copy(), out, releaseGIL=True)
+        assert_allclose(out, predOutdata[:, ::-1])
+        polyMap.applyForward(indata, out=out, nThreads=2, chunkSize=2)
+        assert_allclose(out, predOutdata)
+
+        outInv = np.zeros((2, 5), dtype=float)
+        retOutInv = polyMap.applyInverse(predOutdata, out=outInv)
+        self.assertIs(retOutInv, outInv)
+        assert_allclose(outInv, predRoundTrip)
+        outInv[:] = 0
+        polyMap.applyInverse(predOutdata, out=outInv, nThreads=2)
+        assert_allclose(outInv, predRoundTrip)
+
+        for badOut in (
+            np.zeros((2, 5), dtype=float),  # wrong number of axes
+            np.zeros((3, 4), dtype=float),  # wrong number of points
+            np.zeros((3, 5), dtype=np.float32),  # wrong dtype
+            np.zeros((15,), dtype=float),  # wrong number of dimensions
+            np.zeros((5, 3), dtype=float).T,  # not C-contiguous
+        ):
+            with self.assertRaises(ValueError):
+                polyMap.applyForward(indata, out=badOut)
+
+    def test_MappingStrided(self):
+        """Test applyForward and applyInverse with arrays that are not
+        C-contiguous float64
+        """
+        polyMap = makeTwoWayPolyMap(2, 3)
+        indata = np.array([
+            [1.0, 2.0, -6.0, 30.0, 0.0, 0.5],
+            [3.0, 99.0, -5.0, 21.0, 0.0, 1.5],
+        ], dtype=float)
+        predOutdata = polyMap.applyForward(indata)
+        predRoundTrip = polyMap.applyInverse(predOutdata)
+
+        # a table of points with one row per point
+        table = indata.T.copy()
+        assert_allclose(polyMap.applyForward(table.T), predOutdata)
+        # every other point of a larger array
+        bigdata = np.zeros((2, 12), dtype=float)
+        bigdata[:, ::2] = indata
+        assert_allclose(polyMap.applyForward(bigdata[:, ::2]), predOutdata)
+        # points in reverse order
+        assert_allclose(polyMap.applyForward(indata[:, ::-1]), predOutdata[:, ::-1])
+        # x and y columns of a structured array
+        points = np.zeros(6, dtype=[("x", float), ("flag", np.int32), ("y", float)])
+        points["x"] = indata[0]
+        points["y"] = indata[1]
+        xy = np.lib.stride_tricks.as_strided(
+            points["x"], shape=(2, 6), strides=(points.dtype.fields["y"][1], points.strides[0]))
+        assert_allclose(xy, indata)
+        assert_allclose(polyMap.applyForward(xy), predOutdata)
+        # single precision and integer data
+        assert_allclose(polyMap.applyForward(indata.astype(np.float32)), predOutdata)
+        assert_allclose(polyMap.applyForward(table.T.astype(np.float32)), predOutdata)
+        assert_allclose(polyMap.applyForward(indata.astype(int)), predOutdata)
+
+        out = np.zeros((2, 6), dtype=float)
+        retOut = polyMap.applyInverse(predOutdata.T.copy().T, out=out, releaseGIL=True)
+        self.assertIs(retOut, out)
+        assert_allclose(out, predRoundTrip)
+        assert_allclose(polyMap.applyInverse(predOutdata[:, ::-1]), predRoundTrip[:, ::-1])
+
+        # a 1-d array is a vector of points with axes adjacent, as for a list
+        assert_allclose(polyMap.applyForward(table.ravel()), predOutdata.T.ravel())
+
+        with self.assertRaises(ValueError):
+            polyMap.applyForward(table)  # wrong number of axes
+
+    def test_MappingBadToNan(self):
+        """Test the badToNan argument of applyForward and applyInverse
+        """
+        # AST__BAD is -DBL_MAX
+        astBad = np.finfo(float).min
+        sqrtMap = astshim.MathMap(1, 1, ["y = sqrt(x)"], ["x = y * y"])
+        indata = np.array([[4.0, -1.0, 9.0, -4.0, 0.0]])
+        predOutdata = np.array([[2.0, astBad, 3.0, astBad, 0.0]])
+
+        outdata = sqrtMap.applyForward(indata)
+        self.assertTrue(np.all(np.isnan(outdata[predOutdata == astBad])))
+        assert_allclose(outdata[predOutdata != astBad], predOutdata[predOutdata != astBad])
+
+        for kwargs in ({}, dict(releaseGIL=True), dict(nThreads=2, chunkSize=2)):
+            assert_allclose(sqrtMap.applyForward(indata, badToNan=False, **kwargs), predOutdata)
+            out = np.zeros_like(indata)
+            sqrtMap.applyForward(indata, out=out, badToNan=False, **kwargs)
+            assert_allclose(out, predOutdata)
+        # arrays that are not C-contiguous float64
+        assert_allclose(sqrtMap.applyForward(indata.astype(np.float32), badToNan=False), predOutdata)
+        assert_allclose(sqrtMap.applyForward(indata[:, ::-1], badToNan=False), predOutdata[:, ::-1])
+        # inverse of an inverted mapping
+        assert_allclose(sqrtMap.getInverse().applyInverse(indata, badToNan=False), predOutdata)
+
+        with self.assertRaises(ValueError):
+            sqrtMap.applyForward(indata[0], badToNan=False)
+
     def test_MapBox(self):
         """Test MapBox for the simple case of a shift and zoom"""
         shift = np.array([1.5, 0.5])
@@ -83,6 +305,44 @@ class TestMapping(MappingTestCase):
             self.assertAlmostEqual(mapbox.xl[i, i], mapbox2.xl[i, i])
             self.assertAlmostEqual(mapbox.xu[i, i], mapbox2.xu[i, i])
 
+    def test_MapBoxApprox(self):
+        """Test the approximate mode of MapBox"""
+        polyMap = makeTwoWayPolyMap(2, 2)
+        lbnd = [-3.0, 5.0]
+        ubnd = [4.0, -2.0]
+        exact = astshim.MapBox(polyMap, lbnd, ubnd)
+        for nSamples, nRefine, tol in ((3, 0, 0.05), (5, 1, 1e-3), (11, 3, 1e-6)):
+            approx = astshim.MapBox(polyMap, lbnd, ubnd, nSamples=nSamples, nRefine=nRefine)
+            self.assertEqual((approx.minOutCoord, approx.maxOutCoord), (1, 2))
+            # the approximate box is never larger than the exact box
+            self.assertTrue(np.all(np.array(approx.lbndOut) >= np.array(exact.lbndOut) - 1e-10))
+            self.assertTrue(np.all(np.array(approx.ubndOut) <= np.array(exact.ubndOut) + 1e-10))
+            assert_allclose(approx.lbndOut, exact.lbndOut, atol=tol)
+            assert_allclose(approx.ubndOut, exact.ubndOut, atol=tol)
+            # xl and xu are the points at which the bounds occur
+            assert_allclose(polyMap.applyForward(approx.xl.T.copy()).diagonal(), approx.lbndOut)
+            assert_allclose(polyMap.applyForward(approx.xu.T.copy()).diagonal(), approx.ubndOut)
+
+        approx = astshim.MapBox(polyMap, lbnd, ubnd, minOutCoord=2, nSamples=5)
+        self.assertEqual(len(approx.lbndOut), 1)
+        assert_allclose(approx.lbndOut, exact.lbndOut[1:], atol=1e-2)
+
+        for nSamples in (-1, 1, 2):
+            with self.assertRaises(ValueError):
+                astshim.MapBox(polyMap, lbnd, ubnd, nSamples=nSamples)
+        with self.assertRaises(ValueError):
+            astshim.MapBox(polyMap, lbnd, ubnd, nSamples=5, nRefine=-1)
+        # refinement cannot shrink the grid spacing if nSamples is 3
+        with self.assertRaises(ValueError):
+            astshim.MapBox(polyMap, lbnd, ubnd, nSamples=3, nRefine=1)
+        # the sample grid is limited to 1,000,000 points, which 64^6 would greatly exceed (and overflow int)
+        astshim.MapBox(polyMap, lbnd, ubnd, nSamples=1000, nRefine=0)
+        with self.assertRaises(ValueError):
+            astshim.MapBox(polyMap, lbnd, ubnd, nSamples=1001, nRefine=0)
+        zoomMap6 = astshim.ZoomMap(6, 2.0)
+        with self.assertRaises(ValueError):
+            astshim.MapBox(zoomMap6, [0.0] * 6, [1.0] * 6, nSamples=64)
+
     def test_MappingLinearApprox(self):
         """Exercise Mapping.linearApprox for a trivial case"""
         coeffs = self.zoommap.linearApprox([0, 0], [50, 50], 1e-5)
@@ -104,6 +364,120 @@ class TestMapping(MappingTestCase):
         self.assertAlmostEqual(qa.rms, 0)
         self.assertEqual(len(qa.fit), 6)
         assert_allclose(qa.fit, [0, 0, 0, 0, 0.5, 0.5])
+        self.assertEqual(qa.nOut, 1)
+        indata = np.array([
+            [-1.0, 0.0, 0.5, 3.0],
+            [-1.0, 0.2, -0.7, 2.0],
+        ])
+        assert_allclose(qa.applyForward(indata), polymap.applyForward(indata), atol=1e-12)
+
+    def test_TiledQuadApprox(self):
+        # a cubic, which a quadratic cannot fit exactly
+        coeff_f = np.array([
+            [0.5, 1, 3, 0],
+            [0.5, 1, 0, 2],
+            [1.0, 2, 1, 1],
+        ], dtype=float)
+        polymap = astshim.PolyMap(coeff_f, 2, "IterInverse=1")
+        lbnd = [-2, -1]
+        ubnd = [2, 3]
+        single = astshim.QuadApprox(polymap, lbnd, ubnd, 5, 5)
+        tqa = astshim.TiledQuadApprox(polymap, lbnd, ubnd, 4, 2, 5, 5)
+        self.assertEqual((tqa.nxTiles, tqa.nyTiles), (4, 2))
+        self.assertEqual(tqa.lbnd, lbnd)
+        self.assertEqual(tqa.ubnd, ubnd)
+        self.assertEqual(len(tqa.tiles), 8)
+        self.assertAlmostEqual(tqa.maxRms, max(tile.rms for tile in tqa.tiles))
+        self.assertLess(tqa.maxRms, single.rms)
+        assert_allclose(tqa.getTile(1, 1).fit, tqa.tiles[5].fit)
+        # the tile edges are at x = -2, -1, 0, 1, 2 and y = -1, 1, 3
+        predTile = astshim.QuadApprox(polymap, [-1, 1], [0, 3], 5, 5)
+        assert_allclose(tqa.getTile(1, 1).fit, predTile.fit)
+
+        rng = np.random.RandomState(3)
+        indata = np.array([rng.uniform(-2, 2, 100), rng.uniform(-1, 3, 100)])
+        outdata = tqa.applyForward(indata)
+        self.assertEqual(outdata.shape, (2, 100))
+        predOutdata = polymap.applyForward(indata)
+        assert_allclose(outdata, predOutdata, atol=0.1)
+        self.assertLess(np.abs(outdata - predOutdata).max(),
+                        np.abs(single.applyForward(indata) - predOutdata).max())
+        # points on the upper edge are in the last tile; points outside the box are nan
+        edgeOutdata = tqa.applyForward(np.array([[2.0, 2.1], [3.0, 0.0]]))
+        assert_allclose(edgeOutdata[:, 0], tqa.getTile(3, 1).applyForward(np.array([[2.0], [3.0]]))[:, 0])
+        self.assertTrue(np.all(np.isnan(edgeOutdata[:, 1])))
+
+        with self.assertRaises(IndexError):
+            tqa.getTile(4, 0)
+        with self.assertRaises(ValueError):
+            astshim.TiledQuadApprox(polymap, lbnd, ubnd, 0, 2)
+        with self.assertRaises(ValueError):
+            astshim.TiledQuadApprox(polymap, ubnd, lbnd, 2, 2)
+
+    def test_PiecewiseLinearApprox(self):
+        # a linear mapping needs just one tile
+        pla = astshim.PiecewiseLinearApprox(self.zoommap, [-10, -5], [10, 5], 1e-6)
+        self.assertEqual((pla.nIn, pla.nOut), (2, 2))
+        self.assertEqual(len(pla.tiles), 1)
+        self.assertTrue(pla.tiles[0].isLinear)
+        self.assertEqual(pla.tiles[0].children, [])
+        indata = np.array([
+            [-10.0, 0.0, 3.5, 10.0],
+            [-5.0, 0.0, -2.1, 5.0],
+        ])
+        assert_allclose(pla.applyForward(indata), self.zoommap.applyForward(indata), atol=1e-6)
+
+        # a parabola needs many tiles
+        coeff_f = np.array([
+            [0.5, 1, 2, 0],
+            [0.5, 1, 0, 2],
+        ], dtype=float)
+        polymap = astshim.PolyMap(coeff_f, 1)
+        lbnd = [-10, -10]
+        ubnd = [10, 10]
+        tol = 0.01
+        pla = astshim.PiecewiseLinearApprox(polymap, lbnd, ubnd, tol)
+        self.assertEqual(pla.tol, tol)
+        self.assertGreater(len(pla.tiles), 1)
+        self.assertEqual(len(pla.tiles[0].children), 2)
+        self.assertEqual(pla.tiles[0].lbnd, lbnd)
+        self.assertEqual(pla.tiles[0].ubnd, ubnd)
+        leaves = [tile for tile in pla.tiles if not tile.children]
+        for tile in leaves:
+            self.assertTrue(tile.isLinear)
+            self.assertEqual(len(tile.fit), 3)
+        # the leaves exactly cover the box
+        leafArea = sum(np.prod(np.subtract(tile.ubnd, tile.lbnd)) for tile in leaves)
+        self.assertAlmostEqual(leafArea, 400)
+
+        rng = np.random.RandomState(5)
+        indata = rng.uniform(-10, 10, size=(2, 100))
+        # AST only checks linearity at a few points in each tile, so allow some margin
+        assert_allclose(pla.applyForward(indata), polymap.applyForward(indata), atol=4 * tol)
+        for point in indata.T[0:10]:
+            tile = pla.tiles[pla.findTile(list(point))]
+            self.assertFalse(tile.children)
+            self.assertTrue(np.all(point >= tile.lbnd))
+            self.assertTrue(np.all(point <= tile.ubnd))
+
+        # points outside the box are nan
+        self.assertEqual(pla.findTile([10.5, 0]), -1)
+        self.assertTrue(np.all(np.isnan(pla.applyForward(np.array([[10.5], [0.0]])))))
+
+        # tiles are not split below minSize; those that are still not linear have no fit
+        pla = astshim.PiecewiseLinearApprox(polymap, lbnd, ubnd, 1e-10, minSize=5)
+        for tile in pla.tiles:
+            if not tile.children:
+                self.assertLessEqual(max(np.subtract(tile.ubnd, tile.lbnd)), 5)
+                self.assertFalse(tile.isLinear)
+                self.assertEqual(tile.fit, [])
+
+        with self.assertRaises(ValueError):
+            astshim.PiecewiseLinearApprox(polymap, [-10], [10], tol)
+        with self.assertRaises(ValueError):
+            astshim.PiecewiseLinearApprox(polymap, [10, -10], [-10, 10], tol)
+        with self.assertRaises(ValueError):
+            astshim.PiecewiseLinearApprox(polymap, lbnd, ubnd, tol, minSize=0)
 
     def test_MappingRate(self):
         """Exercise Mapping.rate for a trivial case"""
@@ -115,6 +489,41 @@ class TestMapping(MappingTestCase):
                         self.assertAlmostEqual(self.zoommap.rate(
                             [x, y], xaxis, yaxis), desrate)
 
+    def test_MappingJacobian(self):
+        """Test Mapping.jacobian for linear and nonlinear mappings"""
+        indata = np.array([
+            [0.0, 5.0, 55.0, -3.2, 1e5],
+            [0.0, -9.5, 47.6, 0.1, 2.0],
+        ])
+        nPts = indata.shape[1]
+
+        # linear mappings are exact
+        zoomJac = self.zoommap.jacobian(indata)
+        self.assertEqual(zoomJac.shape, (nPts, 2, 2))
+        for jac in zoomJac:
+            assert_allclose(jac, np.diag([self.zoom, self.zoom]), rtol=0, atol=1e-15)
+        invJac = self.zoommap.getInverse().jacobian(indata)
+        for jac in invJac:
+            assert_allclose(jac, np.diag([1 / self.zoom, 1 / self.zoom]), rtol=1e-14)
+        matrix = np.array([[1.0, -2.0], [0.5, 3.0], [0.0, 7.0]])
+        affineMap = astshim.MatrixMap(matrix).then(astshim.ShiftMap([1.0, 2.0, 3.0])).simplify()
+        for jac in affineMap.jacobian(indata):
+            assert_allclose(jac, matrix, rtol=1e-9, atol=1e-9)
+
+        # nonlinear mappings agree with rate
+        polyMap = makeTwoWayPolyMap(2, 3)
+        seriesMap = polyMap.then(self.zoommap)
+        for mapping in (polyMap, seriesMap):
+            jacArr = mapping.jacobian(indata[:, 0:4])
+            self.assertEqual(jacArr.shape, (4, 2, 2))
+            for i, jac in enumerate(jacArr):
+                at = list(indata[:, i])
+                predJac = [[mapping.rate(at, j + 1, k + 1) for k in range(2)] for j in range(2)]
+                assert_allclose(jac, predJac, rtol=1e-7, atol=1e-7)
+
+        with self.assertRaises(ValueError):
+            polyMap.jacobian(indata[0:1])
+
     def test_MappingSetReport(self):
         self.assertFalse(self.zoommap.report)
         self.assertFalse(self.zoommap.test("Report"))
@@ -139,6 +548,52 @@ class TestMapping(MappingTestCase):
         self.assertTrue(simpmap.hasForward)
         self.assertTrue(simpmap.hasInverse)
 
+    def test_MappingSimplifyThreshold(self):
+        shiftMap = astshim.ShiftMap([1.5, -2.0])
+        seriesMap = self.zoommap.then(shiftMap).then(shiftMap.getInverse()).then(self.zoommap)
+        self.assertEqual(seriesMap.simplifyThreshold, 0)
+        indata = np.array([
+            [1.0, 2.0, -6.0, 30.0, 0.2, 0.0, 7.0],
+            [3.0, 99.0, -5.0, 21.0, 0.0, -1.0, 9.0],
+        ], dtype=float)
+        predOutdata = seriesMap.applyForward(indata)
+        assert_allclose(predOutdata, indata * self.zoom**2)
+
+        seriesMap.simplifyThreshold = 5
+        self.assertEqual(seriesMap.simplifyThreshold, 5)
+        for i in range(2):
+            # small arrays use the original mapping, large arrays the simplified copy
+            assert_allclose(seriesMap.applyForward(indata[:, 0:4]), predOutdata[:, 0:4])
+            assert_allclose(seriesMap.applyForward(indata), predOutdata)
+            assert_allclose(seriesMap.applyInverse(predOutdata), indata)
+            assert_allclose(seriesMap.applyForward(indata.astype(np.float32)), predOutdata)
+            assert_allclose(seriesMap.applyForward(indata, nThreads=2), predOutdata)
+            # modifying the mapping discards the simplified copy
+            seriesMap.ident = "modified {}".format(i)
+        assert_allclose(seriesMap.applyForward(indata, releaseGIL=True), predOutdata)
+
+        # modifying a component shared with a series map is noticed,
+        # even though the state ID of the series map is unchanged;
+        # Ident is one of the few attributes whose change is visible through the series map
+        zoomMap = astshim.ZoomMap(2, 2.0)
+        zoomShiftMap = zoomMap.then(shiftMap)
+        zoomShiftMap.simplifyThreshold = 5
+        shift = np.array([[1.5], [-2.0]])
+        assert_allclose(zoomShiftMap.applyForward(indata), indata * 2.0 + shift)
+        stateId = zoomShiftMap.stateId
+        text = zoomShiftMap.toString()
+        zoomMap.ident = "modified component"
+        self.assertEqual(zoomShiftMap.stateId, stateId)
+        self.assertNotEqual(zoomShiftMap.toString(), text)
+        for i in range(2):
+            assert_allclose(zoomShiftMap.applyForward(indata), indata * 2.0 + shift)
+
+        # the setting is not copied
+        self.assertEqual(seriesMap.copy().simplifyThreshold, 0)
+
+        seriesMap.simplifyThreshold = -1
+        self.assertEqual(seriesMap.simplifyThreshold, 0)
+
     def test_MapSplit(self):
         """Test MapSplit for a simple case"""
         for i in range(self.nin):
@@ -0,0 +1,90 @@
+from __future__ import absolute_import, division, print_function
+import threading
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+import astshim
+from astshim.test import MappingTestCase, makeTwoWayPolyMap
+
+
+class TestMappingPool(MappingTestCase):
+
+    def setUp(self):
+        self.polyMap = makeTwoWayPolyMap(2, 3)
+        self.batches = [
+            np.array([
+                np.linspace(-5.0, 5.0, nPts),
+                np.linspace(0.0, 3.0, nPts),
+            ]) for nPts in (1, 7, 1000, 0, 33, 250)
+        ]
+
+    def test_MappingPoolBasics(self):
+        for nThreads in (1, 3, 0):
+            pool = astshim.MappingPool(self.polyMap, nThreads=nThreads)
+            self.assertEqual(pool.nIn, 2)
+            self.assertEqual(pool.nOut, 2)
+            if nThreads > 0:
+                self.assertEqual(pool.nThreads, nThreads)
+            else:
+                self.assertGreater(pool.nThreads, 0)
+
+            outBatches = pool.applyForward(self.batches)
+            self.assertEqual(len(outBatches), len(self.batches))
+            for inBatch, outBatch in zip(self.batches, outBatches):
+                assert_allclose(outBatch, self.polyMap.applyForward(inBatch))
+
+            roundTripBatches = pool.applyInverse(outBatches)
+            for outBatch, roundTripBatch in zip(outBatches, roundTripBatches):
+                assert_allclose(roundTripBatch, self.polyMap.applyInverse(outBatch))
+
+            self.assertEqual(pool.applyForward([]), [])
+
+        # the original mapping is still usable by this thread
+        assert_allclose(self.polyMap.applyForward(self.batches[1]),
+                        pool.applyForward(self.batches[1:2])[0])
+
+        with self.assertRaises(ValueError):
+            astshim.MappingPool(self.polyMap, nThreads=-1)
+
+    def test_MappingPoolErrors(self):
+        pool = astshim.MappingPool(self.polyMap, nThreads=2)
+        with self.assertRaises(ValueError):
+            pool.applyForward([self.batches[0], self.batches[1][0:1]])  # wrong number of axes
+
+        # a PolyMap with no inverse fails in every worker; the pool is still usable afterwards
+        coeff_f = np.array([
+            [1.2, 1, 2, 0],
+            [-0.5, 1, 1, 1],
+            [1.0, 2, 0, 1],
+        ])
+        forwardOnlyMap = astshim.PolyMap(coeff_f, 2, "IterInverse=0")
+        pool = astshim.MappingPool(forwardOnlyMap, nThreads=2)
+        with self.assertRaises(RuntimeError):
+            pool.applyInverse(self.batches)
+        outBatches = pool.applyForward(self.batches)
+        for inBatch, outBatch in zip(self.batches, outBatches):
+            assert_allclose(outBatch, forwardOnlyMap.applyForward(inBatch))
+
+    def test_MappingPoolSharedByThreads(self):
+        """Test calling one pool from several Python threads at once"""
+        pool = astshim.MappingPool(self.polyMap, nThreads=2)
+        predOutBatches = [self.polyMap.applyForward(batch) for batch in self.batches]
+        results = [None] * 4
+
+        def transform(i):
+            results[i] = pool.applyForward(self.batches)
+
+        threads = [threading.Thread(target=transform, args=(i,)) for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for outBatches in results:
+            for outBatch, predOutBatch in zip(outBatches, predOutBatches):
+                assert_allclose(outBatch, predOutBatch)
+
+
+if __name__ == "__main__":
+    unittest.main()
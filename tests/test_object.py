@@ -1,4 +1,5 @@
 from __future__ import absolute_import, division, print_function
+import threading
 import unittest
 
 import numpy as np
@@ -93,6 +94,51 @@ class TestObject(ObjectTestCase):
         except RuntimeError as e:
             self.assertEqual(e.args[0].count("Error"), 1)
 
+    def test_error_handling_threaded(self):
+        """Test that AST errors in one thread are reported only in that thread
+        """
+        coeff_f = np.array([
+            [1.2, 1, 2, 0],
+            [-0.5, 1, 1, 1],
+            [1.0, 2, 0, 1],
+        ])
+        indata = np.array([
+            [1.0, 2.0, 3.0],
+            [0.0, 1.0, 2.0],
+        ])
+        nThreads = 8
+        nIter = 20
+        errors = [[] for i in range(nThreads)]
+        successes = [0] * nThreads
+
+        def transform(threadInd):
+            # odd-numbered threads transform successfully, the rest fail with an AST error
+            pm = astshim.PolyMap(coeff_f, 2, "IterInverse=0")
+            for i in range(nIter):
+                try:
+                    if threadInd % 2:
+                        pm.applyForward(indata, releaseGIL=True)
+                        successes[threadInd] += 1
+                    else:
+                        pm.applyInverse(indata, releaseGIL=True)
+                except RuntimeError as e:
+                    errors[threadInd].append(e.args[0])
+
+        threads = [threading.Thread(target=transform, args=(i,)) for i in range(nThreads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for threadInd in range(nThreads):
+            if threadInd % 2:
+                self.assertEqual(errors[threadInd], [])
+                self.assertEqual(successes[threadInd], nIter)
+            else:
+                self.assertEqual(len(errors[threadInd]), nIter)
+                for errMsg in errors[threadInd]:
+                    self.assertEqual(errMsg.count("Error"), 1)
+
     def test_equality(self):
         """Test __eq__ and __ne__
         """
@@ -125,6 +171,60 @@ class TestObject(ObjectTestCase):
         frameSet3 = astshim.FrameSet(frame3)
         self.assertNotEqual(frameSet1, frameSet3)
 
+    def test_hash(self):
+        """Test __hash__ and its use in dicts and sets
+        """
+        frame = astshim.Frame(2)
+        zoomMap = astshim.ZoomMap(2, 1.5)
+        frameSet1 = astshim.FrameSet(frame, zoomMap, frame)
+        frameSet2 = astshim.FrameSet(frame, zoomMap, frame)
+        self.assertEqual(hash(frameSet1), hash(frameSet2))
+        self.assertEqual(hash(frameSet1), hash(frameSet1.copy()))
+        self.assertEqual(len({frameSet1, frameSet2, frameSet1.copy()}), 1)
+
+        # the hash is updated when the object is modified
+        hash1 = hash(frameSet1)
+        frameSet2.base = 1
+        self.assertNotEqual(hash(frameSet2), hash1)
+        self.assertEqual(hash(frameSet1), hash1)
+        self.assertEqual(len({frameSet1, frameSet2}), 2)
+
+        # objects of different classes or with different numbers of axes are not equal
+        zoomMaps = [astshim.ZoomMap(2, 1.5), astshim.ZoomMap(3, 1.5), astshim.ZoomMap(2, 2.5)]
+        self.assertEqual(len({zm.copy(): i for i, zm in enumerate(zoomMaps)}), 3)
+        objects = {zoomMap: "zoom", astshim.UnitMap(2): "unit", frame: "frame"}
+        self.assertEqual(objects[astshim.ZoomMap(2, 1.5)], "zoom")
+        self.assertEqual(objects[astshim.UnitMap(2)], "unit")
+        self.assertEqual(objects[astshim.Frame(2)], "frame")
+        self.assertNotIn(astshim.UnitMap(3), objects)
+        self.assertNotEqual(astshim.UnitMap(2), astshim.UnitMap(3))
+        self.assertNotEqual(zoomMap, astshim.UnitMap(2))
+
+        # a series map shares its components, so modifying one modifies the series map
+        # without changing its state ID; the hash and equality must still be up to date
+        shiftMap = astshim.ShiftMap([1.0, 2.0])
+        zoomMap = astshim.ZoomMap(2, 1.5)
+        seriesMap = zoomMap.then(shiftMap)
+        hash1 = hash(seriesMap)
+        zoomMap.ident = "modified"
+        predSeriesMap = astshim.ZoomMap(2, 1.5, "Ident=modified").then(shiftMap)
+        self.assertNotEqual(hash(seriesMap), hash1)
+        self.assertEqual(hash(seriesMap), hash(predSeriesMap))
+        self.assertEqual(seriesMap, predSeriesMap)
+
+        # an object that contains other objects is only known to be unchanged
+        # if no object has been modified since
+        zoomState = (zoomMap.stateId, astshim.Object.getModificationCount())
+        seriesState = (seriesMap.stateId, astshim.Object.getModificationCount())
+        self.assertTrue(zoomMap.isUnchangedSince(*zoomState))
+        self.assertTrue(seriesMap.isUnchangedSince(*seriesState))
+        shiftMap.ident = "shift"
+        self.assertTrue(zoomMap.isUnchangedSince(*zoomState))
+        self.assertFalse(seriesMap.isUnchangedSince(*seriesState))
+        self.assertNotEqual(seriesMap, predSeriesMap)
+        zoomMap.ident = "modified again"
+        self.assertFalse(zoomMap.isUnchangedSince(*zoomState))
+
     def test_id(self):
         """Test that ID is *not* transferred to copies"""
         obj = astshim.ZoomMap(2, 1.3)
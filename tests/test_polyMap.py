@@ -299,6 +299,207 @@ class TestPolyMap(MappingTestCase):
             result = cmp2.simplify()
             self.assertIsInstance(result, astshim.UnitMap)
 
+    def test_PolyMapJacobian(self):
+        """Test PolyMap.jacobian, which is computed from the coefficients
+        """
+        # y1 = 1.2 x1^2 - 0.5 x1 x2; y2 = x2^3
+        coeff_f = np.array([
+            [1.2, 1, 2, 0],
+            [-0.5, 1, 1, 1],
+            [1.0, 2, 0, 3],
+        ])
+        pm = astshim.PolyMap(coeff_f, 2, "IterInverse=1")
+        indata = np.array([
+            [0.0, 1.0, -2.5, 3.0, np.nan],
+            [0.0, 2.0, 0.5, -1.0, 1.0],
+        ])
+        jacArr = pm.jacobian(indata)
+        self.assertEqual(jacArr.shape, (5, 2, 2))
+        for (x1, x2), jac in zip(indata.T[0:4], jacArr[0:4]):
+            predJac = [[2.4 * x1 - 0.5 * x2, -0.5 * x1], [0.0, 3.0 * x2**2]]
+            npt.assert_allclose(jac, predJac, rtol=1e-14, atol=1e-14)
+        self.assertTrue(np.all(np.isnan(jacArr[4])))
+
+        # the inverse is iterative, so its Jacobian is estimated numerically;
+        # it is the matrix inverse of the forward Jacobian at the corresponding point
+        outdata = pm.applyForward(indata[:, 1:4])
+        invJacArr = pm.getInverse().jacobian(outdata)
+        for jac, invJac in zip(jacArr[1:4], invJacArr):
+            npt.assert_allclose(np.dot(jac, invJac), np.identity(2), atol=1e-5)
+
+    def test_PolyMapGetCoeffs(self):
+        """Test PolyMap.getCoeffForward and getCoeffInverse
+        """
+        def sortRows(arr):
+            return sorted(tuple(row) for row in arr)
+
+        coeff_f = np.array([
+            [1.2, 1, 2, 0],
+            [-0.5, 1, 1, 1],
+            [1.0, 2, 0, 3],
+        ])
+        coeff_i = np.array([
+            [0.5, 1, 1, 0],
+            [2.0, 2, 0, 1],
+        ])
+        pm = astshim.PolyMap(coeff_f, coeff_i)
+        coeffs = pm.getCoeffForward()
+        self.assertEqual(coeffs.shape, (3, 4))
+        self.assertEqual(sortRows(coeffs), sortRows(coeff_f))
+        self.assertEqual(sortRows(pm.getCoeffInverse()), sortRows(coeff_i))
+
+        # the coefficients of an inverted PolyMap are swapped
+        invPm = pm.getInverse()
+        self.assertEqual(sortRows(invPm.getCoeffForward()), sortRows(coeff_i))
+        self.assertEqual(sortRows(invPm.getCoeffInverse()), sortRows(coeff_f))
+
+        # an iterative inverse has no coefficients
+        pmIter = astshim.PolyMap(np.array([[1.0, 1, 1], [0.1, 1, 2]]), 1, "IterInverse=1")
+        self.assertEqual(pmIter.getCoeffInverse().shape, (0, 3))
+
+        # the coefficients of a fit inverse can be used to make an equivalent PolyMap
+        pmQuad = astshim.PolyMap(np.array([
+            [1.0, 1, 1, 0],
+            [0.1, 1, 2, 0],
+            [1.0, 2, 0, 1],
+        ]), 2)
+        self.assertEqual(pmQuad.getCoeffInverse().shape, (0, 4))
+        pmFit = pmQuad.polyTran(False, 1e-6, 1e-4, 6, [-1.0, -1.0], [1.0, 1.0])
+        coeffs_i = pmFit.getCoeffInverse()
+        self.assertGreater(len(coeffs_i), 0)
+        pmCopy = astshim.PolyMap(pmFit.getCoeffForward(), coeffs_i)
+        indata = np.array([
+            [-0.5, 0.0, 0.7],
+            [0.3, -0.9, 1.0],
+        ])
+        outdata = pmFit.applyForward(indata)
+        npt.assert_allclose(pmCopy.applyForward(indata), outdata)
+        npt.assert_allclose(pmCopy.applyInverse(outdata), pmFit.applyInverse(outdata))
+
+    def test_PolyMapNativeEval(self):
+        """Test that evaluating the forward polynomial in astshim matches AST
+        """
+        rng = np.random.RandomState(5)
+        indata = rng.uniform(-2, 2, (2, 1000))
+        for order in range(1, 10):
+            # a full 2-d polynomial of the given total order for each output
+            coeff_f = np.array([
+                [rng.uniform(-1, 1) / 2**(i + j), outAxis, i, j]
+                for outAxis in (1, 2)
+                for i in range(order + 1)
+                for j in range(order + 1 - i)
+            ])
+            pm = astshim.PolyMap(coeff_f, 2)
+            self.assertTrue(pm.nativeEval)
+            outdata = pm.applyForward(indata)
+            pm.nativeEval = False
+            self.assertFalse(pm.nativeEval)
+            astOutdata = pm.applyForward(indata)
+            npt.assert_allclose(outdata, astOutdata, rtol=1e-12, atol=1e-12)
+            # the setting is copied, including to the copies used by worker threads
+            self.assertFalse(pm.copy().nativeEval)
+            npt.assert_allclose(pm.applyForward(indata, nThreads=2), astOutdata, rtol=1e-12, atol=1e-12)
+
+        # 3 inputs, 1 output, with a missing power, duplicate terms and a term with a zero coefficient
+        coeff_f = np.array([
+            [0.5, 1, 0, 0, 0],
+            [1.5, 1, 2, 1, 0],
+            [-0.25, 1, 0, 0, 3],
+            [0.75, 1, 2, 1, 0],
+            [0.0, 1, 1, 1, 1],
+        ])
+        pm = astshim.PolyMap(coeff_f, 1)
+        indata3 = rng.uniform(-2, 2, (3, 100))
+        x1, x2, x3 = indata3
+        predOutdata = 0.5 + 2.25 * x1**2 * x2 - 0.25 * x3**3
+        npt.assert_allclose(pm.applyForward(indata3)[0], predOutdata, rtol=1e-12, atol=1e-12)
+
+        # an output is only bad where one of its terms uses a bad input with a power > 0,
+        # and an output with no terms is 0, as for AST
+        coeff_f = np.array([
+            [2.0, 1, 1, 0],
+            [3.0, 1, 0, 1],
+            [1.5, 2, 0, 0],
+            [0.5, 2, 2, 0],
+        ])
+        pm = astshim.PolyMap(coeff_f, 3)
+        indata = np.array([[1.0, 2.0, np.nan, np.nan], [1.0, np.nan, 1.0, np.nan]])
+        outdata = pm.applyForward(indata)
+        pm.nativeEval = False
+        npt.assert_array_equal(outdata, pm.applyForward(indata))
+
+        # very sparse polynomials, and inverted PolyMaps, are evaluated by AST
+        coeff_f = np.array([
+            [1.0, 1, 20, 0],
+            [1.0, 2, 0, 20],
+        ])
+        pm = astshim.PolyMap(coeff_f, 2, "IterInverse=1")
+        indata = rng.uniform(0.5, 1.5, (2, 10))
+        npt.assert_allclose(pm.applyForward(indata), indata**20, rtol=1e-12)
+        self.checkRoundTrip(pm, indata)
+
+    def test_PolyMapNewtonInverse(self):
+        """Test PolyMapNewtonInverse with and without a coarse inverse
+        """
+        # a mild distortion of a 2-d rotation, scaling and shift
+        coeff_f = np.array([
+            [5.0, 1, 0, 0],
+            [0.9, 1, 1, 0],
+            [0.2, 1, 0, 1],
+            [1.0e-4, 1, 2, 0],
+            [-2.0e-6, 1, 3, 0],
+            [-3.0, 2, 0, 0],
+            [-0.1, 2, 1, 0],
+            [1.1, 2, 0, 1],
+            [3.0e-5, 2, 1, 1],
+            [1.0e-6, 2, 0, 3],
+        ])
+        pm = astshim.PolyMap(coeff_f, 2, "IterInverse=1, TolInverse=1e-10")
+        # a grid of "pixels", in row order
+        xs, ys = np.meshgrid(np.linspace(0, 200, 41), np.linspace(0, 100, 11))
+        pixels = np.array([xs.ravel(), ys.ravel()])
+        sky = pm.applyForward(pixels)
+
+        inv = astshim.PolyMapNewtonInverse(pm)
+        self.assertEqual(inv.nAxes, 2)
+        self.assertAlmostEqual(inv.tol, 1e-10)
+        self.assertEqual(inv.maxIter, 20)
+        self.assertFalse(inv.hasCoarseInverse)
+        npt.assert_allclose(inv.applyInverse(sky), pixels, atol=1e-7)
+        npt.assert_allclose(inv.applyInverse(sky), pm.applyInverse(sky), atol=1e-7)
+        nPts = pixels.shape[1]
+        self.assertEqual((inv.nPoints, inv.nConverged), (2 * nPts, 2 * nPts))
+        self.assertGreaterEqual(inv.nIterations, 2 * nPts)
+        self.assertLessEqual(inv.nIterations, 2 * nPts * inv.maxIterationsUsed)
+        # warm starts from neighbouring points need few steps
+        self.assertLessEqual(inv.maxIterationsUsed, 6)
+        inv.resetStats()
+        self.assertEqual((inv.nPoints, inv.nConverged, inv.nIterations, inv.maxIterationsUsed),
+                         (0, 0, 0, 0))
+
+        coarseInv = astshim.PolyMapNewtonInverse(pm, [0, 0], [200, 100], maxOrder=3)
+        self.assertTrue(coarseInv.hasCoarseInverse)
+        npt.assert_allclose(coarseInv.applyInverse(sky), pixels, atol=1e-7)
+        self.assertEqual(coarseInv.nConverged, nPts)
+        self.assertLessEqual(coarseInv.maxIterationsUsed, 4)
+
+        # too few steps to converge, and non-finite inputs, give nan
+        oneStepInv = astshim.PolyMapNewtonInverse(pm, tol=1e-15, maxIter=1)
+        badSky = np.array([[sky[0, 5], np.nan], [sky[1, 5], 0.0]])
+        self.assertTrue(np.all(np.isnan(oneStepInv.applyInverse(badSky))))
+        self.assertEqual((oneStepInv.nPoints, oneStepInv.nConverged), (2, 0))
+
+        with self.assertRaises(ValueError):
+            astshim.PolyMapNewtonInverse(pm.getInverse())
+        with self.assertRaises(ValueError):
+            astshim.PolyMapNewtonInverse(pm, maxIter=0)
+        with self.assertRaises(ValueError):
+            astshim.PolyMapNewtonInverse(pm, [0, 0], [200])
+        with self.assertRaises(ValueError):
+            astshim.PolyMapNewtonInverse(astshim.PolyMap(coeff_f, 3))
+        with self.assertRaises(ValueError):
+            inv.applyInverse(np.zeros([3, 5]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,177 @@
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+import astshim
+from astshim.test import MappingTestCase
+
+
+class TestPolyTranCache(MappingTestCase):
+
+    def setUp(self):
+        coeff_f = np.array([
+            [1.0, 1, 1, 0],
+            [0.01, 1, 2, 0],
+            [1.0, 2, 0, 1],
+            [0.005, 2, 1, 1],
+        ])
+        self.polyMap = astshim.PolyMap(coeff_f, 2)
+        self.lbnd = [-1.0, -1.0]
+        self.ubnd = [1.0, 1.0]
+        self.indata = np.array([
+            [-0.5, 0.0, 0.3, 0.9],
+            [0.2, -0.7, 0.0, 0.5],
+        ])
+        self.tempDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def polyTran(self, cache, mapping=None, maxorder=4):
+        if mapping is None:
+            mapping = self.polyMap
+        return cache.polyTran(mapping, False, 1e-6, 1e-3, maxorder, self.lbnd, self.ubnd)
+
+    def test_PolyTranCacheBasics(self):
+        cache = astshim.PolyTranCache()
+        self.assertEqual(cache.maxEntries, 100)
+        self.assertEqual(cache.maxSize, 10000000)
+        self.assertEqual(cache.directory, "")
+        self.assertEqual(cache.nEntries, 0)
+        self.assertEqual(cache.size, 0)
+
+        predFit = self.polyMap.polyTran(False, 1e-6, 1e-3, 4, self.lbnd, self.ubnd)
+        fit1 = self.polyTran(cache)
+        self.assertIsInstance(fit1, astshim.PolyMap)
+        self.assertEqual(fit1, predFit)
+        self.assertEqual((cache.nHits, cache.nFileHits, cache.nMisses), (0, 0, 1))
+        self.assertEqual(cache.nEntries, 1)
+        # the size includes the serialized mapping and arguments
+        self.assertGreater(cache.size, fit1.objSize + len(self.polyMap.toString()))
+        outdata = self.polyMap.applyForward(self.indata)
+        npt.assert_allclose(fit1.applyInverse(outdata), self.indata, atol=1e-3)
+
+        # each result is a new copy
+        fit2 = self.polyTran(cache)
+        self.assertEqual(fit2, fit1)
+        self.assertFalse(fit2.same(fit1))
+        self.assertEqual((cache.nHits, cache.nFileHits, cache.nMisses), (1, 0, 1))
+
+        # an equal mapping is found, but different arguments or coefficients are not
+        self.polyTran(cache, mapping=self.polyMap.copy())
+        self.assertEqual((cache.nHits, cache.nMisses), (2, 1))
+        self.polyTran(cache, maxorder=5)
+        self.assertEqual((cache.nHits, cache.nMisses), (2, 2))
+        coeff_f = np.array([
+            [1.0, 1, 1, 0],
+            [0.02, 1, 2, 0],
+            [1.0, 2, 0, 1],
+        ])
+        self.polyTran(cache, mapping=astshim.PolyMap(coeff_f, 2))
+        self.assertEqual((cache.nHits, cache.nMisses), (2, 3))
+        self.assertEqual(cache.nEntries, 3)
+
+        cache.resetStats()
+        self.assertEqual((cache.nHits, cache.nFileHits, cache.nMisses), (0, 0, 0))
+        cache.clear()
+        self.assertEqual(cache.nEntries, 0)
+        self.assertEqual(cache.size, 0)
+        self.polyTran(cache)
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 1))
+
+    def test_PolyTranCacheMaxEntries(self):
+        cache = astshim.PolyTranCache(maxEntries=1)
+        self.polyTran(cache, maxorder=4)
+        self.polyTran(cache, maxorder=5)
+        self.assertEqual(cache.nEntries, 1)
+        self.polyTran(cache, maxorder=5)
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 2))
+        self.polyTran(cache, maxorder=4)
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 3))
+
+        cache = astshim.PolyTranCache(maxEntries=0)
+        self.polyTran(cache)
+        self.polyTran(cache)
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 2))
+        self.assertEqual(cache.nEntries, 0)
+
+    def test_PolyTranCacheMaxSize(self):
+        cache = astshim.PolyTranCache()
+        self.polyTran(cache)
+        entrySize = cache.size
+
+        cache = astshim.PolyTranCache(maxSize=entrySize - 1)
+        self.polyTran(cache)
+        self.polyTran(cache)
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 2))
+        self.assertEqual(cache.nEntries, 0)
+        self.assertEqual(cache.size, 0)
+
+        # an entry too large for memory is still saved to a file
+        cache = astshim.PolyTranCache(directory=self.tempDir, maxSize=entrySize - 1)
+        self.polyTran(cache)
+        self.polyTran(cache)
+        self.assertEqual((cache.nHits, cache.nFileHits, cache.nMisses), (0, 1, 1))
+
+    def test_PolyTranCacheDirectory(self):
+        cache1 = astshim.PolyTranCache(directory=self.tempDir)
+        self.assertEqual(cache1.directory, self.tempDir)
+        fit1 = self.polyTran(cache1)
+        self.assertEqual(cache1.nMisses, 1)
+        self.assertEqual(len(os.listdir(self.tempDir)), 1)
+
+        # a new cache (e.g. in a new process) reads the fit from the file
+        cache2 = astshim.PolyTranCache(directory=self.tempDir)
+        fit2 = self.polyTran(cache2)
+        self.assertEqual(fit2, fit1)
+        self.assertEqual((cache2.nHits, cache2.nFileHits, cache2.nMisses), (0, 1, 0))
+        self.polyTran(cache2)
+        self.assertEqual((cache2.nHits, cache2.nFileHits, cache2.nMisses), (1, 1, 0))
+
+        # a corrupted file is ignored and replaced
+        path = os.path.join(self.tempDir, os.listdir(self.tempDir)[0])
+        with open(path, "w") as f:
+            f.write("not a fit")
+        cache3 = astshim.PolyTranCache(directory=self.tempDir)
+        self.assertEqual(self.polyTran(cache3), fit1)
+        self.assertEqual((cache3.nHits, cache3.nFileHits, cache3.nMisses), (0, 0, 1))
+        cache4 = astshim.PolyTranCache(directory=self.tempDir)
+        self.polyTran(cache4)
+        self.assertEqual((cache4.nHits, cache4.nFileHits, cache4.nMisses), (0, 1, 0))
+
+        # an unwritable directory is ignored
+        cache5 = astshim.PolyTranCache(directory=os.path.join(self.tempDir, "missing"))
+        self.assertEqual(self.polyTran(cache5), fit1)
+        self.assertEqual(cache5.nMisses, 1)
+
+    def test_PolyTranCacheChebyMap(self):
+        coeff_f = np.array([
+            [1.0, 1, 1, 0],
+            [0.01, 1, 2, 0],
+            [1.0, 2, 0, 1],
+        ])
+        chebyMap = astshim.ChebyMap(coeff_f, 2, self.lbnd, self.ubnd)
+        cache = astshim.PolyTranCache(directory=self.tempDir)
+        predFit = chebyMap.polyTran(False, 1e-6, 1e-3, 4)
+        fit1 = cache.polyTran(chebyMap, False, 1e-6, 1e-3, 4)
+        self.assertIsInstance(fit1, astshim.ChebyMap)
+        self.assertEqual(fit1, predFit)
+        # the default bounds are the domain, so this is the same fit
+        fit2 = cache.polyTran(chebyMap, False, 1e-6, 1e-3, 4, self.lbnd, self.ubnd)
+        self.assertEqual(fit2, fit1)
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 1))
+
+        cache2 = astshim.PolyTranCache(directory=self.tempDir)
+        fit3 = cache2.polyTran(chebyMap, False, 1e-6, 1e-3, 4)
+        self.assertIsInstance(fit3, astshim.ChebyMap)
+        self.assertEqual(fit3, fit1)
+        self.assertEqual(cache2.nFileHits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+from __future__ import absolute_import, division, print_function
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+import astshim
+from astshim.test import MappingTestCase
+
+
+class TestSimplifyCache(MappingTestCase):
+
+    def setUp(self):
+        self.zoomMap = astshim.ZoomMap(2, 3.5)
+        # a series map that simplifies to a UnitMap
+        self.seriesMap = self.zoomMap.then(self.zoomMap.getInverse())
+
+    def test_SimplifyCacheBasics(self):
+        cache = astshim.SimplifyCache()
+        self.assertEqual(cache.maxSize, 10000000)
+        self.assertEqual(cache.nEntries, 0)
+        self.assertEqual(cache.size, 0)
+
+        simpMap1 = cache.simplify(self.seriesMap)
+        self.assertEqual(simpMap1.className, "UnitMap")
+        self.assertEqual(simpMap1, self.seriesMap.simplify())
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 1))
+        self.assertEqual(cache.nEntries, 1)
+        # the serialized original mapping is kept to verify matches, so it counts towards the size
+        self.assertEqual(cache.size, simpMap1.objSize + len(self.seriesMap.toString()))
+
+        simpMap2 = cache.simplify(self.seriesMap)
+        self.assertTrue(simpMap2.same(simpMap1))
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 1))
+
+        # an equal but different mapping shares the entry
+        seriesCopy = self.seriesMap.copy()
+        simpMap3 = cache.simplify(seriesCopy)
+        self.assertTrue(simpMap3.same(simpMap1))
+        self.assertEqual((cache.nHits, cache.nMisses), (2, 1))
+        self.assertEqual(cache.nEntries, 1)
+
+        # a different mapping is a new entry
+        otherZoomMap = astshim.ZoomMap(2, 4.5)
+        simpMap4 = cache.simplify(otherZoomMap.then(otherZoomMap.getInverse()))
+        self.assertFalse(simpMap4.same(simpMap1))
+        self.assertEqual((cache.nHits, cache.nMisses), (2, 2))
+        self.assertEqual(cache.nEntries, 2)
+
+        cache.resetStats()
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 0))
+        self.assertEqual(cache.nEntries, 2)
+        cache.clear()
+        self.assertEqual(cache.nEntries, 0)
+        self.assertEqual(cache.size, 0)
+        cache.simplify(self.seriesMap)
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 1))
+
+    def test_SimplifyCacheModified(self):
+        cache = astshim.SimplifyCache()
+        simpMap1 = cache.simplify(self.seriesMap)
+        stateId = self.seriesMap.stateId
+        text1 = self.seriesMap.toString()
+
+        # mappings with Ident set are not simplified
+        self.seriesMap.ident = "not simplified"
+        self.assertNotEqual(self.seriesMap.stateId, stateId)
+        simpMap2 = cache.simplify(self.seriesMap)
+        self.assertEqual(simpMap2.className, "SeriesMap")
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 2))
+        text2 = self.seriesMap.toString()
+
+        # modifying a cached simplified mapping is detected
+        simpMap2.ident = "modified"
+        simpMap3 = cache.simplify(self.seriesMap)
+        self.assertFalse(simpMap3.same(simpMap2))
+        self.assertEqual(simpMap3.ident, "not simplified")
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 3))
+        self.assertEqual(cache.nEntries, 2)
+        self.assertEqual(cache.size, simpMap1.objSize + len(text1) + simpMap3.objSize + len(text2))
+
+    def test_SimplifyCacheModifiedComponent(self):
+        # a series map shares its components, so modifying one modifies the series map
+        # without changing its state ID
+        zoomMap = astshim.ZoomMap(2, 2.0)
+        seriesMap = zoomMap.then(astshim.ShiftMap([1.0, 2.0]))
+        cache = astshim.SimplifyCache()
+        cache.simplify(seriesMap)
+        cache.simplify(seriesMap)
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 1))
+
+        stateId = seriesMap.stateId
+        zoomMap.ident = "modified"
+        self.assertEqual(seriesMap.stateId, stateId)
+        self.assertIn("modified", seriesMap.toString())
+        simpMap = cache.simplify(seriesMap)
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 2))
+        self.assertEqual(cache.nEntries, 2)
+        self.assertEqual(simpMap, seriesMap.simplify())
+        indata = np.array([[1.0, 2.0], [3.0, 4.0]])
+        assert_allclose(simpMap.applyForward(indata), indata * 2.0 + [[1.0], [2.0]])
+
+    def test_SimplifyCacheMaxSize(self):
+        entrySize = self.seriesMap.simplify().objSize + len(self.seriesMap.toString())
+
+        # too small to hold anything
+        cache = astshim.SimplifyCache(maxSize=entrySize - 1)
+        cache.simplify(self.seriesMap)
+        cache.simplify(self.seriesMap)
+        self.assertEqual((cache.nHits, cache.nMisses), (0, 2))
+        self.assertEqual(cache.nEntries, 0)
+        self.assertEqual(cache.size, 0)
+
+        # room for one entry; the least recently used is discarded
+        otherZoomMap = astshim.ZoomMap(2, 4.5)
+        otherSeriesMap = otherZoomMap.then(otherZoomMap.getInverse())
+        otherEntrySize = otherSeriesMap.simplify().objSize + len(otherSeriesMap.toString())
+        cache = astshim.SimplifyCache(maxSize=max(entrySize, otherEntrySize))
+        cache.simplify(self.seriesMap)
+        cache.simplify(otherSeriesMap)
+        self.assertEqual(cache.nEntries, 1)
+        self.assertEqual(cache.size, otherEntrySize)
+        cache.simplify(otherSeriesMap)
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 2))
+        cache.simplify(self.seriesMap)
+        self.assertEqual((cache.nHits, cache.nMisses), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()